@@ -13,7 +13,7 @@ from agents import (
     set_tracing_disabled,
     function_tool,
 )
-from openai import AsyncOpenAI
+from shared_clients import get_client
 from agents.result import RunResultBase
 from agents.stream_events import (
     RawResponsesStreamEvent,
@@ -28,7 +28,7 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     raise ValueError("API key not found!!")
 
-client = AsyncOpenAI(
+client = get_client(
     api_key=GEMINI_API_KEY,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
@@ -1,5 +1,5 @@
 from agents import Agent, Runner, OpenAIChatCompletionsModel
-from openai import AsyncOpenAI
+from shared_clients import get_client
 import os
 import asyncio
 
@@ -20,7 +20,7 @@ API_KEY = os.environ.get("OPENROUTER_API_KEY")
 BASE_URL = "https://openrouter.ai/api/v1"
 MODEL = "openai/gpt-4o-mini"
 
-client = AsyncOpenAI(api_key=API_KEY, base_url=BASE_URL)
+client = get_client(api_key=API_KEY, base_url=BASE_URL)
 
 model = OpenAIChatCompletionsModel(model=MODEL, openai_client=client)
 # # Load environment variables
@@ -1,34 +1,11 @@
-import os
+from pathlib import Path
 
-try:
-    from dotenv import load_dotenv, find_dotenv
-    from agents import AsyncOpenAI, OpenAIChatCompletionsModel
-    from agents.run import RunConfig
-except ImportError:
-    raise ImportError(
-        "\nThis package requires 'openai-agents' to be installed.\n"
-        "\nPlease install it first using pip:\n"
-        "\npip install openai-agents\n"
-        "\nFor more information, visit: https://openai.github.io/openai-agents-PyDeepOlympus/quickstart/\n"
-    )
+from shared_clients import lazy_config_module
 
-# Load environment variables
-load_dotenv(find_dotenv())
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please define it in your .env file.")
-
-# Setup Gemini client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-# Preferred Gemini model setup
-model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash", openai_client=external_client
-)
-
-# Runner config (you can export this)
-config = RunConfig(model=model, model_provider=external_client)
+# Runner config (you can export this): `from config import config`.
+# Nothing happens at import time, not even importing the Agents SDK: the
+# RunConfig is built when `config` is first read. The .env file is loaded,
+# GEMINI_API_KEY is checked and the Gemini client is created on the first
+# Runner.run(). Set AGENTS_BACKEND=ollama|openrouter|litellm to switch provider.
+# `from config import model` / `external_client` still work (built on access).
+__getattr__ = lazy_config_module(__name__, env_dir=Path(__file__).parent)
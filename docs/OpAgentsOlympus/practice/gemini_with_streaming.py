@@ -2,11 +2,11 @@ from agents import (
     Runner,
     Agent,
     OpenAIChatCompletionsModel,
-    AsyncOpenAI,
     function_tool,
     RunConfig,
     RunContextWrapper,
 )
+from shared_clients import get_client
 import os
 from dotenv import load_dotenv
 import asyncio
@@ -18,7 +18,7 @@ if not GEMINI_API_KEY:
     raise ValueError("GEMINI_API_KEY is not set in the environment variables.")
 
 # Set up the API provider
-provider = AsyncOpenAI(
+provider = get_client(
     api_key=GEMINI_API_KEY,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
@@ -1,5 +1,5 @@
 from agents import Agent, Runner, OpenAIChatCompletionsModel, RunConfig, function_tool, RunContextWrapper, AgentBase
-from openai import AsyncOpenAI
+from shared_clients import get_client
 from pydantic import BaseModel
 from typing import Any
 import os
@@ -8,7 +8,7 @@ import dotenv
 dotenv.load_dotenv()
 API_KEY = os.environ.get("GEMINI_API_KEY")
 
-client = AsyncOpenAI(
+client = get_client(
     api_key=API_KEY,
     base_url='https://generativelanguage.googleapis.com/v1beta/openai'
 )
@@ -1,25 +1,8 @@
-import os
+from pathlib import Path
 
-try:
-    from dotenv import load_dotenv, find_dotenv
-    from agents.run import RunConfig
-    from agents.extensions.models.litellm_model import LitellmModel
-except ImportError:
-    raise ImportError(
-        "\nThis package requires 'openai-agents' to be installed.\n"
-        "\nPlease install it first using pip:\n"
-        "\npip install openai-agents\n"
-        "\nFor more information, visit: https://openai.github.io/openai-agents-PyDeepOlympus/quickstart/\n"
-    )
+from shared_clients import lazy_config_module
 
-# Load environment variables
-load_dotenv(find_dotenv())
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please define it in your .env file.")
-
-model = LitellmModel(model="gemini/gemini-2.0-flash", api_key=gemini_api_key)
-
-# Runner config (you can export this)
-config = RunConfig(model=model, tracing_disabled=True)
+# Gemini through LiteLLM (gemini/gemini-2.0-flash, key from GEMINI_API_KEY).
+# Runner config (you can export this), built when `config` is first read.
+# The LiteLLM extension is imported, and the key checked, on the first Runner.run().
+__getattr__ = lazy_config_module(__name__, "litellm", env_dir=Path(__file__).parent)
@@ -1,13 +1,8 @@
-from agents import AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
+from shared_clients import lazy_config_module
 
-external_client = AsyncOpenAI(
-    api_key='1234',
-    base_url="http://localhost:11434/v1",
-)
-model = OpenAIChatCompletionsModel(
-    model="qwen3:0.6b", openai_client=external_client
-)
-config = RunConfig(model=model, tracing_disabled=True)
+# Local model served by Ollama (qwen3:0.6b at http://localhost:11434/v1).
+# `config`, `model` and `external_client` are built on first access; the
+# client and model are created on the first Runner.run().
+__getattr__ = lazy_config_module(__name__, "ollama")
 
-# This configuration is for ollama!
\ No newline at end of file
+# This configuration is for ollama!
@@ -4,10 +4,10 @@ from agents import (
     handoff,
     enable_verbose_stdout_logging,
     OpenAIChatCompletionsModel,
-    AsyncOpenAI,
     set_tracing_disabled,
     function_tool,
 )  # type: ignore
+from shared_clients import get_client
 from agents.handoffs import HandoffInputData
 import os
 import dotenv
@@ -17,7 +17,7 @@ dotenv.load_dotenv()
 set_tracing_disabled(True)
 api_key = os.environ.get("GEMINI_API_KEY")
 
-client = AsyncOpenAI(
+client = get_client(
     api_key=api_key,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
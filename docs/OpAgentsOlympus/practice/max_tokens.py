@@ -1,4 +1,4 @@
-from openai import AsyncOpenAI
+from shared_clients import get_client
 from agents import (
     Agent,
     Runner,
@@ -16,7 +16,7 @@ if not gemini_api_key:
     raise ValueError(
         "I guess you haven't set API KEY, I'am pretty sure you need to set it dude.")
 
-client = AsyncOpenAI(
+client = get_client(
     api_key=gemini_api_key,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
@@ -2,11 +2,11 @@ from agents import (
     Agent,
     Runner,
     RunContextWrapper,
-    AsyncOpenAI,
     OpenAIChatCompletionsModel,
     RunConfig,
     function_tool,
 )
+from shared_clients import get_client
 import os
 import dotenv
 
@@ -16,7 +16,7 @@ gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please define it in your .env file.")
 
-external_client = AsyncOpenAI(
+external_client = get_client(
     api_key=gemini_api_key,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
@@ -0,0 +1,89 @@
+"""Agents SDK session stored in Postgres, on an asyncpg pool the app already has.
+
+`SQLiteSession` keeps history in a local file: replicas can't share it and
+its write lock serializes concurrent turns. `PostgresSession` keeps every
+item as a row of `agent_session_items`:
+
+- `add_items` writes all new items of a turn with one INSERT (an `unnest`
+  of the serialized items, in order) rather than one statement per item;
+- `get_items(limit)` reads the newest `limit` items of a session through
+  the `(session_id, id)` index;
+- with `max_items`, the same transaction that adds items deletes all but
+  the newest `max_items`, so long conversations stay bounded.
+
+The queries are registered in `subscription_statements.STATEMENTS` and run
+through its `registry`, so they are prepared on every pool connection and
+counted in the app's database stats like its other queries.
+
+Create the table once with `create_tables(pool)` (idempotent).
+
+Usage::
+
+    session = PostgresSession("user_42", pool, max_items=200)
+    await Runner.run(agent, "Hi", session=session)
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from agents.items import TResponseInputItem
+from agents.memory.session import SessionABC
+
+from subscription_statements import registry
+
+SESSION_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS agent_session_items (
+    id BIGSERIAL PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    message_data JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS agent_session_items_session_idx ON agent_session_items (session_id, id);
+"""
+
+async def create_tables(pool: Any) -> None:
+    async with pool.acquire() as conn:
+        await conn.execute(SESSION_TABLES_SQL)
+
+
+class PostgresSession(SessionABC):
+    """Conversation history of one session id, on a shared asyncpg pool.
+
+    Args:
+        session_id: Identifies the conversation.
+        pool: asyncpg pool (or `subscription_fakes.FakePool`).
+        max_items: Keep only the newest this many items; None keeps everything.
+    """
+
+    def __init__(self, session_id: str, pool: Any, max_items: int | None = None):
+        self.session_id = session_id
+        self.pool = pool
+        self.max_items = max_items
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        if limit is None:
+            rows = await registry.fetch(self.pool, "session_items", self.session_id)
+        else:
+            rows = await registry.fetch(self.pool, "session_last_items", self.session_id, limit)
+        return [json.loads(row['message_data']) for row in rows]
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        if not items:
+            return
+        data = [json.dumps(item) for item in items]
+        async with registry.acquire(self.pool) as conn:
+            async with conn.transaction():
+                await registry.run(conn, "session_insert", "fetch", self.session_id, data)
+                if self.max_items is not None:
+                    await registry.run(conn, "session_trim", "fetch", self.session_id, self.max_items)
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        row = await registry.fetchrow(self.pool, "session_pop", self.session_id)
+        return json.loads(row['message_data']) if row is not None else None
+
+    async def clear_session(self) -> None:
+        await registry.fetch(self.pool, "session_clear", self.session_id)
+
+    def close(self) -> None:
+        """Nothing to release: connections belong to the pool (same interface as SQLiteSession)."""
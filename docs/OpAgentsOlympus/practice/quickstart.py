@@ -8,8 +8,8 @@ from agents import (
     InputGuardrail,
     RunConfig,
 )
+from shared_clients import get_client
 import os
-from openai import AsyncOpenAI
 import dotenv
 import asyncio
 
@@ -20,7 +20,7 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     raise ValueError("API key not found!!")
 
-client = AsyncOpenAI(
+client = get_client(
     api_key=GEMINI_API_KEY,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
@@ -0,0 +1,23 @@
+"""Shared, pooled AsyncOpenAI clients and lazy run configs for the practice scripts.
+
+`get_client(base_url=..., api_key=...)` returns the same client for the same
+provider and key, so scripts and config modules loaded into one process share
+a single HTTP connection pool. See `agents_demo.clients` for the pool settings
+and `pool_stats()`.
+
+`lazy_run_config(backend)` builds a `RunConfig` that does no I/O, and
+`lazy_config_module(__name__, backend)` is the module `__getattr__` of the
+config modules, which build theirs on first access; see `agents_demo.providers`.
+"""
+import sys
+from pathlib import Path
+
+# agents_demo lives in the repository's src/ folder
+_SRC = Path(__file__).resolve().parents[3] / "src"
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+from agents_demo.clients import aclose_all, get_client, pool_stats  # noqa: E402
+from agents_demo.providers import lazy_config_module, lazy_run_config  # noqa: E402
+
+__all__ = ["aclose_all", "get_client", "lazy_config_module", "lazy_run_config", "pool_stats"]
@@ -0,0 +1,206 @@
+"""Process-wide user snapshot cache for the subscription assistant.
+
+Plan data changes rarely but every turn of every user reads it. `SnapshotCache`
+keeps the latest `UserSnapshot` per user id in memory, so hot users are served
+without touching asyncpg at all:
+
+- bounded size with LRU eviction, plus a TTL as a safety net;
+- concurrent misses for the same user share one load;
+- invalidated by Postgres LISTEN/NOTIFY: `init_database` installs triggers
+  (`NOTIFY_TRIGGER_SQL`) that `pg_notify` the user id on every change to
+  `user_subscriptions` or `user_usage`, and `InvalidationListener` drops the
+  matching entry. If the listening connection is lost, notifications may
+  have been missed, so the whole cache is cleared.
+
+Works with a real asyncpg pool or with `subscription_fakes.FakePool`.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Mapping
+
+CHANNEL = "subscription_changes"
+
+NOTIFY_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_subscription_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('{CHANNEL}', OLD.user_id);
+    ELSE
+        PERFORM pg_notify('{CHANNEL}', NEW.user_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS user_subscriptions_notify ON user_subscriptions;
+CREATE TRIGGER user_subscriptions_notify
+    AFTER INSERT OR UPDATE OR DELETE ON user_subscriptions
+    FOR EACH ROW EXECUTE FUNCTION notify_subscription_change();
+
+DROP TRIGGER IF EXISTS user_usage_notify ON user_usage;
+CREATE TRIGGER user_usage_notify
+    AFTER INSERT OR UPDATE OR DELETE ON user_usage
+    FOR EACH ROW EXECUTE FUNCTION notify_subscription_change();
+"""
+
+
+class SnapshotCache:
+    """Async LRU cache with a TTL and explicit invalidation.
+
+    Args:
+        maxsize: Entries kept before the least recently used one is evicted.
+        ttl: Seconds an entry stays valid even without an invalidation.
+        clock: Monotonic clock (swappable for tests).
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        # Bumped when a key is invalidated mid-load, so that load's result is not stored
+        self._generation: dict[Hashable, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for `key`, or the result of `load()` (None results are not cached)."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            generation = self._generation.get(key, 0)
+            task = self._inflight[key] = asyncio.ensure_future(self._load(key, load, generation))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        try:
+            value = await load()
+        finally:
+            self._inflight.pop(key, None)
+            stale = self._generation.pop(key, 0) != generation
+        if value is not None and not stale:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        if key in self._inflight:
+            self._generation[key] = self._generation.get(key, 0) + 1
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        for key in self._inflight:
+            self._generation[key] = self._generation.get(key, 0) + 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class InvalidationListener:
+    """Holds one pool connection that LISTENs on every channel of `caches`.
+
+    `caches` maps a channel to what it invalidates: anything with
+    `invalidate(payload)` and `clear()`, such as a `SnapshotCache` or a
+    `subscription_catalog.PlanCatalog`. All channels share the connection,
+    so listening costs one pool slot however many caches there are. A lost
+    connection clears every cache and is re-established in the background.
+    """
+
+    def __init__(self, pool: Any, caches: Mapping[str, Any]) -> None:
+        self.pool = pool
+        self.caches = dict(caches)
+        self._conn: Any = None
+        self._closed = False
+        self._reconnect_task: asyncio.Task | None = None
+
+    @property
+    def channels(self) -> str:
+        return ", ".join(self.caches)
+
+    async def start(self) -> None:
+        conn = await self.pool.acquire()
+        listening = []
+        try:
+            for channel in self.caches:
+                await conn.add_listener(channel, self._on_notify)
+                listening.append(channel)
+        except BaseException:
+            try:
+                for channel in listening:
+                    await conn.remove_listener(channel, self._on_notify)
+            finally:
+                await self.pool.release(conn)
+            raise
+        conn.add_termination_listener(self._on_terminate)
+        self._conn = conn
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        self.caches[channel].invalidate(payload)
+
+    def _clear_all(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+
+    def _on_terminate(self, connection: Any) -> None:
+        # Notifications sent while we're not listening are lost
+        print(f"Invalidation listener on {self.channels} lost its connection; clearing")
+        self._conn = None
+        self._clear_all()
+        if not self._closed:
+            self._reconnect_task = asyncio.ensure_future(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        while not self._closed:
+            try:
+                await self.start()
+            except Exception as e:
+                print(f"Invalidation listener on {self.channels} failed to reconnect ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            else:
+                # Anything cached while we were reconnecting may have missed a notification
+                self._clear_all()
+                return
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            for channel in self.caches:
+                await conn.remove_listener(channel, self._on_notify)
+        finally:
+            await self.pool.release(conn)
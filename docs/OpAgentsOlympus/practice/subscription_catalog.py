@@ -0,0 +1,179 @@
+"""Plan catalog: the replies of get_plan_features and upgrade_plan_info, rendered once.
+
+Each tool call used to rebuild a nested dict of plans and format its reply
+again. `PlanCatalog` renders both replies for every plan up front and keeps
+them in a read-only mapping, so a call costs one dict lookup.
+
+The catalog starts from `DEFAULT_PLANS` (the values the tools had inline).
+With a database, `init_database` creates and seeds a `plan_catalog` table.
+Its trigger `pg_notify`s `CATALOG_CHANNEL` on every change. The app
+listens with `subscription_cache.InvalidationListener`, and the catalog
+reloads the table and swaps in the new replies at once. Lookups running
+during a reload see either the old catalog or the new one, never a mix.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+CATALOG_CHANNEL = "plan_catalog_changes"
+
+NO_FEATURES = "No feature information available for plan: {plan}"
+NO_UPGRADE = "Contact support for upgrade options."
+
+
+@dataclass(frozen=True)
+class Plan:
+    name: str
+    upgrade: str
+    # None for pseudo-plans without features, like "No active plan"
+    api_calls: str | None = None
+    support: str | None = None
+    features: tuple[str, ...] = ()
+
+    def render_features(self) -> str | None:
+        if self.api_calls is None:
+            return None
+        # Same text as the tool's old f-string, markdown line breaks included
+        return (
+            f"Plan: {self.name}  \n"
+            f"API Calls: {self.api_calls}  \n"
+            f"Support: {self.support}  \n"
+            f"Features: {', '.join(self.features)}"
+        )
+
+
+DEFAULT_PLANS = (
+    Plan(
+        "Enterprise", "You're already on our highest tier plan!",
+        "Unlimited", "24/7 Priority Support",
+        ("Custom integrations", "Advanced analytics", "Dedicated account manager", "SLA guarantee"),
+    ),
+    Plan(
+        "Pro", "Upgrade to Enterprise for unlimited API calls and 24/7 priority support.",
+        "50,000/month", "Email support (24h response)",
+        ("Advanced analytics", "API access", "Custom webhooks", "Priority processing"),
+    ),
+    Plan(
+        "Basic", "Upgrade to Pro for 10x more API calls and email support, or Enterprise for unlimited usage.",
+        "5,000/month", "Community support",
+        ("Basic analytics", "Standard API access", "Email notifications"),
+    ),
+    Plan("No active plan", "Choose from Basic ($9/month), Pro ($49/month), or Enterprise ($199/month)."),
+)
+
+CATALOG_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS plan_catalog (
+    plan_name TEXT PRIMARY KEY,
+    upgrade_info TEXT NOT NULL,
+    api_calls TEXT,
+    support TEXT,
+    features TEXT[] NOT NULL DEFAULT '{{}}'
+);
+
+CREATE OR REPLACE FUNCTION notify_plan_catalog_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('{CATALOG_CHANNEL}', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS plan_catalog_notify ON plan_catalog;
+CREATE TRIGGER plan_catalog_notify
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON plan_catalog
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_plan_catalog_change();
+"""
+
+SEED_CATALOG_SQL = """
+    INSERT INTO plan_catalog (plan_name, upgrade_info, api_calls, support, features)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (plan_name) DO NOTHING
+"""
+
+LOAD_CATALOG_SQL = "SELECT plan_name, upgrade_info, api_calls, support, features FROM plan_catalog"
+
+
+def seed_rows(plans: Iterable[Plan] = DEFAULT_PLANS) -> list[tuple[Any, ...]]:
+    """`SEED_CATALOG_SQL` arguments for `plans` (for executemany)"""
+    return [(p.name, p.upgrade, p.api_calls, p.support, list(p.features)) for p in plans]
+
+
+class PlanCatalog:
+    """Pre-rendered tool replies per plan, reloadable from `plan_catalog`."""
+
+    def __init__(self, plans: Iterable[Plan] = DEFAULT_PLANS):
+        self.pool: Any = None
+        self.reloads = 0
+        self._reload_task: asyncio.Task | None = None
+        self._dirty = False
+        self._install(plans)
+
+    def _install(self, plans: Iterable[Plan]) -> None:
+        features, upgrades = {}, {}
+        for plan in plans:
+            name = sys.intern(plan.name)
+            upgrades[name] = plan.upgrade
+            rendered = plan.render_features()
+            if rendered is not None:
+                features[name] = rendered
+        # One assignment, so readers never see half a catalog
+        self._tables = (MappingProxyType(features), MappingProxyType(upgrades))
+
+    def features(self, plan: str) -> str:
+        rendered = self._tables[0].get(plan)
+        return rendered if rendered is not None else NO_FEATURES.format(plan=plan)
+
+    def upgrade(self, plan: str) -> str:
+        return self._tables[1].get(plan, NO_UPGRADE)
+
+    @property
+    def plans(self) -> Mapping[str, str]:
+        """Plan name -> upgrade reply of every plan in the catalog."""
+        return self._tables[1]
+
+    async def load(self, pool: Any) -> None:
+        """Replace the catalog with the `plan_catalog` table (kept if the table is empty)."""
+        self.pool = pool
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(LOAD_CATALOG_SQL)
+        if rows:
+            self._install(
+                Plan(
+                    row['plan_name'], row['upgrade_info'], row['api_calls'], row['support'],
+                    tuple(row['features'] or ()),
+                )
+                for row in rows
+            )
+            self.reloads += 1
+
+    # InvalidationListener interface: any change reloads the whole (small) table
+
+    def invalidate(self, payload: str) -> None:
+        if self.pool is None:
+            return
+        if self._reload_task is not None and not self._reload_task.done():
+            # A reload is running and may have read the table already: go again after it
+            self._dirty = True
+            return
+        self._reload_task = asyncio.ensure_future(self._reload())
+
+    def clear(self) -> None:
+        # Notifications may have been missed while disconnected
+        self.invalidate("")
+
+    async def _reload(self) -> None:
+        while True:
+            self._dirty = False
+            try:
+                await self.load(self.pool)
+            except Exception as e:
+                print(f"Plan catalog reload failed ({e}); keeping the current catalog")
+            if not self._dirty:
+                return
+
+
+# Shared by the whole process and every tool call
+catalog = PlanCatalog()
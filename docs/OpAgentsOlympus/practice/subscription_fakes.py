@@ -0,0 +1,210 @@
+"""In-process stand-in for an asyncpg pool, for running the subscription app without Postgres.
+
+`FakePool` answers the queries it has a handler for (keyed by SQL text) and
+accepts anything else given to `execute` (DDL, triggers) as a no-op. It also
+supports LISTEN/NOTIFY: `pool.notify(channel, payload)` reaches every
+listener, which is how a test simulates the `init_database` triggers firing.
+
+It counts queries and can add a fixed per-query latency, so caching work on
+the app can be measured without a database. Like asyncpg it holds at most
+`max_size` connections, runs `init` once on each new one and makes `acquire`
+wait (up to `timeout`) when all are busy, so pool exhaustion shows up too.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+Handler = Callable[..., Any]
+
+
+def normalize_sql(sql: str) -> str:
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+class FakeStatement:
+    """What `FakeConnection.prepare` returns: the handler bound to its SQL."""
+
+    def __init__(self, conn: "FakeConnection", sql: str) -> None:
+        self._conn = conn
+        self._sql = sql
+
+    async def fetchrow(self, *args: Any) -> Any:
+        return await self._conn.fetchrow(self._sql, *args)
+
+    async def fetch(self, *args: Any) -> Any:
+        return await self._conn.fetch(self._sql, *args)
+
+    async def fetchval(self, *args: Any) -> Any:
+        return await self._conn.fetchval(self._sql, *args)
+
+
+class FakeConnection:
+    def __init__(self, pool: "FakePool") -> None:
+        self._pool = pool
+        # Filled by a pool `init` hook, as on subscription_statements.PreparedConnection
+        self.prepared: dict[str, FakeStatement] = {}
+
+    async def _run(self, sql: str, args: tuple[Any, ...], *, required: bool) -> Any:
+        pool = self._pool
+        pool.queries += 1
+        if pool.latency:
+            await asyncio.sleep(pool.latency)
+        handler = pool.handlers.get(normalize_sql(sql))
+        if handler is None:
+            if required:
+                raise LookupError(f"FakePool has no handler for: {normalize_sql(sql)[:80]}")
+            return "OK"
+        return handler(*args)
+
+    async def fetchrow(self, sql: str, *args: Any) -> Any:
+        result = await self._run(sql, args, required=True)
+        if isinstance(result, list):
+            return result[0] if result else None
+        return result
+
+    async def fetch(self, sql: str, *args: Any) -> list[Any]:
+        result = await self._run(sql, args, required=True)
+        return result if isinstance(result, list) else ([] if result is None else [result])
+
+    async def fetchval(self, sql: str, *args: Any) -> Any:
+        row = await self.fetchrow(sql, *args)
+        return None if row is None else next(iter(row.values()))
+
+    async def execute(self, sql: str, *args: Any) -> str:
+        result = await self._run(sql, args, required=False)
+        return result if isinstance(result, str) else "OK"
+
+    async def executemany(self, sql: str, args: list[tuple[Any, ...]]) -> None:
+        for row in args:
+            await self.execute(sql, *row)
+
+    async def prepare(self, sql: str) -> FakeStatement:
+        return FakeStatement(self, sql)
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        yield
+
+    async def add_listener(self, channel: str, callback: Callable[..., None]) -> None:
+        self._pool.listeners.setdefault(channel, []).append((self, callback))
+
+    async def remove_listener(self, channel: str, callback: Callable[..., None]) -> None:
+        self._pool.listeners[channel] = [
+            (conn, cb) for conn, cb in self._pool.listeners.get(channel, []) if cb != callback
+        ]
+
+    def add_termination_listener(self, callback: Callable[..., None]) -> None:
+        self._pool.termination_listeners.append((self, callback))
+
+
+class FakePool:
+    """asyncpg.Pool look-alike backed by Python callables.
+
+    Args:
+        handlers: SQL text -> function of the query arguments returning a row
+            (a dict), a list of rows, or None. Whitespace in the SQL is ignored.
+        latency: Seconds added to every query, to mimic a network round-trip.
+        max_size: Connections handed out at once; further `acquire` calls wait.
+        init: Coroutine run on every new connection (asyncpg's `init`).
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, Handler] | None = None,
+        latency: float = 0.0,
+        max_size: int = 10,
+        init: Callable[[FakeConnection], Awaitable[None]] | None = None,
+    ) -> None:
+        self.handlers = {normalize_sql(sql): fn for sql, fn in (handlers or {}).items()}
+        self.latency = latency
+        self.max_size = max_size
+        self.init = init
+        self.queries = 0
+        self.acquired = 0
+        self._idle: list[FakeConnection] = []
+        self._size = 0
+        self._freed = asyncio.Condition()
+        self.listeners: dict[str, list[tuple[FakeConnection, Callable[..., None]]]] = {}
+        self.termination_listeners: list[tuple[FakeConnection, Callable[..., None]]] = []
+
+    def add_handler(self, sql: str, handler: Handler) -> None:
+        self.handlers[normalize_sql(sql)] = handler
+
+    def acquire(self, *, timeout: float | None = None) -> "_Acquire":
+        return _Acquire(self, timeout)
+
+    def get_size(self) -> int:
+        return self._size
+
+    def get_max_size(self) -> int:
+        return self.max_size
+
+    def get_idle_size(self) -> int:
+        return len(self._idle)
+
+    async def _acquire_conn(self, timeout: float | None = None) -> FakeConnection:
+        async with self._freed:
+            await asyncio.wait_for(
+                self._freed.wait_for(lambda: self._idle or self._size < self.max_size), timeout
+            )
+            fresh = not self._idle
+            if fresh:
+                self._size += 1
+                conn = FakeConnection(self)
+            else:
+                conn = self._idle.pop()
+        if fresh and self.init is not None:
+            try:
+                await self.init(conn)
+            except BaseException:
+                # asyncpg discards a connection whose init failed
+                async with self._freed:
+                    self._size -= 1
+                    self._freed.notify()
+                raise
+        self.acquired += 1
+        return conn
+
+    async def release(self, conn: FakeConnection) -> None:
+        async with self._freed:
+            self._idle.append(conn)
+            self._freed.notify()
+
+    def notify(self, channel: str, payload: str) -> None:
+        """Deliver a notification as Postgres would after a trigger fired."""
+        for conn, callback in list(self.listeners.get(channel, [])):
+            callback(conn, 0, channel, payload)
+
+    def terminate_listeners(self) -> None:
+        """Simulate the listening connections dropping."""
+        self.listeners.clear()
+        callbacks, self.termination_listeners = self.termination_listeners, []
+        for conn, callback in callbacks:
+            callback(conn)
+
+    async def close(self) -> None:
+        self.listeners.clear()
+        self.termination_listeners.clear()
+
+
+class _Acquire:
+    """Makes `pool.acquire()` usable both awaited and as `async with`, like asyncpg."""
+
+    def __init__(self, pool: FakePool, timeout: float | None) -> None:
+        self._pool = pool
+        self._timeout = timeout
+        self._conn: FakeConnection | None = None
+
+    def __await__(self):
+        return self._pool._acquire_conn(self._timeout).__await__()
+
+    async def __aenter__(self) -> FakeConnection:
+        self._conn = await self._pool._acquire_conn(self._timeout)
+        return self._conn
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._conn is not None:
+            await self._pool.release(self._conn)
@@ -2,12 +2,31 @@ import os
 import asyncio  
 import asyncpg  
 from datetime import datetime  
-from dataclasses import dataclass  
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Mapping
+from urllib.parse import parse_qs, urlsplit
 from pydantic import BaseModel, Field  
 from open_router_config import config
 from agents import Agent, Runner, function_tool, SQLiteSession, RunContextWrapper  
+from agents.memory import Session
+import postgres_session
+from subscription_cache import CHANNEL, NOTIFY_TRIGGER_SQL, InvalidationListener, SnapshotCache
+from subscription_catalog import (
+    CATALOG_CHANNEL, CATALOG_TABLE_SQL, DEFAULT_PLANS, LOAD_CATALOG_SQL, SEED_CATALOG_SQL, catalog, seed_rows,
+)
+from subscription_fakes import FakePool
+from subscription_sources import CachedSource, InMemorySource, PostgresSource, UserSnapshot, UserSource, demo_rows
+from subscription_statements import (
+    ADD_USAGE_SQL, CLEAR_SQL, INSERT_ITEMS_SQL, PLAN_SQL, POP_ITEM_SQL, SELECT_ITEMS_SQL, SELECT_LAST_ITEMS_SQL,
+    SNAPSHOT_SQL, TRIM_ITEMS_SQL, USAGE_SQL, registry,
+)
+from subscription_usage import UsageAccumulator
+from tracing_sampling import install_from_env
 
 config.tracing_disabled = False
+# TRACE_SAMPLE_RATE / TRACE_TAIL_SLOW_MS / TRACE_SPAN_RATE_LIMITS: trace a sample instead of everything
+trace_sampler = install_from_env()
 # Pydantic models for structured output  
 class UserEvent(BaseModel):  
     uid: str  
@@ -17,7 +36,7 @@ class UserEvent(BaseModel):
   
 class PlanFeatures(BaseModel):  
     plan_name: str  
-    api_calls_limit: int  2
+    api_calls_limit: int  
     support_level: str  
     features: list[str]  
   
@@ -29,40 +48,78 @@ class UsageInfo(BaseModel):
 @dataclass  
 class UserContext:  
     uid: str  
-    db_pool: asyncpg.Pool  
+    # In-memory table, database or cache (see subscription_sources)
+    source: UserSource
     session_id: str  
+    # Loaded at turn start; the lookups below only hit the source without one
+    snapshot: UserSnapshot | None = None
+    # Calls recorded but not yet written are added to the usage the tools see
+    usage_meter: UsageAccumulator | None = None
+    # Request-scoped memo: a context lives for one turn, so every tool call in
+    # the turn shares one lookup per key (concurrent calls await the same task)
+    cache_hits: int = field(default=0, init=False)
+    cache_misses: int = field(default=0, init=False)
+    _memo: dict[str, asyncio.Future] = field(default_factory=dict, init=False, repr=False)
+
+    async def _memoized(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `load` once per key; later and concurrent callers reuse its result."""
+        task = self._memo.get(key)
+        if task is None:
+            self.cache_misses += 1
+            task = self._memo[key] = asyncio.ensure_future(load())
+            task.add_done_callback(lambda t: self._forget_failed(key, t))
+        else:
+            self.cache_hits += 1
+        # shield: one cancelled tool call must not cancel the lookup the others wait on
+        return await asyncio.shield(task)
+
+    def _forget_failed(self, key: str, task: asyncio.Future) -> None:
+        if task.cancelled() or task.exception() is not None:
+            self._memo.pop(key, None)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        return {"hits": self.cache_hits, "misses": self.cache_misses}
+
+    # Fallbacks are applied here, not in _fetch_*: a failed lookup must reach
+    # the memo, which forgets it so the next tool call of the turn retries
+
+    async def get_plan(self) -> str:
+        """Get user's subscription plan (memoized for the turn)"""
+        try:
+            return await self._memoized("plan", self._fetch_plan)
+        except Exception as e:
+            print(f"Database error getting plan for user {self.uid}: {e}")
+            return "Error retrieving plan"
+
+    async def get_usage(self) -> Mapping[str, Any]:
+        """Get user's current API usage (memoized for the turn), including unflushed calls"""
+        try:
+            usage = await self._memoized("usage", self._fetch_usage)
+        except Exception as e:
+            print(f"Database error getting usage for user {self.uid}: {e}")
+            return {'current_usage': 0, 'limit': 0, 'percentage_used': 0}
+        pending = self.usage_meter.pending_for(self.uid) if self.usage_meter is not None else 0
+        if not pending or not usage['limit']:
+            return usage
+        current_usage = usage['current_usage'] + pending
+        return {
+            'current_usage': current_usage,
+            'limit': usage['limit'],
+            'percentage_used': (current_usage / usage['limit']) * 100,
+        }
+
+    async def _fetch_plan(self) -> str:  
+        """Get user's subscription plan from the snapshot or the source"""  
+        if self.snapshot is not None:
+            return self.snapshot.plan
+        return await self.source.plan(self.uid)
       
-    async def get_plan(self) -> str:  
-        """Get user's subscription plan from database"""  
-        try:  
-            async with self.db_pool.acquire() as conn:  
-                result = await conn.fetchrow(  
-                    "SELECT plan_type FROM user_subscriptions WHERE user_id = $1 AND active = true",   
-                    self.uid  
-                )  
-                return result['plan_type'] if result else "No active plan"  
-        except Exception as e:  
-            print(f"Database error getting plan for user {self.uid}: {e}")  
-            return "Error retrieving plan"  
-      
-    async def get_usage(self) -> dict:  
-        """Get user's current API usage"""  
-        try:  
-            async with self.db_pool.acquire() as conn:  
-                result = await conn.fetchrow(  
-                    "SELECT current_usage, monthly_limit FROM user_usage WHERE user_id = $1",   
-                    self.uid  
-                )  
-                if result:  
-                    return {  
-                        'current_usage': result['current_usage'],  
-                        'limit': result['monthly_limit'],  
-                        'percentage_used': (result['current_usage'] / result['monthly_limit']) * 100  
-                    }  
-                return {'current_usage': 0, 'limit': 0, 'percentage_used': 0}  
-        except Exception as e:  
-            print(f"Database error getting usage for user {self.uid}: {e}")  
-            return {'current_usage': 0, 'limit': 0, 'percentage_used': 0}  
+    async def _fetch_usage(self) -> Mapping[str, Any]:  
+        """Get user's current API usage from the snapshot or the source"""  
+        if self.snapshot is not None:
+            return self.snapshot.usage
+        return await self.source.usage(self.uid)
   
 # Function tools with proper error handling  
 @function_tool  
@@ -97,35 +154,8 @@ async def get_plan_features(context: RunContextWrapper[UserContext]) -> str:
         Detailed feature information for the user's plan.  
     """  
     plan = await context.context.get_plan()  
-      
-    features_map = {  
-        "Enterprise": {  
-            "api_calls": "Unlimited",  
-            "support": "24/7 Priority Support",  
-            "features": ["Custom integrations", "Advanced analytics", "Dedicated account manager", "SLA guarantee"]  
-        },  
-        "Pro": {  
-            "api_calls": "50,000/month",  
-            "support": "Email support (24h response)",  
-            "features": ["Advanced analytics", "API access", "Custom webhooks", "Priority processing"]  
-        },  
-        "Basic": {  
-            "api_calls": "5,000/month",  
-            "support": "Community support",  
-            "features": ["Basic analytics", "Standard API access", "Email notifications"]  
-        }  
-    }  
-      
-    if plan in features_map:  
-        features = features_map[plan]  
-        return f"""  
-Plan: {plan}  
-API Calls: {features['api_calls']}  
-Support: {features['support']}  
-Features: {', '.join(features['features'])}  
-        """.strip()  
-    else:  
-        return f"No feature information available for plan: {plan}"  
+    # Rendered once per plan when the catalog is (re)loaded
+    return catalog.features(plan)
   
 @function_tool  
 async def check_usage_limits(context: RunContextWrapper[UserContext]) -> str:  
@@ -169,15 +199,7 @@ async def upgrade_plan_info(context: RunContextWrapper[UserContext]) -> str:
         Information about available plan upgrades.  
     """  
     current_plan = await context.context.get_plan()  
-      
-    upgrade_info = {  
-        "Basic": "Upgrade to Pro for 10x more API calls and email support, or Enterprise for unlimited usage.",  
-        "Pro": "Upgrade to Enterprise for unlimited API calls and 24/7 priority support.",  
-        "Enterprise": "You're already on our highest tier plan!",  
-        "No active plan": "Choose from Basic ($9/month), Pro ($49/month), or Enterprise ($199/month)."  
-    }  
-      
-    return upgrade_info.get(current_plan, "Contact support for upgrade options.")  
+    return catalog.upgrade(current_plan)
   
 # Database initialization  
 async def init_database(db_pool: asyncpg.Pool):  
@@ -213,16 +235,92 @@ async def init_database(db_pool: asyncpg.Pool):
             VALUES ('1', 15000, 999999), ('2', 8500, 50000), ('3', 2100, 5000)  
             ON CONFLICT (user_id) DO NOTHING  
         """)  
+
+        # pg_notify the user id on every change, for the snapshot cache
+        await conn.execute(NOTIFY_TRIGGER_SQL)
+
+        # Plan catalog, reloaded by the app whenever it changes
+        await conn.execute(CATALOG_TABLE_SQL)
+        await conn.executemany(SEED_CATALOG_SQL, seed_rows())
+
+        # Conversation history (PostgresSession)
+        await conn.execute(postgres_session.SESSION_TABLES_SQL)
+
+def demo_fake_pool(latency: float = 0.0, user_count: int = 3) -> FakePool:
+    """FakePool serving the sample rows of init_database (DATABASE_URL=fake://)
+
+    Users past the three samples ('4', '5', ...) cycle through the plans, for load tests.
+    """
+    users = {uid: list(row) for uid, row in demo_rows(user_count).items()}
+
+    def snapshot_row(uid: str) -> dict | None:
+        if uid not in users:
+            return None
+        plan, current_usage, monthly_limit = users[uid]
+        return {'plan_type': plan, 'active': True, 'current_usage': current_usage, 'monthly_limit': monthly_limit}
+
+    def plan_row(uid: str) -> dict | None:
+        return {'plan_type': users[uid][0]} if uid in users else None
+
+    def usage_row(uid: str) -> dict | None:
+        return {'current_usage': users[uid][1], 'monthly_limit': users[uid][2]} if uid in users else None
+
+    def add_usage(uids: list[str], deltas: list[int]) -> list:
+        for uid, delta in zip(uids, deltas):
+            if uid in users:
+                users[uid][1] += delta
+                pool.notify(CHANNEL, uid)  # what the user_usage trigger does
+        return []
+
+    def catalog_rows() -> list[dict]:
+        return [
+            {'plan_name': p.name, 'upgrade_info': p.upgrade, 'api_calls': p.api_calls,
+             'support': p.support, 'features': list(p.features)}
+            for p in DEFAULT_PLANS
+        ]
+
+    # PostgresSession tables: session id -> message_data strings, oldest first
+    sessions: dict[str, list[str]] = {}
+
+    def insert_items(session_id: str, data: list[str]) -> str:
+        sessions.setdefault(session_id, []).extend(data)
+        return f"INSERT 0 {len(data)}"
+
+    def trim_items(session_id: str, keep: int) -> str:
+        items = sessions.get(session_id, [])
+        del items[:max(len(items) - keep, 0)]
+        return "DELETE"
+
+    def select_items(session_id: str, limit: int | None = None) -> list[dict]:
+        items = sessions.get(session_id, [])
+        if limit is not None:
+            items = items[-limit:] if limit > 0 else []
+        return [{'message_data': d} for d in items]
+
+    def pop_item(session_id: str) -> list[dict]:
+        items = sessions.get(session_id)
+        return [{'message_data': items.pop()}] if items else []
+
+    def clear_items(session_id: str) -> str:
+        sessions.pop(session_id, None)
+        return "DELETE"
+
+    pool = FakePool(
+        {SNAPSHOT_SQL: snapshot_row, PLAN_SQL: plan_row, USAGE_SQL: usage_row, ADD_USAGE_SQL: add_usage,
+         LOAD_CATALOG_SQL: catalog_rows,
+         INSERT_ITEMS_SQL: insert_items, TRIM_ITEMS_SQL: trim_items,
+         SELECT_ITEMS_SQL: select_items, SELECT_LAST_ITEMS_SQL: select_items,
+         POP_ITEM_SQL: pop_item, CLEAR_SQL: clear_items},
+        latency=latency,
+        init=registry.init_connection,
+    )
+    return pool
   
 # Authentication and validation  
 async def authenticate_user(uid: str, db_pool: asyncpg.Pool) -> bool:  
     """Authenticate user exists in database"""  
     try:  
-        async with db_pool.acquire() as conn:  
-            result = await conn.fetchrow(  
-                "SELECT user_id FROM user_subscriptions WHERE user_id = $1", uid  
-            )  
-            return result is not None  
+        return await PostgresSource(db_pool).snapshot(uid) is not None
     except Exception as e:  
         print(f"Authentication error for user {uid}: {e}")  
         return False  
@@ -231,11 +329,27 @@ def validate_input(query: str) -> bool:
     """Validate user input"""  
     return len(query.strip()) > 0 and len(query) < 1000  
   
+# Replies of turns whose agent did not run or failed (the load test counts them as failed)
+AUTH_FAILED_REPLY = "User authentication failed. Please check your user ID."
+AGENT_FAILED_REPLY = "Sorry, I encountered an error: "
+
 # Main application class  
 class SubscriptionAssistantApp:  
     def __init__(self):  
         self.db_pool = None  
         self.config = config
+        # Shared by every user of this process; kept fresh by LISTEN/NOTIFY
+        self.snapshot_cache = SnapshotCache(
+            maxsize=int(os.getenv("SNAPSHOT_CACHE_SIZE", "10000")),
+            ttl=float(os.getenv("SNAPSHOT_CACHE_TTL", "300")),
+        )
+        # One connection LISTENing for both the snapshot cache and the plan catalog
+        self.listener: InvalidationListener | None = None
+        self.usage_meter: UsageAccumulator | None = None
+        # Where UserContext reads plans and usage; the sample users until a database is set up
+        self.source: UserSource = InMemorySource.demo()
+        # Turn-scoped memo hits and misses of every UserContext, printed at shutdown
+        self.context_lookups: Counter = Counter()
           
         # Create agent with all tools  
         self.agent = Agent[UserContext](  
@@ -252,44 +366,78 @@ class SubscriptionAssistantApp:
         """Setup database connection and initialize tables"""  
         database_url = os.getenv("DATABASE_URL", "postgresql://localhost/subscription_app")  
         try:  
-            self.db_pool = await asyncpg.create_pool(database_url, min_size=1, max_size=10)  
-            await init_database(self.db_pool)  
+            if database_url.startswith("fake://"):
+                # e.g. fake://?latency_ms=2&users=1000
+                params = parse_qs(urlsplit(database_url).query)
+                self.db_pool = demo_fake_pool(
+                    latency=float(params.get("latency_ms", ["0"])[0]) / 1000,
+                    user_count=int(params.get("users", ["3"])[0]),
+                )
+                registry.use_pool(self.db_pool)
+                await init_database(self.db_pool)
+            else:
+                # Pool connections prepare every query as they open, so the tables they
+                # read must exist first: create them through a plain one-connection pool
+                bootstrap = await asyncpg.create_pool(database_url, min_size=1, max_size=1)
+                try:
+                    await init_database(bootstrap)
+                finally:
+                    await bootstrap.close()
+                # Sized from DB_POOL_* env vars; every connection comes with the queries prepared
+                self.db_pool = await registry.create_pool(database_url)
+            self.listener = InvalidationListener(
+                self.db_pool, {CHANNEL: self.snapshot_cache, CATALOG_CHANNEL: catalog},
+            )
+            await self.listener.start()
+            # After LISTEN: a change made while loading still reloads the catalog
+            await catalog.load(self.db_pool)
+            # Usage is written in batches; drop the cached snapshots a batch changed
+            self.usage_meter = UsageAccumulator(self.db_pool, on_flush=self._usage_flushed)
+            self.usage_meter.start()
+            self.source = CachedSource(PostgresSource(self.db_pool), self.snapshot_cache)
             print("Database initialized successfully")  
         except Exception as e:  
             print(f"Database setup failed: {e}")  
             # Fallback to SQLite for demo  
             print("Falling back to in-memory demo mode")  
-            self.db_pool = None  
+            await self.release_database()
+            self.source = InMemorySource.demo()
       
-    async def run_conversation(self, uid: str, query: str, session: SQLiteSession) -> str:  
+    def new_session(self, uid: str) -> Session:
+        """Conversation history of `uid`: on the shared pool, or a local SQLite file in demo mode"""
+        if self.db_pool is None:
+            return SQLiteSession(f"user_{uid}_session")
+        # SESSION_MAX_ITEMS > 0 keeps only that many of the newest items
+        max_items = int(os.getenv("SESSION_MAX_ITEMS", "0")) or None
+        return postgres_session.PostgresSession(f"user_{uid}_session", self.db_pool, max_items=max_items)
+
+    def _usage_flushed(self, uids) -> None:
+        # NOTIFY would do this too, but only after a round-trip
+        for uid in uids:
+            self.snapshot_cache.invalidate(uid)
+
+    async def run_conversation(self, uid: str, query: str, session: Session) -> str:  
         """Run a single conversation turn"""  
         if not validate_input(query):  
             return "Invalid input. Please provide a valid query."  
           
-        # For demo purposes, create a mock pool if database setup failed  
-        if self.db_pool is None:  
-            # Create mock context for demo  
-            user_context = UserContext(uid=uid, db_pool=None, session_id=session.session_id)  
-            # Override get_plan method for demo  
-            async def mock_get_plan():  
-                plans = {'1': 'Enterprise', '2': 'Pro', '3': 'Basic'}  
-                return plans.get(uid, 'No active plan')  
-            user_context.get_plan = mock_get_plan  
-              
-            async def mock_get_usage():  
-                usage_data = {  
-                    '1': {'current_usage': 15000, 'limit': 999999, 'percentage_used': 1.5},  
-                    '2': {'current_usage': 8500, 'limit': 50000, 'percentage_used': 17.0},  
-                    '3': {'current_usage': 2100, 'limit': 5000, 'percentage_used': 42.0}  
-                }  
-                return usage_data.get(uid, {'current_usage': 0, 'limit': 0, 'percentage_used': 0})  
-            user_context.get_usage = mock_get_usage  
-        else:  
-            # Authenticate user  
-            if not await authenticate_user(uid, self.db_pool):  
-                return "User authentication failed. Please check your user ID."  
-              
-            user_context = UserContext(uid=uid, db_pool=self.db_pool, session_id=session.session_id)  
+        # Authenticate and load plan + usage at once: one query, or none for a cached
+        # user or in demo mode; the tools read the snapshot
+        try:
+            snapshot = await self.source.snapshot(uid)
+        except Exception as e:
+            print(f"Authentication error for user {uid}: {e}")
+            snapshot = None
+        if snapshot is None:
+            return AUTH_FAILED_REPLY
+          
+        user_context = UserContext(  
+            uid=uid, source=self.source, session_id=session.session_id, snapshot=snapshot,
+            usage_meter=self.usage_meter,
+        )  
+        if self.usage_meter is not None:
+            # Meter this call; written to user_usage with the next batch
+            self.usage_meter.record(uid)
           
         try:  
             result = await Runner.run(  
@@ -303,7 +451,9 @@ class SubscriptionAssistantApp:
             return result.final_output  
         except Exception as e:  
             print(f"Agent execution failed: {e}")  
-            return f"Sorry, I encountered an error: {str(e)}"  
+            return f"{AGENT_FAILED_REPLY}{e}"
+        finally:
+            self.context_lookups.update(user_context.cache_stats)
       
     async def start_interactive_session(self):  
         """Start interactive command-line session"""  
@@ -324,7 +474,7 @@ class SubscriptionAssistantApp:
                         break  
                     if uid in ['1', '2', '3']:  
                         current_uid = uid  
-                        session = SQLiteSession(f"user_{uid}_session")  
+                        session = self.new_session(uid)
                         print(f"✅ Logged in as User {uid}")  
                         continue  
                     else:  
@@ -361,8 +511,43 @@ Available commands:
         except KeyboardInterrupt:  
             print("\n👋 Goodbye!")  
         finally:  
-            if self.db_pool:  
-                await self.db_pool.close()  
+            await self.shutdown()
+
+    async def shutdown(self):
+        """Flush pending usage, then release the listener and the pool"""
+        # Flush pending usage first: it needs the pool
+        if self.usage_meter is not None:
+            try:
+                await self.usage_meter.close()
+            except Exception as e:
+                print(f"Final usage flush failed: {e}")
+            print(f"Usage stats: {self.usage_meter.stats()}")
+            self.usage_meter = None
+        if self.db_pool:
+            print(f"Database stats: {registry.stats()}")
+        if trace_sampler is not None:
+            print(f"Trace sampling stats: {trace_sampler.stats()}")
+        if self.context_lookups:
+            print(f"Context lookup stats: {dict(self.context_lookups)}")
+        await self.release_database()
+
+    async def release_database(self):
+        """Stop the usage meter and the listener, then close the pool (whatever setup got to)"""
+        if self.usage_meter is not None:
+            try:
+                await self.usage_meter.close()
+            except Exception as e:
+                print(f"Usage flush failed: {e}")
+            self.usage_meter = None
+        if self.listener is not None:
+            try:
+                await self.listener.close()
+            except Exception as e:
+                print(f"Closing the invalidation listener failed: {e}")
+            self.listener = None
+        if self.db_pool:  
+            await self.db_pool.close()  
+            self.db_pool = None
   
 # Entry point  
 async def main():  
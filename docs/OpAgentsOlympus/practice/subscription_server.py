@@ -0,0 +1,250 @@
+"""Serve SubscriptionAssistantApp to many users at once over a TCP line protocol.
+
+The REPL in `start_interactive_session` serves one user at a time. This server
+runs any number of users concurrently on one event loop, sharing one
+app: one agent, one asyncpg pool, one snapshot cache and one usage meter.
+Each user gets their own session (`PostgresSession` on the shared pool, or
+`SQLiteSession` in demo mode). `run_conversation` builds a fresh
+`UserContext` for every turn.
+
+Protocol: one JSON object per line in each direction.
+
+    -> {"id": 7, "uid": "2", "query": "How much of my quota is left?"}
+    <- {"id": 7, "uid": "2", "reply": "...", "ms": 812.4}
+    <- {"id": 8, "uid": "3", "error": "busy", "ms": 0.1}
+
+A connection may interleave requests for different users. Replies come back
+as turns finish, and `id` pairs them with their requests. `{"stats": true}`
+returns the server counters. A line over 64 KiB is answered with
+`{"error": "bad request: line too long"}`; the server then answers the
+turns already asked and closes the connection.
+
+Admission control:
+
+- at most `max_runs` agent turns run at once (`SERVER_MAX_RUNS`, default 32);
+  the others wait their turn;
+- one user's turns run one after another, in arrival order, because they
+  share a session. At most `max_user_queue` may be queued per user
+  (`SERVER_MAX_USER_QUEUE`, default 4). Beyond that the request is answered
+  with `"error": "busy"`.
+
+Usage::
+
+    DATABASE_URL=fake:// python subscription_server.py --port 8765
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from agents.memory import Session
+
+from subscription_management_application import SubscriptionAssistantApp
+
+
+@dataclass
+class UserSlot:
+    """Per-user state kept between turns."""
+
+    session: Session
+    # Held while one of the user's turns runs; waiters are served in FIFO order
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    queued: int = 0
+
+
+class AssistantServer:
+    """Line-protocol front end sharing one SubscriptionAssistantApp between users.
+
+    Args:
+        app: The app; its database is set up by `start`.
+        max_runs: Agent turns allowed to run concurrently.
+        max_user_queue: Turns one user may have waiting or running.
+        max_users: Idle users whose sessions are kept; the least recent go first.
+    """
+
+    def __init__(
+        self,
+        app: SubscriptionAssistantApp | None = None,
+        max_runs: int | None = None,
+        max_user_queue: int | None = None,
+        max_users: int = 10_000,
+    ) -> None:
+        self.app = app or SubscriptionAssistantApp()
+        self.max_runs = max_runs or int(os.getenv("SERVER_MAX_RUNS", "32"))
+        self.max_user_queue = max_user_queue or int(os.getenv("SERVER_MAX_USER_QUEUE", "4"))
+        self.max_users = max_users
+        self._runs = asyncio.Semaphore(self.max_runs)
+        self._users: OrderedDict[str, UserSlot] = OrderedDict()
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.Task] = set()
+        self.active = 0
+        self.served = 0
+        self.rejected = 0
+        self.failed = 0
+
+    def _slot(self, uid: str) -> UserSlot:
+        slot = self._users.get(uid)
+        if slot is None:
+            self._evict()
+            slot = self._users[uid] = UserSlot(self.app.new_session(uid))
+        self._users.move_to_end(uid)
+        return slot
+
+    def _evict(self) -> None:
+        for uid in list(self._users):
+            if len(self._users) < self.max_users:
+                return
+            slot = self._users[uid]
+            if not slot.queued:
+                del self._users[uid]
+                slot.session.close()
+
+    async def turn(self, uid: str, query: str) -> str:
+        """Run one turn for `uid`; raises `ServerBusy` when its queue is full."""
+        slot = self._slot(uid)
+        if slot.queued >= self.max_user_queue:
+            self.rejected += 1
+            raise ServerBusy(uid)
+        slot.queued += 1
+        try:
+            async with slot.lock:
+                async with self._runs:
+                    self.active += 1
+                    try:
+                        reply = await self.app.run_conversation(uid, query, slot.session)
+                    finally:
+                        self.active -= 1
+        finally:
+            slot.queued -= 1
+        self.served += 1
+        return reply
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "active_runs": self.active,
+            "max_runs": self.max_runs,
+            "queued": sum(slot.queued for slot in self._users.values()) - self.active,
+            "users": len(self._users),
+            "served": self.served,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+        await self.app.setup_database()
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        for slot in self._users.values():
+            slot.session.close()
+        self._users.clear()
+        await self.app.shutdown()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(asyncio.current_task())
+        write_lock = asyncio.Lock()
+        pending: set[asyncio.Task] = set()
+
+        async def reply(message: dict) -> None:
+            async with write_lock:
+                writer.write(json.dumps(message).encode() + b"\n")
+                await writer.drain()
+
+        async def answer(request: dict) -> None:
+            start = time.perf_counter()
+            message = {"id": request.get("id"), "uid": request.get("uid")}
+            try:
+                message["reply"] = await self.turn(str(request["uid"]), str(request["query"]))
+            except ServerBusy:
+                message["error"] = "busy"
+            except Exception as e:
+                self.failed += 1
+                message["error"] = f"{type(e).__name__}: {e}"
+            message["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            await reply(message)
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Longer than the reader's limit. Where the next request starts is
+                    # unknown, so stop reading, but still answer what was asked before
+                    await reply({"error": "bad request: line too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    await reply({"error": f"bad request: {e}"})
+                    continue
+                if request.get("stats"):
+                    await reply({"id": request.get("id"), "stats": self.stats()})
+                    continue
+                if "uid" not in request or "query" not in request:
+                    await reply({"id": request.get("id"), "error": "bad request: uid and query are required"})
+                    continue
+                task = asyncio.ensure_future(answer(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            # Client finished sending (or sent garbage): answer what it already asked
+            await asyncio.gather(*pending, return_exceptions=True)
+        except (ConnectionError, asyncio.CancelledError):
+            for task in pending:
+                task.cancel()
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+
+class ServerBusy(Exception):
+    """A user already has `max_user_queue` turns waiting."""
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the subscription assistant over a JSON line protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-runs", type=int, help="concurrent agent turns (default: $SERVER_MAX_RUNS or 32)")
+    parser.add_argument("--max-user-queue", type=int, help="queued turns per user (default: $SERVER_MAX_USER_QUEUE or 4)")
+    args = parser.parse_args(argv)
+
+    server = AssistantServer(max_runs=args.max_runs, max_user_queue=args.max_user_queue)
+    await server.start(args.host, args.port)
+    print(f"Subscription Assistant serving on {args.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye!")
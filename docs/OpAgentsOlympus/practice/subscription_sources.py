@@ -0,0 +1,144 @@
+"""Where `UserContext` gets a user's plan and usage from.
+
+A `UserSource` answers three questions about a user id: the whole snapshot
+(which also authenticates the user), the plan and the usage. Three
+implementations:
+
+- `InMemorySource`: a precomputed, read-only table of `UserSnapshot`s. It is
+  used by demo mode and smoke tests. Nothing is built per turn: every call
+  returns the same frozen snapshot, and `snapshot.usage` is computed once
+  per snapshot.
+- `PostgresSource`: the prepared statements of `subscription_statements`
+  on an asyncpg pool (or a `FakePool`).
+- `CachedSource`: any source behind a `SnapshotCache`.
+"""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Mapping, Protocol
+
+from subscription_cache import SnapshotCache
+from subscription_statements import registry
+
+NO_USAGE = MappingProxyType({'current_usage': 0, 'limit': 0, 'percentage_used': 0})
+
+# The sample rows init_database inserts: uid -> (plan, current_usage, monthly_limit)
+DEMO_USERS = {
+    '1': ('Enterprise', 15000, 999999),
+    '2': ('Pro', 8500, 50000),
+    '3': ('Basic', 2100, 5000),
+}
+
+
+def demo_rows(user_count: int = 3) -> dict[str, tuple[str, int, int]]:
+    """The sample rows, plus users '4', '5', ... that cycle through them (for load tests)"""
+    rows = dict(DEMO_USERS)
+    for i in range(4, user_count + 1):
+        rows[str(i)] = DEMO_USERS[str(i % 3 + 1)]
+    return rows
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Everything a turn needs about a user, loaded once at turn start."""
+    uid: str
+    plan: str
+    current_usage: int
+    monthly_limit: int
+
+    @cached_property
+    def usage(self) -> Mapping[str, Any]:
+        if not self.monthly_limit:
+            return NO_USAGE
+        return MappingProxyType({
+            'current_usage': self.current_usage,
+            'limit': self.monthly_limit,
+            'percentage_used': (self.current_usage / self.monthly_limit) * 100,
+        })
+
+
+class UserSource(Protocol):
+    async def snapshot(self, uid: str) -> UserSnapshot | None:
+        """Plan and usage of `uid`; None if the user doesn't exist"""
+
+    async def plan(self, uid: str) -> str:
+        """Active plan of `uid` ("No active plan" if it has none)"""
+
+    async def usage(self, uid: str) -> Mapping[str, Any]:
+        """current_usage, limit and percentage_used of `uid`"""
+
+
+class InMemorySource:
+    """Read-only table of snapshots built once."""
+
+    def __init__(self, snapshots: Mapping[str, UserSnapshot]):
+        self._snapshots = MappingProxyType(dict(snapshots))
+
+    @classmethod
+    def demo(cls, user_count: int = 3) -> "InMemorySource":
+        return cls({
+            uid: UserSnapshot(uid, plan, current_usage, monthly_limit)
+            for uid, (plan, current_usage, monthly_limit) in demo_rows(user_count).items()
+        })
+
+    async def snapshot(self, uid: str) -> UserSnapshot | None:
+        return self._snapshots.get(uid)
+
+    async def plan(self, uid: str) -> str:
+        snapshot = self._snapshots.get(uid)
+        return snapshot.plan if snapshot is not None else "No active plan"
+
+    async def usage(self, uid: str) -> Mapping[str, Any]:
+        snapshot = self._snapshots.get(uid)
+        return snapshot.usage if snapshot is not None else NO_USAGE
+
+
+class PostgresSource:
+    """Prepared statements on an asyncpg pool."""
+
+    def __init__(self, pool: Any):
+        self.pool = pool
+
+    async def snapshot(self, uid: str) -> UserSnapshot | None:
+        row = await registry.fetchrow(self.pool, "snapshot", uid)
+        if row is None:
+            return None
+        return UserSnapshot(
+            uid=uid,
+            # Interned: equal plan names from every row share one string, as in the catalog
+            plan=sys.intern(row['plan_type']) if row['active'] else "No active plan",
+            current_usage=row['current_usage'] or 0,
+            monthly_limit=row['monthly_limit'] or 0,
+        )
+
+    async def plan(self, uid: str) -> str:
+        result = await registry.fetchrow(self.pool, "plan", uid)
+        return result['plan_type'] if result else "No active plan"
+
+    async def usage(self, uid: str) -> Mapping[str, Any]:
+        result = await registry.fetchrow(self.pool, "usage", uid)
+        if result is None or not result['monthly_limit']:
+            return NO_USAGE
+        return UserSnapshot(uid, "", result['current_usage'], result['monthly_limit']).usage
+
+
+class CachedSource:
+    """Serves `source` through a process-wide `SnapshotCache`."""
+
+    def __init__(self, source: UserSource, cache: SnapshotCache):
+        self.source = source
+        self.cache = cache
+
+    async def snapshot(self, uid: str) -> UserSnapshot | None:
+        return await self.cache.get(uid, lambda: self.source.snapshot(uid))
+
+    async def plan(self, uid: str) -> str:
+        snapshot = await self.snapshot(uid)
+        return snapshot.plan if snapshot is not None else "No active plan"
+
+    async def usage(self, uid: str) -> Mapping[str, Any]:
+        snapshot = await self.snapshot(uid)
+        return snapshot.usage if snapshot is not None else NO_USAGE
@@ -0,0 +1,300 @@
+"""Prepared statements, pool sizing and timings for the subscription app's asyncpg pool.
+
+Every query the app runs is registered here by name. `StatementRegistry.create_pool`
+builds the pool with an `init` hook that prepares all of them on each new
+connection, so no request pays for parsing or planning, not even the first
+one on a fresh connection. Preparing needs the tables, so the schema must be
+created before the pool. Queries go through `registry.fetchrow(pool, name, ...)`,
+which records:
+
+- per statement: calls, errors and latency (mean, p50, p99, max);
+- for the pool: how long callers waited for a connection, how many are
+  waiting right now (and the peak), and how many gave up after
+  `DB_POOL_ACQUIRE_TIMEOUT`.
+
+Waiting callers are the early sign of pool exhaustion. With an acquire
+timeout a burst fails fast instead of piling up behind a stuck pool.
+
+Pool sizing comes from the environment:
+
+=================================  =======  =========================================
+``DB_POOL_MIN_SIZE``               2        connections opened up front
+``DB_POOL_MAX_SIZE``               10       connections at most
+``DB_POOL_ACQUIRE_TIMEOUT``        5        seconds to wait for a free connection
+``DB_POOL_MAX_INACTIVE_LIFETIME``  300      seconds before an idle connection closes
+``DB_COMMAND_TIMEOUT``             10       seconds before a query is cancelled
+=================================  =======  =========================================
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+import asyncpg
+
+# Authentication, plan and usage in one round-trip
+SNAPSHOT_SQL = """
+    SELECT s.plan_type, s.active, u.current_usage, u.monthly_limit
+    FROM user_subscriptions s
+    LEFT JOIN user_usage u ON u.user_id = s.user_id
+    WHERE s.user_id = $1
+"""
+
+PLAN_SQL = "SELECT plan_type FROM user_subscriptions WHERE user_id = $1 AND active = true"
+
+USAGE_SQL = "SELECT current_usage, monthly_limit FROM user_usage WHERE user_id = $1"
+
+# Applies a batch of usage increments (see subscription_usage)
+ADD_USAGE_SQL = """
+    UPDATE user_usage u
+    SET current_usage = u.current_usage + d.delta
+    FROM unnest($1::text[], $2::integer[]) AS d(user_id, delta)
+    WHERE u.user_id = d.user_id
+"""
+
+# Conversation history (postgres_session.PostgresSession)
+
+# WITH ORDINALITY + ORDER BY: ids follow the order of the items
+INSERT_ITEMS_SQL = """
+    INSERT INTO agent_session_items (session_id, message_data)
+    SELECT $1, item::jsonb FROM unnest($2::text[]) WITH ORDINALITY AS t(item, n) ORDER BY n
+"""
+
+TRIM_ITEMS_SQL = """
+    DELETE FROM agent_session_items
+    WHERE session_id = $1 AND id <= (
+        SELECT id FROM agent_session_items WHERE session_id = $1
+        ORDER BY id DESC OFFSET $2 LIMIT 1
+    )
+"""
+
+SELECT_ITEMS_SQL = """
+    SELECT message_data FROM agent_session_items WHERE session_id = $1 ORDER BY id
+"""
+
+SELECT_LAST_ITEMS_SQL = """
+    SELECT message_data FROM (
+        SELECT id, message_data FROM agent_session_items WHERE session_id = $1
+        ORDER BY id DESC LIMIT $2
+    ) newest ORDER BY id
+"""
+
+POP_ITEM_SQL = """
+    DELETE FROM agent_session_items WHERE id = (
+        SELECT id FROM agent_session_items WHERE session_id = $1 ORDER BY id DESC LIMIT 1
+    )
+    RETURNING message_data
+"""
+
+CLEAR_SQL = "DELETE FROM agent_session_items WHERE session_id = $1"
+
+STATEMENTS = {
+    "snapshot": SNAPSHOT_SQL,
+    "plan": PLAN_SQL,
+    "usage": USAGE_SQL,
+    "add_usage": ADD_USAGE_SQL,
+    "session_insert": INSERT_ITEMS_SQL,
+    "session_trim": TRIM_ITEMS_SQL,
+    "session_items": SELECT_ITEMS_SQL,
+    "session_last_items": SELECT_LAST_ITEMS_SQL,
+    "session_pop": POP_ITEM_SQL,
+    "session_clear": CLEAR_SQL,
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "")
+    return int(value) if value.strip() else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name, "")
+    return float(value) if value.strip() else default
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+@dataclass(frozen=True)
+class DbPoolSettings:
+    """asyncpg pool sizing and timeouts."""
+
+    min_size: int = 2
+    max_size: int = 10
+    acquire_timeout: float = 5.0
+    max_inactive_lifetime: float = 300.0
+    command_timeout: float = 10.0
+
+    @classmethod
+    def from_env(cls) -> "DbPoolSettings":
+        return cls(
+            min_size=_env_int("DB_POOL_MIN_SIZE", cls.min_size),
+            max_size=_env_int("DB_POOL_MAX_SIZE", cls.max_size),
+            acquire_timeout=_env_float("DB_POOL_ACQUIRE_TIMEOUT", cls.acquire_timeout),
+            max_inactive_lifetime=_env_float("DB_POOL_MAX_INACTIVE_LIFETIME", cls.max_inactive_lifetime),
+            command_timeout=_env_float("DB_COMMAND_TIMEOUT", cls.command_timeout),
+        )
+
+
+class PreparedConnection(asyncpg.Connection):
+    """Connection class of the pool: carries its prepared statements by name."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.prepared: dict[str, asyncpg.prepared_stmt.PreparedStatement] = {}
+
+
+@dataclass
+class Timings:
+    """Latency counters; percentiles cover the most recent `window` samples."""
+
+    window: int = 1024
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    recent: deque = field(default_factory=deque, repr=False)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        if len(self.recent) > self.window:
+            self.recent.popleft()
+
+    def summary(self) -> dict[str, float | int]:
+        recent = list(self.recent)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(_percentile(recent, 0.50) * 1000, 3) if recent else 0.0,
+            "p99_ms": round(_percentile(recent, 0.99) * 1000, 3) if recent else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class StatementRegistry:
+    """Named statements, prepared once per pool connection, with timings.
+
+    Args:
+        statements: Name -> SQL of every query the app runs.
+    """
+
+    def __init__(self, statements: dict[str, str]) -> None:
+        self.statements = dict(statements)
+        self.settings = DbPoolSettings()
+        self.timings = {name: Timings() for name in self.statements}
+        self.acquire_wait = Timings()
+        self.acquire_timeouts = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.connections_prepared = 0
+        self._pool: Any = None
+
+    async def create_pool(self, dsn: str, settings: DbPoolSettings | None = None) -> asyncpg.Pool:
+        """asyncpg pool whose connections come with every statement prepared."""
+        self.settings = settings or DbPoolSettings.from_env()
+        s = self.settings
+        self._pool = await asyncpg.create_pool(
+            dsn,
+            min_size=s.min_size,
+            max_size=s.max_size,
+            max_inactive_connection_lifetime=s.max_inactive_lifetime,
+            command_timeout=s.command_timeout,
+            connection_class=PreparedConnection,
+            init=self.init_connection,
+        )
+        return self._pool
+
+    async def init_connection(self, conn: Any) -> None:
+        """Pool `init` hook: prepare every registered statement on `conn`."""
+        conn.prepared = {name: await conn.prepare(sql) for name, sql in self.statements.items()}
+        self.connections_prepared += 1
+
+    @asynccontextmanager
+    async def acquire(self, pool: Any) -> AsyncIterator[Any]:
+        """`pool.acquire()` with the configured timeout, timing the wait."""
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        start = time.perf_counter()
+        try:
+            conn = await pool.acquire(timeout=self.settings.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+        self.acquire_wait.add(time.perf_counter() - start)
+        try:
+            yield conn
+        finally:
+            await pool.release(conn)
+
+    async def fetchrow(self, pool: Any, name: str, *args: Any) -> Any:
+        """Run statement `name` on a pooled connection and return its first row."""
+        async with self.acquire(pool) as conn:
+            return await self.run(conn, name, "fetchrow", *args)
+
+    async def fetch(self, pool: Any, name: str, *args: Any) -> list[Any]:
+        async with self.acquire(pool) as conn:
+            return await self.run(conn, name, "fetch", *args)
+
+    async def run(self, conn: Any, name: str, method: str, *args: Any) -> Any:
+        """Run statement `name` on `conn`, prepared if `conn` came from `create_pool`."""
+        timings = self.timings[name]
+        stmt = getattr(conn, "prepared", {}).get(name)
+        start = time.perf_counter()
+        try:
+            if stmt is not None:
+                result = await getattr(stmt, method)(*args)
+            else:
+                result = await getattr(conn, method)(self.statements[name], *args)
+        except Exception:
+            timings.errors += 1
+            raise
+        finally:
+            timings.add(time.perf_counter() - start)
+        return result
+
+    def reset(self) -> None:
+        """Zero the counters (e.g. after a warm-up)."""
+        self.timings = {name: Timings() for name in self.statements}
+        self.acquire_wait = Timings()
+        self.acquire_timeouts = 0
+        self.max_waiting = self.waiting
+
+    def stats(self) -> dict[str, Any]:
+        pool = self._pool
+        return {
+            "pool": {
+                "size": pool.get_size() if pool is not None else 0,
+                "idle": pool.get_idle_size() if pool is not None else 0,
+                "max_size": pool.get_max_size() if pool is not None else self.settings.max_size,
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "acquire_timeouts": self.acquire_timeouts,
+                "acquire_wait": self.acquire_wait.summary(),
+                "connections_prepared": self.connections_prepared,
+            },
+            "statements": {name: t.summary() for name, t in self.timings.items() if t.count},
+        }
+
+    def use_pool(self, pool: Any) -> None:
+        """Report on a pool not built by `create_pool` (e.g. a FakePool)."""
+        self._pool = pool
+
+
+# Shared by the whole process, like the pool it describes
+registry = StatementRegistry(STATEMENTS)
@@ -0,0 +1,137 @@
+"""Write-behind metering of API calls for the subscription app.
+
+Incrementing `user_usage.current_usage` with one UPDATE per call would put a
+write on the primary for every request. `UsageAccumulator.record` only adds
+to an in-memory counter per user. A background task flushes all counters
+every `USAGE_FLUSH_INTERVAL` seconds (default 1), or sooner once
+`max_pending` users are waiting. Each flush is a single
+`UPDATE ... FROM unnest($1, $2)` statement (`ADD_USAGE_SQL`).
+
+Ordering rules that keep counts exact:
+
+- Only one flush runs at a time. A batch is taken out of `pending` before
+  it is written and stays visible through `pending_for` until the UPDATE
+  has committed, so readers never miss it or count it twice.
+- If the UPDATE fails, the batch is merged back into `pending` and retried
+  by the next flush. Nothing is dropped and nothing is applied twice.
+- Users are written in sorted order, so concurrent flushers (several app
+  processes) lock rows in the same order and cannot deadlock.
+- `close()` stops the timer and flushes whatever is left. It never cancels
+  a flush in progress: the UPDATE may already have committed, and merging
+  that batch back would write it twice. It asks the loop to stop and waits
+  for the running flush to finish. Call it before the pool is closed.
+
+A hard crash loses at most one interval of increments. That is the price
+of batching.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import Counter
+from typing import Any, Callable, Iterable
+
+from subscription_statements import registry
+
+
+class UsageAccumulator:
+    """Buffers usage increments per user and writes them in batches.
+
+    Args:
+        pool: asyncpg pool (or FakePool) the increments are written to.
+        interval: Seconds between flushes.
+        max_pending: Users buffered before a flush is started early.
+        on_flush: Called with the user ids of every committed batch.
+    """
+
+    def __init__(
+        self,
+        pool: Any,
+        interval: float | None = None,
+        max_pending: int = 1000,
+        on_flush: Callable[[Iterable[str]], None] | None = None,
+    ) -> None:
+        self.pool = pool
+        if interval is None:
+            interval = float(os.getenv("USAGE_FLUSH_INTERVAL", "1.0"))
+        self.interval = interval
+        self.max_pending = max_pending
+        self.on_flush = on_flush
+        self.pending: Counter[str] = Counter()
+        self._inflight: Counter[str] = Counter()
+        self._lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.written = 0
+
+    def record(self, uid: str, calls: int = 1) -> None:
+        """Count `calls` API calls for `uid` (no I/O)."""
+        self.pending[uid] += calls
+        if len(self.pending) >= self.max_pending:
+            self._wake.set()
+
+    def pending_for(self, uid: str) -> int:
+        """Calls recorded for `uid` that are not committed yet."""
+        return self.pending[uid] + self._inflight[uid]
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            if self._stopping:
+                return
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Usage flush failed ({e}); will retry")
+
+    async def flush(self) -> int:
+        """Write every pending increment in one statement; returns the users written."""
+        async with self._lock:
+            if not self.pending:
+                return 0
+            batch, self.pending = self.pending, Counter()
+            self._inflight = batch
+            uids = sorted(batch)
+            try:
+                await registry.fetch(self.pool, "add_usage", uids, [batch[uid] for uid in uids])
+            except BaseException:
+                self.failed_flushes += 1
+                self.pending.update(batch)
+                raise
+            finally:
+                self._inflight = Counter()
+            self.flushes += 1
+            self.written += len(uids)
+        if self.on_flush is not None:
+            self.on_flush(uids)
+        return len(uids)
+
+    async def close(self) -> None:
+        """Stop the background flusher (letting a running flush finish) and write what is left."""
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            # Only the wait between flushes is interrupted, never a flush
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending_users": len(self.pending),
+            "pending_calls": sum(self.pending.values()),
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "users_written": self.written,
+        }
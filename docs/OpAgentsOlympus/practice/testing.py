@@ -11,9 +11,9 @@ from agents import (
     Tool,
     RunConfig,
 )
+from shared_clients import get_client
 from typing import Any
 import os
-from openai import AsyncOpenAI
 import dotenv
 import asyncio
 
@@ -23,7 +23,7 @@ GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 
 if not GEMINI_API_KEY:
     raise ValueError("API key not found!!")
-client = AsyncOpenAI(
+client = get_client(
     api_key=GEMINI_API_KEY,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
@@ -4,9 +4,9 @@ from agents import (
     Runner,
     function_tool,
     RunConfig,
-    AsyncOpenAI,
     OpenAIChatCompletionsModel,
 )
+from shared_clients import get_client
 
 load_dotenv()
 import os
@@ -18,7 +18,7 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please define it in your .env file.")
 
 # Setup Gemini client
-external_client = AsyncOpenAI(
+external_client = get_client(
     api_key=gemini_api_key,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
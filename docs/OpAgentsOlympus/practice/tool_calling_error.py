@@ -1,11 +1,12 @@
-from agents import AsyncOpenAI, OpenAIChatCompletionsModel, Agent, Runner, function_tool, set_tracing_disabled, ModelSettings
+from agents import OpenAIChatCompletionsModel, Agent, Runner, function_tool, set_tracing_disabled, ModelSettings
+from shared_clients import get_client
 import os
 import dotenv
 
 set_tracing_disabled(True)
 dotenv.load_dotenv()
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-client = AsyncOpenAI(
+client = get_client(
     api_key=GEMINI_API_KEY,
     base_url='https://generativelanguage.googleapis.com/v1beta/openai',
 )
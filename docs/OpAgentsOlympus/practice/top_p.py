@@ -1,6 +1,6 @@
 import os
 import dotenv
-from openai import AsyncOpenAI
+from shared_clients import get_client
 from agents import (
     Agent,
     Runner,
@@ -15,7 +15,7 @@ gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
     raise ValueError("I guess you haven't set API KEY, I'am pretty sure you need to set it dude.")
 
-client = AsyncOpenAI(
+client = get_client(
     api_key=gemini_api_key,
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
 )
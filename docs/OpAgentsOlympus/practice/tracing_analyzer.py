@@ -0,0 +1,372 @@
+"""Where does a turn's latency go? Span trees and critical paths of exported traces.
+
+`TraceAnalyzer` rebuilds each trace's span tree as spans arrive. Spans are
+keyed by trace_id, and each one is linked to its parent through parent_id.
+Spans end (and are exported) before their parents, so a child may arrive
+before its parent; it waits in the trace until the parent shows up. When a
+trace finishes, the analyzer computes:
+
+- the critical path: the chain of spans that bounded the trace's duration
+  (for each span, the child that ended last, then the child that ended
+  before that one started, and so on), with the time each span contributes;
+- per span type (agent, generation, function, handoff, guardrail, ...):
+  total time, self time (not covered by child spans), child time and
+  critical-path time.
+
+The finished trace is then dropped, keeping only its `TraceReport` and the
+per-type totals. Memory therefore stays bounded on endless input. Traces
+that never finish are dropped too: the least recently active go first once
+`max_open` are open, and any trace idle for `idle_timeout` seconds goes as well.
+
+Input comes from either side of an exporter:
+
+- live: `add_trace_processor(TraceAnalyzer())` next to the usual processors.
+  `on_trace_start` records the workflow name and `on_trace_end` marks the
+  trace finished;
+- saved: `analyze_files(paths)` over captures of `tracing_to_file`. Records
+  may come in any order and nothing marks a trace's last span, so traces are
+  finished once all input has been read (or earlier, when `max_open` evicts
+  them). Idle eviction only runs on live input.
+
+Usage::
+
+    python tracing_analyzer.py traces --top 5
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from agents.tracing import TracingProcessor
+from agents.tracing.spans import Span
+from agents.tracing.traces import Trace
+
+from tracing_records import SpanRecord
+
+
+@dataclass(slots=True)
+class SpanNode:
+    span_id: str
+    parent_id: str | None
+    span_type: str
+    name: str
+    start_ns: int
+    end_ns: int
+    error: bool = False
+    children: list[SpanNode] = field(default_factory=list)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def self_ns(self) -> int:
+        """Duration minus the time covered by at least one child (clipped to this span)."""
+        covered = 0
+        cursor = self.start_ns
+        for child in sorted(self.children, key=lambda c: c.start_ns):
+            start = max(child.start_ns, cursor)
+            end = min(child.end_ns, self.end_ns)
+            if end > start:
+                covered += end - start
+                cursor = end
+        return self.duration_ns - covered
+
+
+@dataclass
+class TypeStats:
+    count: int = 0
+    errors: int = 0
+    total_ns: int = 0
+    self_ns: int = 0
+    child_ns: int = 0
+    critical_ns: int = 0
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": self.total_ns / 1e6,
+            "self_ms": self.self_ns / 1e6,
+            "child_ms": self.child_ns / 1e6,
+            "critical_ms": self.critical_ns / 1e6,
+        }
+
+
+@dataclass
+class TraceReport:
+    trace_id: str
+    workflow_name: str | None
+    duration_ns: int
+    span_count: int
+    # (span type, span name, nanoseconds the span itself contributed), outermost first
+    critical_path: list[tuple[str, str, int]]
+    by_type: dict[str, TypeStats]
+    # Spans whose parent never arrived; analyzed as extra roots
+    orphans: int = 0
+
+
+def critical_path(node: SpanNode, end_ns: int | None = None) -> list[tuple[SpanNode, int]]:
+    """(span, contributed ns) along the longest chain under `node`; contributions sum to its duration."""
+    cursor = node.end_ns if end_ns is None else min(node.end_ns, end_ns)
+    own = 0
+    below: list[tuple[SpanNode, int]] = []
+    for child in sorted(node.children, key=lambda c: c.end_ns, reverse=True):
+        if child.start_ns >= cursor:
+            # Overlaps a later critical child entirely
+            continue
+        child_end = min(child.end_ns, cursor)
+        own += cursor - child_end
+        below = critical_path(child, child_end) + below
+        cursor = max(child.start_ns, node.start_ns)
+        if cursor <= node.start_ns:
+            break
+    own += cursor - node.start_ns
+    return [(node, own)] + below
+
+
+class _OpenTrace:
+    __slots__ = ("trace_id", "workflow_name", "nodes", "waiting", "last_seen")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.workflow_name: str | None = None
+        self.nodes: dict[str, SpanNode] = {}
+        # parent_id -> children that arrived before their parent
+        self.waiting: dict[str, list[SpanNode]] = {}
+        self.last_seen = time.monotonic()
+
+    def add(self, node: SpanNode) -> None:
+        self.nodes[node.span_id] = node
+        node.children.extend(self.waiting.pop(node.span_id, ()))
+        if node.parent_id is not None:
+            parent = self.nodes.get(node.parent_id)
+            if parent is not None:
+                parent.children.append(node)
+            else:
+                self.waiting.setdefault(node.parent_id, []).append(node)
+        self.last_seen = time.monotonic()
+
+
+class TraceAnalyzer(TracingProcessor):
+    """Builds span trees incrementally and reports each finished trace.
+
+    Args:
+        max_open: Traces kept open at once; beyond that the least recently
+            active one is finished as is.
+        idle_timeout: Seconds without new spans after which an open trace is
+            finished as is.
+        keep_reports: How many recent `TraceReport`s to keep in `reports`.
+        on_report: Called with each `TraceReport` as it is produced.
+    """
+
+    def __init__(
+        self,
+        max_open: int = 1000,
+        idle_timeout: float = 300.0,
+        keep_reports: int = 100,
+        on_report: Callable[[TraceReport], None] | None = None,
+    ):
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self.on_report = on_report
+        self.reports: deque[TraceReport] = deque(maxlen=keep_reports)
+        self.totals: dict[str, TypeStats] = {}
+        self.traces = 0
+        self._open: OrderedDict[str, _OpenTrace] = OrderedDict()
+        # The SDK calls processors from whichever thread runs the agent
+        self._lock = threading.Lock()
+
+    def _trace(self, trace_id: str) -> _OpenTrace:
+        trace = self._open.get(trace_id)
+        if trace is None:
+            trace = self._open[trace_id] = _OpenTrace(trace_id)
+            while len(self._open) > self.max_open:
+                self._finish(next(iter(self._open)))
+        self._open.move_to_end(trace_id)
+        return trace
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Feed one exported trace or span dict (as `trace.export()` / `span.export()` return)."""
+        with self._lock:
+            if record.get("object") == "trace":
+                self._trace(record["id"]).workflow_name = record.get("workflow_name")
+                return
+            span = SpanRecord.from_export(record)
+            if span.duration_ns is None:
+                return
+            self._trace(span.trace_id).add(SpanNode(
+                span_id=span.span_id,
+                parent_id=span.parent_id,
+                span_type=span.span_type,
+                name=span.name,
+                start_ns=span.start_ns,
+                end_ns=span.end_ns,
+                error=span.error is not None,
+            ))
+
+    def finish(self, trace_id: str) -> TraceReport | None:
+        """Analyze and drop `trace_id` (None if it has no spans)."""
+        with self._lock:
+            return self._finish(trace_id)
+
+    def finish_all(self) -> list[TraceReport]:
+        with self._lock:
+            return [r for r in (self._finish(t) for t in list(self._open)) if r is not None]
+
+    def evict_idle(self, now: float | None = None) -> list[TraceReport]:
+        """Finish traces that saw no span for `idle_timeout` seconds."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [t.trace_id for t in self._open.values() if now - t.last_seen >= self.idle_timeout]
+            return [r for r in (self._finish(t) for t in idle) if r is not None]
+
+    def _finish(self, trace_id: str) -> TraceReport | None:
+        trace = self._open.pop(trace_id, None)
+        if trace is None or not trace.nodes:
+            return None
+        roots = [n for n in trace.nodes.values() if n.parent_id is None or n.parent_id not in trace.nodes]
+        orphans = sum(1 for n in roots if n.parent_id is not None)
+        # Several roots (an agent, then the agent it handed off to): analyze under one virtual root
+        top = roots[0] if len(roots) == 1 else SpanNode(
+            trace_id, None, "trace", trace.workflow_name or trace_id,
+            min(n.start_ns for n in roots), max(n.end_ns for n in roots), children=roots,
+        )
+
+        by_type: dict[str, TypeStats] = {}
+        for node in trace.nodes.values():
+            stats = by_type.setdefault(node.span_type, TypeStats())
+            own = node.self_ns()
+            stats.count += 1
+            stats.errors += node.error
+            stats.total_ns += node.duration_ns
+            stats.self_ns += own
+            stats.child_ns += node.duration_ns - own
+        path = critical_path(top)
+        for node, ns in path:
+            if node is not top or len(roots) == 1:
+                by_type[node.span_type].critical_ns += ns
+
+        report = TraceReport(
+            trace_id=trace_id,
+            workflow_name=trace.workflow_name,
+            duration_ns=top.duration_ns,
+            span_count=len(trace.nodes),
+            critical_path=[(node.span_type, node.name, ns) for node, ns in path if ns],
+            by_type=by_type,
+            orphans=orphans,
+        )
+        for span_type, stats in by_type.items():
+            total = self.totals.setdefault(span_type, TypeStats())
+            for name in ("count", "errors", "total_ns", "self_ns", "child_ns", "critical_ns"):
+                setattr(total, name, getattr(total, name) + getattr(stats, name))
+        self.traces += 1
+        self.reports.append(report)
+        if self.on_report is not None:
+            self.on_report(report)
+        return report
+
+    def summary(self) -> dict[str, dict[str, float | int]]:
+        """Per span type totals over every finished trace."""
+        with self._lock:
+            return {span_type: stats.as_dict() for span_type, stats in sorted(self.totals.items())}
+
+    # TracingProcessor interface, for live analysis
+
+    def on_trace_start(self, trace: Trace) -> None:
+        with self._lock:
+            self._trace(trace.trace_id).workflow_name = trace.name
+
+    def on_trace_end(self, trace: Trace) -> None:
+        self.finish(trace.trace_id)
+        self.evict_idle()
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        record = span.export()
+        if record:
+            self.add(record)
+
+    def shutdown(self) -> None:
+        self.finish_all()
+
+    def force_flush(self) -> None:
+        pass
+
+
+def analyze_records(records: Iterable[dict[str, Any]], analyzer: TraceAnalyzer | None = None) -> TraceAnalyzer:
+    """Feed saved records (any order) to `analyzer` and finish every trace at the end."""
+    analyzer = analyzer or TraceAnalyzer()
+    for record in records:
+        analyzer.add(record)
+    analyzer.finish_all()
+    return analyzer
+
+
+def analyze_files(paths: Iterable[str | Path], trace_id: str | None = None, **kwargs: Any) -> TraceAnalyzer:
+    """Analyze NDJSON captures written by `tracing_to_file.NDJSONFileExporter`."""
+    from tracing_to_file import read_records
+
+    return analyze_records(read_records(paths, trace_id), TraceAnalyzer(**kwargs))
+
+
+def format_report(report: TraceReport, top: int = 10) -> str:
+    lines = [
+        f"Trace {report.trace_id} ({report.workflow_name or 'unnamed'}): "
+        f"{report.duration_ns / 1e6:.1f} ms, {report.span_count} spans"
+        + (f", {report.orphans} orphaned" if report.orphans else "")
+    ]
+    path = sorted(report.critical_path, key=lambda step: step[2], reverse=True)[:top]
+    for span_type, name, ns in path:
+        share = ns / report.duration_ns * 100 if report.duration_ns else 0
+        lines.append(f"  {ns / 1e6:10.1f} ms {share:5.1f}%  {span_type}: {name}")
+    return "\n".join(lines)
+
+
+def format_summary(summary: dict[str, dict[str, float | int]]) -> str:
+    lines = [f"{'span type':<14}{'count':>7}{'errors':>7}{'total ms':>12}{'self ms':>12}{'child ms':>12}{'critical ms':>13}"]
+    for span_type, s in summary.items():
+        lines.append(
+            f"{span_type:<14}{s['count']:>7}{s['errors']:>7}{s['total_ms']:>12.1f}"
+            f"{s['self_ms']:>12.1f}{s['child_ms']:>12.1f}{s['critical_ms']:>13.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from tracing_to_file import trace_files
+
+    parser = argparse.ArgumentParser(description="Critical paths and per-span-type time of saved traces.")
+    parser.add_argument("paths", nargs="+", type=Path, help="trace files, or directories of them")
+    parser.add_argument("--trace-id", help="only this trace")
+    parser.add_argument("--prefix", default="traces", help="file name prefix inside directories")
+    parser.add_argument("--top", type=int, default=10, help="critical-path steps shown per trace")
+    parser.add_argument("--traces", type=int, default=5, help="slowest traces shown")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        files.extend(trace_files(path, args.prefix) if path.is_dir() else [path])
+    slowest: list[TraceReport] = []
+
+    def keep_slowest(report: TraceReport) -> None:
+        slowest.append(report)
+        slowest.sort(key=lambda r: r.duration_ns, reverse=True)
+        del slowest[args.traces:]
+
+    analyzer = analyze_files(files, args.trace_id, on_report=keep_slowest)
+    for report in slowest:
+        print(format_report(report, args.top))
+        print()
+    print(f"{analyzer.traces} traces")
+    print(format_summary(analyzer.summary()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,10 @@
 import asyncio
+import atexit
 import json
-from datetime import datetime
+import os
+import queue
+import threading
+from collections import Counter
 from rich.console import Console
 from rich.tree import Tree
 from rich.panel import Panel
@@ -14,6 +18,8 @@ from agents.tracing.spans import Span
 from agents.tracing.traces import Trace
 from typing import Any
 
+from tracing_records import SpanRecord, truncate
+
 
 class ComprehensiveRichConsoleSpanExporter(TracingExporter):
     """Prints traces and spans to console with rich formatting, showing all data like the OpenAI dashboard."""
@@ -31,8 +37,10 @@ class ComprehensiveRichConsoleSpanExporter(TracingExporter):
 
     def _export_trace(self, trace: Trace):
         trace_data = trace.export()
-        if not trace_data:
-            return
+        if trace_data:
+            self._render_trace(trace_data)
+
+    def _render_trace(self, trace_data: dict):
 
         # Format trace information like the dashboard
         trace_info = []
@@ -60,50 +68,33 @@ class ComprehensiveRichConsoleSpanExporter(TracingExporter):
 
     def _export_span(self, span: Span[Any]):
         span_data = span.export()
-        if not span_data:
-            return
-
-        # Extract all span information
-        span_id = span_data.get("id", "N/A")
-        parent_id = span_data.get("parent_id")
-        trace_id = span_data.get("trace_id", "N/A")
-        started_at = span_data.get("started_at")
-        ended_at = span_data.get("ended_at")
+        if span_data:
+            self._render_span(span_data)
 
-        # Calculate duration
-        duration = None
-        if started_at and ended_at:
-            try:
-                start_time = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
-                end_time = datetime.fromisoformat(ended_at.replace("Z", "+00:00"))
-                duration = (end_time - start_time).total_seconds()
-            except:
-                duration = None
-
-        # Get span type and data
-        span_details = span_data.get("span_data", {})
-        span_type = span_details.get("type", "unknown")
+    def _render_span(self, span_data: dict):
+        # Timestamps are parsed once, into integer nanoseconds
+        record = SpanRecord.from_export(span_data)
 
         # Create main tree with span type
-        tree = Tree(f"[bold green]Span:[/bold green] {span_type}")
+        tree = Tree(f"[bold green]Span:[/bold green] {record.span_type}")
 
         # Add core span metadata
-        tree.add(f"[cyan]Span ID:[/cyan] {span_id}")
-        tree.add(f"[cyan]Trace ID:[/cyan] {trace_id}")
-        if parent_id:
-            tree.add(f"[cyan]Parent ID:[/cyan] {parent_id}")
+        tree.add(f"[cyan]Span ID:[/cyan] {record.span_id}")
+        tree.add(f"[cyan]Trace ID:[/cyan] {record.trace_id}")
+        if record.parent_id:
+            tree.add(f"[cyan]Parent ID:[/cyan] {record.parent_id}")
 
         # Add timing information
-        if started_at:
-            tree.add(f"[cyan]Started At:[/cyan] {started_at}")
-        if ended_at:
-            tree.add(f"[cyan]Ended At:[/cyan] {ended_at}")
-        if duration is not None:
-            tree.add(f"[cyan]Duration:[/cyan] {duration:.3f}s")
+        if record.started_at:
+            tree.add(f"[cyan]Started At:[/cyan] {record.started_at}")
+        if record.ended_at:
+            tree.add(f"[cyan]Ended At:[/cyan] {record.ended_at}")
+        if record.duration_ns is not None:
+            tree.add(f"[cyan]Duration:[/cyan] {record.duration_ns / 1e9:.3f}s")
 
         # Add error information if present
-        if span_data.get("error"):
-            error_info = span_data["error"]
+        if record.error:
+            error_info = record.error
             error_tree = tree.add("[red]Error:[/red]")
             error_tree.add(f"[red]Message:[/red] {error_info.get('message', 'N/A')}")
             if error_info.get("data"):
@@ -112,7 +103,7 @@ class ComprehensiveRichConsoleSpanExporter(TracingExporter):
                 )
 
         # Add span-specific data based on type
-        self._add_span_type_data(tree, span_type, span_details)
+        self._add_span_type_data(tree, record.span_type, record.data)
 
         self.console.print(tree)
         self.console.print()  # Add spacing between spans
@@ -152,10 +143,7 @@ class ComprehensiveRichConsoleSpanExporter(TracingExporter):
             for i, msg in enumerate(data["input"]):
                 msg_tree = input_tree.add(f"Message {i + 1}")
                 msg_tree.add(f"Role: {msg.get('role', 'N/A')}")
-                content = msg.get("content", "")
-                if len(content) > 100:
-                    content = content[:100] + "..."
-                msg_tree.add(f"Content: {content}")
+                msg_tree.add(f"Content: {truncate(msg.get('content', ''), 100)}")
 
         if data.get("output"):
             output_tree = tree.add("[yellow]Output Messages:[/yellow]")
@@ -163,8 +151,8 @@ class ComprehensiveRichConsoleSpanExporter(TracingExporter):
                 msg_tree = output_tree.add(f"Message {i + 1}")
                 if isinstance(msg, dict):
                     for key, value in msg.items():
-                        if key == "content" and len(str(value)) > 100:
-                            value = str(value)[:100] + "..."
+                        if key == "content":
+                            value = truncate(value, 100)
                         msg_tree.add(f"{key}: {value}")
 
         if data.get("model_config"):
@@ -274,18 +262,163 @@ class ComprehensiveRichConsoleSpanExporter(TracingExporter):
                 custom_tree.add(f"{key}: {self._format_value(value)}")
 
     def _format_value(self, value: Any) -> str:
-        """Format a value for display, truncating if too long."""
-        if value is None:
-            return "None"
+        """Format a value for display, truncating if too long (without rendering all of it)."""
+        return truncate(value, 200)
+
+
+class ThreadedConsoleExporter(TracingExporter):
+    """Hands traces and spans to a renderer thread instead of printing them in `export`.
+
+    `export` runs in the BatchTraceProcessor worker. Here it only calls
+    `item.export()` and queues the resulting dict. A daemon thread builds the
+    rich trees and prints them, so a slow console no longer backs up the
+    batch queue (where spans would be dropped silently).
+
+    When the bounded queue is full, `policy` decides what gives:
+
+    - "coalesce" (default): the span is not rendered but counted by span
+      type. Once the renderer catches up it prints one summary line per
+      burst. Trace panels are dropped.
+    - "drop_oldest": the oldest queued record makes room for the new one.
+    - "drop_newest": the new record is dropped.
+
+    `stats()` reports the rendered, dropped and coalesced counts.
+    """
+
+    POLICIES = ("coalesce", "drop_oldest", "drop_newest")
+
+    def __init__(
+        self,
+        renderer: ComprehensiveRichConsoleSpanExporter | None = None,
+        max_queue: int = 1000,
+        policy: str = "coalesce",
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(self.POLICIES)}, not {policy!r}")
+        self.renderer = renderer or ComprehensiveRichConsoleSpanExporter()
+        self.policy = policy
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self.rendered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self._pending_coalesced: Counter = Counter()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="trace-console-renderer", daemon=True)
+        self._thread.start()
+        # Print what is still queued when the program ends
+        atexit.register(self.close)
 
-        str_value = str(value)
-        if len(str_value) > 200:
-            return str_value[:200] + "..."
-        return str_value
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        for item in items:
+            record = item.export()
+            if not record:
+                continue
+            kind = "trace" if isinstance(item, Trace) else "span"
+            if self._closed:
+                # Renderer is gone (interpreter shutting down): print inline
+                self._render(kind, record)
+            else:
+                self._offer(kind, record)
 
+    def _offer(self, kind: str, record: dict) -> None:
+        try:
+            self.queue.put_nowait((kind, record))
+            return
+        except queue.Full:
+            pass
+        if self.policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait((kind, record))
+            except queue.Full:
+                pass
+            with self._lock:
+                self.dropped += 1
+        elif self.policy == "coalesce" and kind == "span":
+            span_type = record.get("span_data", {}).get("type", "unknown")
+            with self._lock:
+                self._pending_coalesced[span_type] += 1
+                self.coalesced += 1
+        else:
+            with self._lock:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self.queue.get(timeout=0.25)
+            except queue.Empty:
+                self._flush_coalesced()
+                if self._closed:
+                    return
+                continue
+            try:
+                if item is None:
+                    self._flush_coalesced()
+                    return
+                self._render(*item)
+            finally:
+                self.queue.task_done()
+            if self.queue.empty():
+                self._flush_coalesced()
+
+    def _render(self, kind: str, record: dict) -> None:
+        try:
+            if kind == "trace":
+                self.renderer._render_trace(record)
+            else:
+                self.renderer._render_span(record)
+        except Exception as e:
+            # A bad record must not kill the renderer
+            self.renderer.console.print(f"[red]Could not render {kind}: {e}[/red]")
+        with self._lock:
+            self.rendered += 1
+
+    def _flush_coalesced(self) -> None:
+        with self._lock:
+            counts, self._pending_coalesced = self._pending_coalesced, Counter()
+        if counts:
+            by_type = ", ".join(f"{span_type}: {n}" for span_type, n in counts.most_common())
+            self.renderer.console.print(
+                f"[dim]… {sum(counts.values())} spans not shown while the console caught up ({by_type})[/dim]\n"
+            )
 
-# Use the comprehensive rich exporter
-comprehensive_processor = BatchTraceProcessor(ComprehensiveRichConsoleSpanExporter())
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self.queue.qsize(),
+                "rendered": self.rendered,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+            }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Render what is queued (waiting up to `timeout` seconds) and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+
+# Use the comprehensive rich exporter; TRACE_CONSOLE_SYNC=1 renders inside the
+# batch worker like before instead of on a renderer thread
+if os.getenv("TRACE_CONSOLE_SYNC") == "1":
+    console_exporter = ComprehensiveRichConsoleSpanExporter()
+else:
+    console_exporter = ThreadedConsoleExporter(
+        max_queue=int(os.getenv("TRACE_CONSOLE_QUEUE", "1000")),
+        policy=os.getenv("TRACE_CONSOLE_POLICY", "coalesce"),
+    )
+comprehensive_processor = BatchTraceProcessor(console_exporter)
 set_trace_processors([comprehensive_processor])
 
 
@@ -0,0 +1,188 @@
+"""Exported spans as slotted records, with timestamps parsed once and lazy truncation.
+
+`span.export()` returns a dict whose timestamps are ISO strings. The console
+exporter used to parse both of them with `datetime.fromisoformat` each
+time it needed a duration. It also ran `str()` on whole payloads (every
+message of a long generation input) just to keep their first 200
+characters. Here:
+
+- `SpanRecord.from_export` parses each timestamp once, into integer
+  nanoseconds since the epoch, so durations are exact integer differences;
+- `truncate(value, limit)` renders at most `limit` characters of a value.
+  Strings are sliced. Dicts, lists and tuples are rendered piece by piece
+  (like `str()` would) and rendering stops once the limit is reached, so a
+  huge payload is never turned into one huge string.
+
+No dependency on the SDK or rich: the console exporter, the analyzer and
+`agents_demo.bench.tracing` all use this module.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ELLIPSIS = "..."
+
+
+def parse_iso_ns(value: str | None) -> int | None:
+    """Nanoseconds since the epoch of an exported ISO timestamp (None if missing or malformed)."""
+    if not value:
+        return None
+    if value[-1] == "Z":
+        value = value[:-1] + "+00:00"
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - EPOCH
+    # Integer arithmetic: float timestamps lose microseconds
+    return ((delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1000
+
+
+class SpanRecord:
+    """One exported span, parsed once.
+
+    `data` is the raw `span_data` dict; nothing in it is copied or formatted
+    until a renderer asks for it.
+    """
+
+    __slots__ = (
+        "span_id", "trace_id", "parent_id", "span_type",
+        "started_at", "ended_at", "start_ns", "end_ns", "error", "data",
+    )
+
+    def __init__(
+        self,
+        span_id: str,
+        trace_id: str,
+        parent_id: str | None,
+        span_type: str,
+        started_at: str | None,
+        ended_at: str | None,
+        start_ns: int | None,
+        end_ns: int | None,
+        error: dict | None,
+        data: dict,
+    ):
+        self.span_id = span_id
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.span_type = span_type
+        self.started_at = started_at
+        self.ended_at = ended_at
+        self.start_ns = start_ns
+        self.end_ns = end_ns
+        self.error = error
+        self.data = data
+
+    @classmethod
+    def from_export(cls, record: dict[str, Any]) -> SpanRecord:
+        data = record.get("span_data") or {}
+        started_at, ended_at = record.get("started_at"), record.get("ended_at")
+        return cls(
+            span_id=record.get("id", "N/A"),
+            trace_id=record.get("trace_id", "N/A"),
+            parent_id=record.get("parent_id") or None,
+            span_type=data.get("type", "unknown"),
+            started_at=started_at,
+            ended_at=ended_at,
+            start_ns=parse_iso_ns(started_at),
+            end_ns=parse_iso_ns(ended_at),
+            error=record.get("error") or None,
+            data=data,
+        )
+
+    @property
+    def duration_ns(self) -> int | None:
+        if self.start_ns is None or self.end_ns is None:
+            return None
+        return self.end_ns - self.start_ns
+
+    @property
+    def name(self) -> str:
+        return self.data.get("name") or self.data.get("model") or self.span_type
+
+    def __repr__(self) -> str:
+        return f"SpanRecord({self.span_type} {self.span_id} of {self.trace_id}, {self.duration_ns} ns)"
+
+
+def _repr_head(value: str, count: int) -> str:
+    """The start of `repr(value)`, escaping only its first `count` characters.
+
+    The quote comes from the whole string, as `repr` picks it: double quotes
+    only when the string has a single quote and no double quote. The head
+    may differ from the whole, so its own repr isn't enough.
+    """
+    head = value[:count]
+    text = repr(head)
+    if "'" in value and '"' not in value:
+        # Neither quote in the head would need escaping, so only the delimiters change
+        return '"' + text[1:-1] + ('"' if len(head) == len(value) else "")
+    if text[0] == '"':
+        # The head has a single quote but the whole has a double one as well
+        text = "'" + text[1:-1].replace("'", "\\'") + "'"
+    return text if len(head) == len(value) else text[:-1]
+
+
+def _pieces(value: Any, budget: int) -> Iterator[str]:
+    """`str(value)` in pieces; stops producing once `budget` characters have been produced.
+
+    Only plain dicts, lists and tuples are taken apart. Subclasses (namedtuples,
+    OrderedDicts, ...) render themselves, so they are one `repr` piece.
+    """
+    kind = type(value)
+    if kind is dict:
+        open_, close = "{", "}"
+        items: Any = value.items()
+    elif kind is list or kind is tuple:
+        open_, close = ("[", "]") if kind is list else ("(", ")")
+        items = value
+    else:
+        # Strings inside containers: repr at most budget + 1 characters of them
+        yield _repr_head(value, max(budget, 0) + 1) if kind is str else repr(value)
+        return
+    yield open_
+    used = 1
+    for i, item in enumerate(items):
+        if used > budget:
+            return
+        if i:
+            yield ", "
+            used += 2
+        if kind is dict:
+            key, item = item
+            for piece in _pieces(key, budget - used):
+                yield piece
+                used += len(piece)
+            yield ": "
+            used += 2
+        for piece in _pieces(item, budget - used):
+            yield piece
+            used += len(piece)
+            if used > budget:
+                return
+    if kind is tuple and len(value) == 1:
+        yield ","
+    yield close
+
+
+def truncate(value: Any, limit: int = 200) -> str:
+    """`str(value)`, cut to `limit` characters plus "..." without rendering the rest."""
+    if value is None:
+        return "None"
+    if type(value) is str:
+        return value if len(value) <= limit else value[:limit] + ELLIPSIS
+    if type(value) not in (dict, list, tuple):
+        text = str(value)
+        return text if len(text) <= limit else text[:limit] + ELLIPSIS
+    parts = []
+    used = 0
+    for piece in _pieces(value, limit):
+        parts.append(piece)
+        used += len(piece)
+        if used > limit:
+            return "".join(parts)[:limit] + ELLIPSIS
+    return "".join(parts)
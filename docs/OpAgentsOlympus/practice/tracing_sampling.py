@@ -0,0 +1,230 @@
+"""Trace only part of the traffic without losing the traces that matter.
+
+`SamplingProcessor` wraps another `TracingProcessor` (usually a
+`BatchTraceProcessor`) and decides what reaches it:
+
+- head sampling: a trace is kept when a hash of its trace_id falls below
+  `sample_rate`. The hash is stable, so every process keeps the same traces;
+- tail sampling: the spans of traces that head sampling skipped are held
+  until the trace ends. The trace is forwarded anyway when one of its spans
+  failed (`keep_errors`) or took at least `slow_ms`; otherwise it is
+  dropped;
+- per-span-type rate limits: a token bucket per type, e.g.
+  `{"generation": 20}` forwards at most 20 generation spans per second
+  (bursts up to that many). Failed spans are never rate limited.
+
+Held traces are bounded by `max_pending_traces` (the oldest is dropped) and
+by `max_spans_per_trace`.
+
+`install_from_env()` wraps the SDK's default processor when any of
+`TRACE_SAMPLE_RATE`, `TRACE_TAIL_SLOW_MS` or `TRACE_SPAN_RATE_LIMITS`
+(`generation=20,function=100`) is set; `TRACE_TAIL_ERRORS=0` stops keeping
+failed traces. With none of them set, tracing stays as it is.
+
+Usage::
+
+    set_trace_processors([
+        SamplingProcessor(BatchTraceProcessor(exporter), sample_rate=0.05, slow_ms=5000),
+    ])
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Mapping
+
+from agents.tracing import TracingProcessor, set_trace_processors
+from agents.tracing.processors import default_processor
+from agents.tracing.spans import Span
+from agents.tracing.traces import Trace
+
+from tracing_records import parse_iso_ns
+
+
+def head_sampled(trace_id: str, rate: float) -> bool:
+    """Whether `trace_id` falls in the first `rate` of the hash space (same answer everywhere)."""
+    if rate >= 1:
+        return True
+    if rate <= 0:
+        return False
+    return zlib.crc32(trace_id.encode()) < rate * 0x1_0000_0000
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `rate` (one second of burst)."""
+
+    __slots__ = ("rate", "tokens", "updated")
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    def take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class _PendingTrace:
+    __slots__ = ("trace", "spans", "keep", "truncated")
+
+    def __init__(self, trace: Trace | None):
+        self.trace = trace
+        self.spans: list[Span[Any]] = []
+        self.keep = False
+        self.truncated = 0
+
+
+class SamplingProcessor(TracingProcessor):
+    """Forwards a sample of traces and spans to `processor`.
+
+    Args:
+        processor: Receives what is kept.
+        sample_rate: Share of traces kept up front (0 to 1).
+        keep_errors: Keep skipped traces that have a failed span.
+        slow_ms: Keep skipped traces that have a span at least this long (None: off).
+        span_rate_limits: Span type -> spans forwarded per second.
+        max_pending_traces: Skipped traces held at once waiting for their end.
+        max_spans_per_trace: Spans held per skipped trace; later ones are dropped.
+    """
+
+    def __init__(
+        self,
+        processor: TracingProcessor,
+        sample_rate: float = 1.0,
+        keep_errors: bool = True,
+        slow_ms: float | None = None,
+        span_rate_limits: Mapping[str, float] | None = None,
+        max_pending_traces: int = 1000,
+        max_spans_per_trace: int = 1000,
+    ):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.keep_errors = keep_errors
+        self.slow_ns = int(slow_ms * 1_000_000) if slow_ms is not None else None
+        self.buckets = {span_type: TokenBucket(rate) for span_type, rate in (span_rate_limits or {}).items()}
+        self.max_pending_traces = max_pending_traces
+        self.max_spans_per_trace = max_spans_per_trace
+        self._tail = keep_errors or self.slow_ns is not None
+        self._pending: OrderedDict[str, _PendingTrace] = OrderedDict()
+        self.counts: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        # The SDK calls processors from whichever thread runs the agent
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, processor: TracingProcessor) -> SamplingProcessor:
+        limits = {}
+        for entry in filter(None, os.getenv("TRACE_SPAN_RATE_LIMITS", "").split(",")):
+            span_type, _, rate = entry.partition("=")
+            limits[span_type.strip()] = float(rate)
+        slow_ms = os.getenv("TRACE_TAIL_SLOW_MS", "")
+        return cls(
+            processor,
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1")),
+            keep_errors=os.getenv("TRACE_TAIL_ERRORS", "1") != "0",
+            slow_ms=float(slow_ms) if slow_ms.strip() else None,
+            span_rate_limits=limits,
+        )
+
+    def _interesting(self, span: Span[Any]) -> bool:
+        if self.keep_errors and span.error is not None:
+            return True
+        if self.slow_ns is not None:
+            start, end = parse_iso_ns(span.started_at), parse_iso_ns(span.ended_at)
+            return start is not None and end is not None and end - start >= self.slow_ns
+        return False
+
+    def _forward_span(self, span: Span[Any]) -> None:
+        span_type = span.span_data.type
+        bucket = self.buckets.get(span_type)
+        if bucket is not None and span.error is None and not bucket.take():
+            self.rate_limited[span_type] += 1
+            return
+        self.counts["spans_forwarded"] += 1
+        self.processor.on_span_end(span)
+
+    def on_trace_start(self, trace: Trace) -> None:
+        with self._lock:
+            if head_sampled(trace.trace_id, self.sample_rate):
+                self.counts["traces_head_sampled"] += 1
+                forward = True
+            else:
+                forward = False
+                if self._tail:
+                    self._pending[trace.trace_id] = _PendingTrace(trace)
+                    while len(self._pending) > self.max_pending_traces:
+                        self._pending.popitem(last=False)
+                        self.counts["traces_evicted"] += 1
+        if forward:
+            self.processor.on_trace_start(trace)
+
+    def on_trace_end(self, trace: Trace) -> None:
+        if head_sampled(trace.trace_id, self.sample_rate):
+            self.processor.on_trace_end(trace)
+            return
+        with self._lock:
+            pending = self._pending.pop(trace.trace_id, None)
+            if pending is None or not pending.keep:
+                self.counts["traces_dropped"] += 1
+                return
+            self.counts["traces_tail_sampled"] += 1
+            self.counts["spans_truncated"] += pending.truncated
+        # Replay the trace as if it had been kept from the start
+        self.processor.on_trace_start(trace)
+        with self._lock:
+            for span in pending.spans:
+                self._forward_span(span)
+        self.processor.on_trace_end(trace)
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        # Only kept traces see span starts; held spans are replayed on end
+        if head_sampled(span.trace_id, self.sample_rate):
+            self.processor.on_span_start(span)
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        with self._lock:
+            if head_sampled(span.trace_id, self.sample_rate):
+                self._forward_span(span)
+                return
+            pending = self._pending.get(span.trace_id)
+            if pending is None:
+                self.counts["spans_dropped"] += 1
+                return
+            if self._interesting(span):
+                pending.keep = True
+            if len(pending.spans) < self.max_spans_per_trace:
+                pending.spans.append(span)
+            else:
+                pending.truncated += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self.counts,
+                "pending_traces": len(self._pending),
+                "rate_limited": dict(self.rate_limited),
+            }
+
+    def shutdown(self) -> None:
+        self.processor.shutdown()
+
+    def force_flush(self) -> None:
+        self.processor.force_flush()
+
+
+def install_from_env(processor: TracingProcessor | None = None) -> SamplingProcessor | None:
+    """Sample `processor` (default: the SDK's own) when a TRACE_* sampling variable is set."""
+    if not any(os.getenv(name) for name in ("TRACE_SAMPLE_RATE", "TRACE_TAIL_SLOW_MS", "TRACE_SPAN_RATE_LIMITS")):
+        return None
+    sampler = SamplingProcessor.from_env(processor or default_processor())
+    set_trace_processors([sampler])
+    return sampler
@@ -0,0 +1,290 @@
+"""Write traces and spans to NDJSON files, for workers that can't reach a dashboard.
+
+`NDJSONFileExporter` is a `TracingExporter` that appends each `trace.export()`
+or `span.export()` dict as one JSON line:
+
+- lines are encoded into one preallocated buffer, and the buffer is written
+  to the file once per exported batch (or when it fills);
+- the file rotates when it reaches `max_bytes` or when it is `max_age`
+  seconds old;
+- file names carry a random token of the exporter and files are created
+  exclusively, so workers sharing a directory (or a restart within the
+  same second) never write to, or compress, each other's files;
+- with `compression="gzip"` or `"zstd"`, rotated files are compressed by a
+  background thread, so `export` never waits on the compressor. zstd needs
+  the `zstandard` package.
+
+`read_records` streams records back from any mix of plain and compressed
+files, one line at a time, so multi-GB captures never sit in memory. With
+`trace_id`, lines that don't contain that id are skipped before JSON
+parsing.
+
+Usage::
+
+    set_trace_processors([BatchTraceProcessor(NDJSONFileExporter("traces"))])
+
+    python tracing_to_file.py traces --trace-id trace_123abc
+"""
+from __future__ import annotations
+
+import argparse
+import atexit
+import gzip
+import json
+import os
+import queue
+import secrets
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, IO, Iterable, Iterator
+
+from agents.tracing.processors import TracingExporter
+from agents.tracing.spans import Span
+from agents.tracing.traces import Trace
+
+SUFFIXES = {None: ".ndjson", "gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("zstd compression needs the 'zstandard' package: pip install zstandard")
+    return zstandard
+
+
+def compress_file(path: Path, compression: str) -> Path:
+    """Compress `path` next to itself, remove it and return the compressed file.
+
+    Raises `FileExistsError` (and keeps `path`) if the compressed file exists already.
+    """
+    target = path.with_name(path.name.removesuffix(".ndjson") + SUFFIXES[compression])
+    if target.exists():
+        raise FileExistsError(f"{target} exists; not replacing it")
+    partial = target.with_name(target.name + ".partial")
+    raw = open(partial, "xb")
+    try:
+        with open(path, "rb") as src, raw:
+            if compression == "gzip":
+                with gzip.open(raw, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+            else:
+                with _zstandard().ZstdCompressor().stream_writer(raw, closefd=False) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+        # Readers only ever see complete files under their final name. A link,
+        # unlike os.replace, fails instead of overwriting a target that appeared meanwhile
+        os.link(partial, target)
+    finally:
+        partial.unlink(missing_ok=True)
+    path.unlink()
+    return target
+
+
+class NDJSONFileExporter(TracingExporter):
+    """Appends exported traces and spans to rotating NDJSON files.
+
+    Args:
+        directory: Where the files go; created if missing.
+        prefix: File names are `<prefix>-<UTC timestamp>-<token>-<n>.ndjson`,
+            where the token is random per exporter.
+        max_bytes: Rotate once the current file reaches this size.
+        max_age: Rotate once the current file is this many seconds old
+            (checked when spans arrive).
+        compression: None, "gzip" or "zstd"; applied to rotated files.
+        buffer_size: Bytes of the preallocated write buffer.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike = "traces",
+        prefix: str = "traces",
+        max_bytes: int = 64 * 1024 * 1024,
+        max_age: float = 3600.0,
+        compression: str | None = None,
+        buffer_size: int = 256 * 1024,
+    ):
+        if compression not in SUFFIXES:
+            raise ValueError(f"compression must be None, 'gzip' or 'zstd', not {compression!r}")
+        if compression == "zstd":
+            _zstandard()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compression = compression
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._used = 0
+        self._file: IO[bytes] | None = None
+        self._path: Path | None = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._sequence = 0
+        self._token = secrets.token_hex(4)
+        # The batch worker exports, but shutdown/force_flush may call in from another thread
+        self._lock = threading.Lock()
+        self.records = 0
+        self.files: list[Path] = []
+        self._compress_queue: queue.Queue = queue.Queue()
+        self._compressor: threading.Thread | None = None
+        if compression is not None:
+            self._compressor = threading.Thread(target=self._compress_loop, name="trace-file-compressor", daemon=True)
+            self._compressor.start()
+        atexit.register(self.close)
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        with self._lock:
+            for item in items:
+                record = item.export()
+                if record:
+                    self._append(json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n")
+                    self.records += 1
+            self._flush_buffer()
+
+    def _append(self, line: bytes) -> None:
+        if self._file is None or self._should_rotate(len(line)):
+            self._rotate()
+        if self._used + len(line) > len(self._buffer):
+            self._flush_buffer()
+            if len(line) > len(self._buffer):
+                # Bigger than the whole buffer: write it straight through
+                self._file.write(line)
+                self._size += len(line)
+                return
+        self._view[self._used:self._used + len(line)] = line
+        self._used += len(line)
+        self._size += len(line)
+
+    def _should_rotate(self, incoming: int) -> bool:
+        if self._size and self._size + incoming > self.max_bytes:
+            return True
+        return time.monotonic() - self._opened_at >= self.max_age
+
+    def _flush_buffer(self) -> None:
+        if self._used:
+            self._file.write(self._view[:self._used])
+            self._used = 0
+
+    def _rotate(self) -> None:
+        self._close_file()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        while True:
+            self._sequence += 1
+            self._path = self.directory / f"{self.prefix}-{stamp}-{self._token}-{self._sequence}.ndjson"
+            try:
+                # Never append to a file someone else created
+                self._file = open(self._path, "xb", buffering=0)
+                break
+            except FileExistsError:
+                continue
+        self._size = 0
+        self._opened_at = time.monotonic()
+        self.files.append(self._path)
+
+    def _close_file(self) -> None:
+        if self._file is None:
+            return
+        self._flush_buffer()
+        self._file.close()
+        self._file = None
+        if self.compression is not None and self._size:
+            self._compress_queue.put(self._path)
+
+    def _compress_loop(self) -> None:
+        while (path := self._compress_queue.get()) is not None:
+            try:
+                compressed = compress_file(path, self.compression)
+                with self._lock:
+                    self.files[self.files.index(path)] = compressed
+            except Exception as e:
+                # Keep the plain file; nothing is lost
+                print(f"Could not compress {path}: {e}", file=sys.stderr)
+
+    def close(self) -> None:
+        """Flush, close the current file and wait for pending compression."""
+        with self._lock:
+            self._close_file()
+        if self._compressor is not None and self._compressor.is_alive():
+            self._compress_queue.put(None)
+            self._compressor.join()
+
+
+def trace_files(directory: str | os.PathLike, prefix: str = "traces") -> list[Path]:
+    """Files written by the exporter in `directory`, oldest first."""
+    directory = Path(directory)
+    files = [p for suffix in SUFFIXES.values() for p in directory.glob(f"{prefix}-*{suffix}")]
+
+    def order(path: Path) -> tuple[str, str, int]:
+        # <prefix>-<timestamp>-<token>-<n>.ndjson[.gz|.zst]: by timestamp, then exporter,
+        # then sequence number (captures from before tokens have no token)
+        stamp, *token, sequence = path.name.split(".")[0][len(prefix) + 1:].split("-")
+        return stamp, "".join(token), int(sequence)
+
+    return sorted(files, key=order)
+
+
+def _open(path: Path) -> IO[bytes]:
+    if path.name.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.name.endswith(".zst"):
+        return _zstandard().ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def _lines(path: Path, stream: IO[bytes]) -> Iterator[bytes]:
+    if not path.name.endswith(".zst"):
+        yield from stream
+        return
+    # zstd stream readers have no readline, so split chunks ourselves
+    rest = b""
+    while chunk := stream.read(1 << 20):
+        *lines, rest = (rest + chunk).split(b"\n")
+        yield from lines
+    if rest:
+        yield rest
+
+
+def read_records(paths: Iterable[str | os.PathLike], trace_id: str | None = None) -> Iterator[dict]:
+    """Stream records from NDJSON files (plain, .gz or .zst), optionally only those of `trace_id`.
+
+    Trace records carry their id in "id", spans in "trace_id"; both match.
+    """
+    needle = json.dumps(trace_id).encode() if trace_id is not None else None
+    for path in map(Path, paths):
+        with _open(path) as stream:
+            for line in _lines(path, stream):
+                # Cheap substring test first: most lines of a big file belong to other traces
+                if needle is not None and needle not in line:
+                    continue
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if needle is None:
+                    yield record
+                    continue
+                record_trace = record.get("trace_id") if record.get("object") != "trace" else record.get("id")
+                if record_trace == trace_id:
+                    yield record
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Print records of an NDJSON trace capture.")
+    parser.add_argument("paths", nargs="+", type=Path, help="trace files, or directories of them")
+    parser.add_argument("--trace-id", help="only records of this trace")
+    parser.add_argument("--prefix", default="traces", help="file name prefix inside directories")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in args.paths:
+        files.extend(trace_files(path, args.prefix) if path.is_dir() else [path])
+    for record in read_records(files, args.trace_id):
+        sys.stdout.write(json.dumps(record) + "\n")
+
+
+if __name__ == '__main__':
+    main()
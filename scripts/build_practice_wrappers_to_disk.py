@@ -5,48 +5,26 @@ virtual generation is not taking effect in your environment. It creates
 `docs/OpAgentsOlympus/practice/<name>.md` for each `.py` file in the same folder when a
 wrapper does not already exist. Safe to run multiple times.
 
+With `--jobs N` (N > 1) wrappers are written durably: each file's data is
+synced, then its directory once. Trees of 10,000+ wrappers are also rendered
+in a process pool. The output is byte-identical to the serial path.
+The work itself lives in `agents_demo.docgen`.
+
 Usage:
-    python scripts/build_practice_wrappers_to_disk.py
+    python scripts/build_practice_wrappers_to_disk.py [--jobs N]
 """
 from __future__ import annotations
 
+import sys
 from pathlib import Path
 
-DOCS_ROOT = Path(__file__).resolve().parent.parent / "docs"
-PRACTICE = DOCS_ROOT / "OpAgentsOlympus" / "practice"
-
-SKIP = {
-    "tempCodeRunnerFile.py",
-}
-
-WRAPPER = """# {title}
-
-???+ note "Source code in OpAgentsOlympus/practice/{filename}"
-    ```python title="OpAgentsOlympus/practice/{filename}"
-    --8<-- "{filename}"
-    ```
-"""
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
 
-def titleize(stem: str) -> str:
-    return " ".join(p.capitalize() for p in stem.replace("_", " ").split())
+from agents_demo.docgen.cli import main as docgen_main  # noqa: E402
 
 
 def main() -> None:
-    if not PRACTICE.exists():
-        raise SystemExit(f"Practice folder not found: {PRACTICE}")
-
-    created = 0
-    for py in sorted(PRACTICE.glob("*.py")):
-        if py.name in SKIP:
-            continue
-        md = py.with_suffix(".md")
-        if md.exists():
-            continue
-        md.write_text(WRAPPER.format(title=titleize(py.stem), filename=py.name), encoding="utf-8")
-        print(f"Wrote {md.relative_to(DOCS_ROOT)}")
-        created += 1
-
-    print(f"Done. {created} wrapper(s) created.")
+    docgen_main(["wrappers", *sys.argv[1:]])
 
 
 if __name__ == "__main__":
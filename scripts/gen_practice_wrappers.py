@@ -11,172 +11,122 @@ Rules:
   overwrite it (your hand-authored content wins).
 - Only `.py` files are wrapped. You can extend the script if you want more types.
 - Skips clearly transient or undesirable files by name.
+
+Incremental builds:
+- Rendered wrappers are materialized under `.cache/gen-files/pages/` and a
+  manifest (`.cache/gen-files/manifest.json`) records the source path, mtime,
+  size, sha256 and generated target for every wrapper.
+- On rebuild a source whose mtime/size is unchanged (or whose sha256 still
+  matches) reuses its cached page; only changed sources are re-rendered. The
+  MCQ `index.md` is only re-rendered when its entry set changes.
+- Cached pages are registered with MkDocs directly, so unchanged wrappers are
+  not rewritten through `mkdocs_gen_files.open`.
+
+Snippet inlining:
+- Each wrapper's `--8<--` include of its own source is resolved once against
+  the `pymdownx.snippets` base paths and replaced by the file content, so page
+  rendering doesn't probe and re-read it. Anything the inliner can't reproduce
+  exactly stays a normal include. `GEN_FILES_INLINE_SNIPPETS=0` turns it off.
+
+Batched mode:
+- The tree is stat'ed once by `agents_demo.docgen.FileIndex`.
+- Set `GEN_FILES_JOBS=N` (N > 1) to write changed wrappers durably (each
+  file's data synced, then its directory once) and, for 10,000+ of them,
+  render them in a process pool.
+  Output is byte-identical to the serial path.
 """
 from __future__ import annotations
 
+import os
+import sys
 import traceback
 from pathlib import Path
 
 import mkdocs_gen_files
+from mkdocs.structure.files import File
 from mkdocs_gen_files import config as gen_config
 
-PRACTICE_DIR = Path(gen_config.docs_dir).resolve() / "OpAgentsOlympus" / "practice"
-
-# Names to skip (case-sensitive)
-SKIP_FILES = {
-    "tempCodeRunnerFile.py",
-}
-
-# Directories to skip
-SKIP_DIRS = {
-    "openai-agents-python",
-}
-
-WRAPPER_TEMPLATE = """# {title}\n\n???+ note \"Source code in OpAgentsOlympus/practice/{filename}\"\n    ```python title=\"OpAgentsOlympus/practice/{filename}\"\n    --8<-- \"{filename}\"\n    ```\n"""
-
-WRAPPER_TEMPLATE_ABS = """# {title}\n\n???+ note \"Source code in {abs_path}\"\n    ```python title=\"{abs_path}\"\n    --8<-- \"{abs_path}\"\n    ```\n"""
-
-WRAPPER_TEMPLATE_INCLUDE_RAW = """# {title}\n\n--8<-- \"{abs_path}\"\n"""
-
-INDEX_HEADER = """# 100 MCQs Answer\n\nBelow are all MCQ example scripts, rendered with collapsible source.\n"""
-PRACTICE_INDEX_HEADER = """# All Practice Examples\n\nQuick index of all practice scripts.\n"""
-
-def title_from_stem(stem: str) -> str:
-    # Simple titleizer: replace underscores with spaces and capitalize words
-    return " ".join(part.capitalize() for part in stem.replace("_", " ").split())
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from agents_demo.docgen import FileIndex, load_manifest, plan_virtual_wrappers, render_mcq_index  # noqa: E402
+from agents_demo.docgen.snippets import DEFAULT_BASE_PATHS  # noqa: E402
+from agents_demo.docgen.wrappers import MCQ_INDEX  # noqa: E402
+
+CACHE_DIR = Path(gen_config.docs_dir).resolve().parent / ".cache" / "gen-files"
+JOBS = int(os.environ.get("GEN_FILES_JOBS", "1") or 1)
+
+
+def register_page(target_rel_md: str, abs_path: Path) -> None:
+    """Add a cached page to the MkDocs files collection without copying it.
+
+    `FilesEditor.files` returns a fresh `Files` copy on every access, so the
+    page goes into the editor's own src_uri -> File mapping (the one the
+    plugin hands back to MkDocs). Editors without that mapping get a plain
+    copy through `mkdocs_gen_files.open`.
+    """
+    editor = mkdocs_gen_files.FilesEditor.current()
+    mapping = getattr(editor, "_files", None)
+    if mapping is None:
+        with mkdocs_gen_files.open(target_rel_md, "w") as fh:
+            fh.write(abs_path.read_text(encoding="utf-8"))
+        return
+    # What File.generated builds, without its need to run inside a plugin event
+    page = File(
+        target_rel_md, src_dir=None, dest_dir=editor.config.site_dir,
+        use_directory_urls=editor.config.use_directory_urls,
+    )
+    page.abs_src_path = str(abs_path)
+    page.generated_by = "mkdocs-gen-files"
+    mapping[target_rel_md] = page
+    editor.edit_paths.setdefault(target_rel_md, None)
+
+
+def snippet_base_paths() -> tuple[tuple[str, ...], Path]:
+    """`pymdownx.snippets` base paths from the MkDocs config, and the dir they are relative to."""
+    config = mkdocs_gen_files.FilesEditor.current().config
+    base = config["mdx_configs"].get("pymdownx.snippets", {}).get("base_path", DEFAULT_BASE_PATHS)
+    if isinstance(base, str):
+        base = [base]
+    return tuple(base), Path(config.config_file_path).resolve().parent
 
 
 def main() -> None:
     try:
         docs_root = Path(gen_config.docs_dir).resolve()
-        practice_dir = docs_root / "OpAgentsOlympus" / "practice"
         agents_dir = docs_root / "OpAgentsOlympus"
-        # Preferred MCQ source location (kept inside docs tree, near practice examples)
-        mcq_src_dir = docs_root / "OpAgentsOlympus" / "practice" / "mcqs-src"
-        mcq_default_dir = docs_root / "OpAgentsOlympus" / "practice" / "100 MCQs Answer"
         print(f"[gen-files] Practice wrapper generator starting… docs_dir={docs_root}")
 
-        if not agents_dir.exists():
+        # Fresh walk on every build: under `mkdocs serve` this process outlives the tree state
+        index = FileIndex.shared(docs_root.parent, refresh=True)
+        if not index.exists(agents_dir):
             print(f"[gen-files] OpAgentsOlympus dir not found: {agents_dir}")
             return
 
-        py_files = sorted(practice_dir.rglob("*.py")) + sorted(agents_dir.glob("*.py"))
-        print(f"[gen-files] Scanning {practice_dir} (recursive) -> {len(py_files)} .py files")
-
-        # MCQ sources (kept inside docs under a safe folder name)
-        mcq_py_files = []
-        mcq_md_like_files = []  # markdown-like content files to include raw
-        # Prefer mcqs-src, otherwise fall back to original folder with spaces (legacy)
-        if mcq_src_dir.exists():
-            mcq_py_files = sorted(mcq_src_dir.glob("*.py"))
-            # Also accept plain .md so README.md works out-of-the-box
-            mcq_md_like_files = sorted(
-                list(mcq_src_dir.glob("*.md")) +
-                list(mcq_src_dir.glob("*.mdsrc")) +
-                list(mcq_src_dir.glob("*.md.txt"))
-            )
-            print(f"[gen-files] MCQ src: {mcq_src_dir} -> {len(mcq_py_files)} .py, {len(mcq_md_like_files)} md-like files")
-        elif mcq_default_dir.exists():
-            mcq_py_files = sorted(mcq_default_dir.glob("*.py"))
-            mcq_md_like_files = sorted(list(mcq_default_dir.glob("*.md")))
-            print(f"[gen-files] MCQ src (fallback): {mcq_default_dir} -> {len(mcq_py_files)} .py, {len(mcq_md_like_files)} .md")
-
-        # Probing disabled now that generation is verified
-
-        # Collect lists to build indices
-        mcq_entries = []  # list[tuple[str, str]] -> (title, target_rel_md)
+        base_paths, base_root = snippet_base_paths()
+        manifest = load_manifest(index, CACHE_DIR, base_paths, base_root)
 
-        def slugify(name: str) -> str:
-            import re
-            s = name.lower()
-            s = re.sub(r"[^a-z0-9]+", "-", s)
-            s = re.sub(r"^-+|-+$", "", s)
-            return s or "item"
-
-        def is_excluded_path(path: Path) -> bool:
-            # Check if the path contains openai-agents-python folder
-            parts = path.parts
-            if "openai-agents-python" in parts:
-                return True
-            return False
-
-        for py_path in py_files:
-            if py_path.name in SKIP_FILES or is_excluded_path(py_path):
-                print(f"[gen-files] Skipping excluded file: {py_path}")
-                continue
-
-            rel_to_docs = py_path.resolve().relative_to(docs_root)
-            parts = rel_to_docs.parts
-            title = title_from_stem(py_path.stem)
-
-            # Default target path: mirror alongside source (same folder), .md extension
-            target_rel_md = rel_to_docs.with_suffix(".md").as_posix()
-
-            # Regular practice files only (MCQs handled from mcq_src_dir or fallback below)
-            if "100 MCQs Answer" in parts or "mcqs-src" in parts:
-                # Skip generating in-place wrappers for problematic MCQ filenames
-                continue
-            # Skip if a real .md exists next to the .py (author-provided content wins)
-            if py_path.with_suffix('.md').exists():
-                print(f"[gen-files] Skipping existing wrapper on disk: {py_path.with_suffix('.md')}")
-                continue
-            content = WRAPPER_TEMPLATE.format(title=title, filename=py_path.name)
-
-            with mkdocs_gen_files.open(target_rel_md, "w") as f:  # type: ignore[call-arg]
-                f.write(content)
-            print(f"[gen-files] Generated wrapper: {target_rel_md}")
-            # No overall practice index generation (kept nav curated)
-
-        # MCQ wrappers (from moved source dir)
-        safe_dir = "OpAgentsOlympus/practice/100-mcqs-answer"
-        for py in mcq_py_files:
-            if is_excluded_path(py):
-                print(f"[gen-files] Skipping excluded MCQ file: {py}")
-                continue
-            title = title_from_stem(py.stem)
-            safe_name = slugify(py.stem) + ".md"
-            target_rel_md = f"{safe_dir}/{safe_name}"
-            abs_src_path = py.resolve().relative_to(docs_root).as_posix()  # e.g. assets/mcqs-src/1-...py
-            content = WRAPPER_TEMPLATE_ABS.format(title=title, abs_path=abs_src_path)
-            with mkdocs_gen_files.open(target_rel_md, "w") as f:  # type: ignore[call-arg]
-                f.write(content)
-            print(f"[gen-files] Generated wrapper: {target_rel_md}")
-            mcq_entries.append((title, target_rel_md))
-
-        for md_like in mcq_md_like_files:
-            if is_excluded_path(md_like):
-                print(f"[gen-files] Skipping excluded MCQ markdown file: {md_like}")
-                continue
-            raw_stem = md_like.stem.replace('.md', '')  # handle .mdsrc or .md.txt, or plain .md
-            title = title_from_stem(raw_stem.lstrip('#').strip())
-            # Preserve README filename so a nav link to README.md works out-of-the-box
-            if raw_stem.lower() == 'readme':
-                safe_name = 'README.md'
-            else:
-                safe_name = slugify(raw_stem) + ".md"
-            target_rel_md = f"{safe_dir}/{safe_name}"
-            abs_src_path = md_like.resolve().relative_to(docs_root).as_posix()
-            content = WRAPPER_TEMPLATE_INCLUDE_RAW.format(title=title, abs_path=abs_src_path)
-            with mkdocs_gen_files.open(target_rel_md, "w") as f:  # type: ignore[call-arg]
-                f.write(content)
-            print(f"[gen-files] Generated wrapper: {target_rel_md}")
-            mcq_entries.append((title, target_rel_md))
+        mcq_entries = []  # list[tuple[str, str]] -> (title, target_rel_md)
+        for spec in plan_virtual_wrappers(index, docs_root):
+            if manifest.emit(spec.source, index.stat(spec.source), spec.key, spec.target, spec.template, spec.fields):
+                print(f"[gen-files] Generated wrapper: {spec.target}")
+            register_page(spec.target, manifest.page(spec.target))
+            if spec.mcq:
+                mcq_entries.append((spec.title, spec.target))
+        # No overall practice index generation (kept nav curated)
 
         # Write an index page for the MCQs folder for easy navigation
         if mcq_entries:
-            from pathlib import Path as _P
-            mcq_entries.sort(key=lambda x: x[0].lower())
-            lines = [INDEX_HEADER, "\n"]
-            for title, rel_md in mcq_entries:
-                # Use a relative link from within the index folder, include .md to satisfy MkDocs validation
-                href = _P(rel_md).name
-                lines.append(f"- [{title}]({href})")
-            index_content = "\n".join(lines) + "\n"
-            with mkdocs_gen_files.open("OpAgentsOlympus/practice/100-mcqs-answer/index.md", "w") as f:  # type: ignore[call-arg]
-                f.write(index_content)
-            print("[gen-files] Generated wrapper: OpAgentsOlympus/practice/100-mcqs-answer/index.md")
-
-        # No overall practice index (user prefers curated nav only)
+            if manifest.emit_index(MCQ_INDEX, mcq_entries, lambda: render_mcq_index(mcq_entries)):
+                print(f"[gen-files] Generated wrapper: {MCQ_INDEX}")
+            register_page(MCQ_INDEX, manifest.page(MCQ_INDEX))
+
+        manifest.flush(JOBS)
+        pruned = manifest.prune(keep_index=bool(mcq_entries))
+        manifest.save()
+        print(
+            f"[gen-files] Wrappers: {manifest.regenerated} regenerated, "
+            f"{manifest.reused} reused from cache, {pruned} pruned"
+        )
     except Exception:
         print("[gen-files] ERROR in gen_practice_wrappers.py:\n" + traceback.format_exc())
 
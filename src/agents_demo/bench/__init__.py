@@ -0,0 +1,10 @@
+"""Benchmark harnesses.
+
+Each module is runnable with ``python -m agents_demo.bench.<name>`` and writes
+a JSON report meant to be diffed across commits.
+"""
+from __future__ import annotations
+
+from .stats import summarize
+
+__all__ = ["summarize"]
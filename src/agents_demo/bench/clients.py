@@ -0,0 +1,99 @@
+"""Smoke test of the shared clients against the fake model server.
+
+Starts :class:`~agents_demo.fake_model.FakeModelServer` on a free port and
+sends one plain and one streamed chat completion through
+:func:`agents_demo.clients.get_client`, with ``AGENTS_FAKE_MODEL_URL``
+pointing at the server. The run fails (exit status 1) unless both replies
+arrive, the server saw both requests and :func:`~agents_demo.clients.pool_stats`
+counted them with status 200. This is the path every config module and
+converted practice script takes, so it catches a client that can't send
+anything at all.
+
+Usage::
+
+    python -m agents_demo.bench.clients --out clients.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from agents_demo.clients import FAKE_MODEL_ENV, aclose_all, get_client, pool_stats
+from agents_demo.fake_model import FakeModelServer
+
+REPORT_VERSION = 1
+PROMPT = "ping"
+
+
+async def exercise() -> dict[str, Any]:
+    """One plain and one streamed completion through the shared client."""
+    client = get_client("https://api.invalid/v1", "unused")
+    try:
+        start = time.perf_counter()
+        completion = await client.chat.completions.create(
+            model="fake", messages=[{"role": "user", "content": PROMPT}],
+        )
+        plain_s = time.perf_counter() - start
+        start = time.perf_counter()
+        chunks = []
+        stream = await client.chat.completions.create(
+            model="fake", messages=[{"role": "user", "content": PROMPT}], stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                chunks.append(chunk.choices[0].delta.content)
+        streamed_s = time.perf_counter() - start
+        return {
+            "plain": {"text": completion.choices[0].message.content, "ms": round(plain_s * 1000, 3)},
+            "streamed": {"text": "".join(chunks), "ms": round(streamed_s * 1000, 3)},
+            "pool": pool_stats(),
+        }
+    finally:
+        await aclose_all()
+
+
+def check(results: dict[str, Any], server: FakeModelServer) -> list[str]:
+    """What went wrong, if anything."""
+    problems = []
+    for kind in ("plain", "streamed"):
+        if PROMPT not in (results[kind]["text"] or ""):
+            problems.append(f"{kind} reply does not echo the prompt: {results[kind]['text']!r}")
+    if server.requests != 2 or server.streamed != 1:
+        problems.append(f"server saw {server.requests} requests ({server.streamed} streamed), expected 2 (1)")
+    pool = results["pool"]
+    if len(pool) != 1 or pool[0]["requests"] != 2 or pool[0]["status"] != {200: 2}:
+        problems.append(f"pool_stats() did not count two 200 responses: {pool}")
+    return problems
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.bench.clients", description=__doc__.splitlines()[0])
+    parser.add_argument("--out", type=Path, help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with FakeModelServer(port=0) as server:
+        os.environ[FAKE_MODEL_ENV] = server.base_url
+        results = asyncio.run(exercise())
+    problems = check(results, server)
+
+    report = {"version": REPORT_VERSION, **results, "problems": problems}
+    text = json.dumps(report, indent=2, sort_keys=True, default=str) + "\n"
+    if args.out is None:
+        sys.stdout.write(text)
+    else:
+        args.out.write_text(text, encoding="utf-8")
+    for problem in problems:
+        print(f"FAILED: {problem}", file=sys.stderr)
+    if problems:
+        raise SystemExit(1)
+    print("ok: plain and streamed completions through get_client()", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
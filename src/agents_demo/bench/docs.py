@@ -0,0 +1,354 @@
+"""Build-time benchmark for the docs pipeline.
+
+Builds a synthetic tree shaped like this repository -- N practice scripts,
+M MCQ sources named ``#NN. <name>.py`` and K modules under ``src/`` -- and
+times each generator stage separately:
+
+=====================  =====================================================
+``index_walk``         one :class:`~agents_demo.docgen.FileIndex` walk
+``gen_wrappers_cold``  ``scripts/gen_practice_wrappers.py`` run the way the
+                       gen-files plugin runs it (under a real ``FilesEditor``
+                       on the tree's MkDocs files), empty cache
+``gen_wrappers_warm``  the same with a warm manifest and nothing changed
+``gen_wrappers_touch`` the same after one practice script was edited
+``disk_wrappers``      ``build_practice_wrappers_to_disk.py`` (``--jobs``)
+``module_index_cold``  AST-parse every module under ``src/`` (empty cache)
+``module_index_warm``  the same against the on-disk module index cache
+``ref_stubs``          ``generate_ref_files.py`` (warm module index)
+``mkdocstrings_load``  griffe collection of ``src/``, the part of mkdocstrings
+                       rendering that scales with module count (skipped when
+                       griffe is not installed)
+=====================  =====================================================
+
+Usage::
+
+    python -m agents_demo.bench.docs --scripts 500 --mcqs 100 --modules 50 --out bench.json
+
+The JSON report has per-stage p50/p95 and is stable enough to diff across
+commits. Every ``gen_wrappers`` run also counts the documentation pages
+MkDocs would build. The run fails unless that count is every Markdown file
+on disk plus every planned wrapper, so pages the generator creates but
+never hands to MkDocs can't pass unnoticed.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import runpy
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from mkdocs.config import load_config
+from mkdocs.structure.files import get_files
+from mkdocs_gen_files.editor import FilesEditor
+
+from agents_demo.bench.stats import summarize
+from agents_demo.docgen import (
+    FileIndex,
+    ModuleIndex,
+    build_disk_wrappers,
+    build_ref_stubs,
+    plan_virtual_wrappers,
+)
+from agents_demo.docgen.paths import REPO_ROOT
+
+REPORT_VERSION = 3
+GEN_WRAPPERS_SCRIPT = REPO_ROOT / "scripts" / "gen_practice_wrappers.py"
+
+MKDOCS_CONFIG = """site_name: docs-bench
+docs_dir: docs
+markdown_extensions:
+  - pymdownx.snippets:
+      base_path:
+        - docs
+        - docs/OpAgentsOlympus
+        - docs/OpAgentsOlympus/practice
+"""
+SYNTH_PACKAGE = "synthpkg"
+
+PRACTICE_SCRIPT = '''"""Synthetic practice example #{i}."""
+import asyncio
+
+from agents import Agent, Runner, function_tool
+from config import config
+
+
+@function_tool
+def tool_{i}(value: int) -> str:
+    """Return a greeting for ``value``."""
+    return f"Hello {{value}}"
+
+
+agent = Agent(
+    name="agent_{i}",
+    instructions="You are a helpful assistant. Use tool_{i} when asked.",
+    tools=[tool_{i}],
+)
+
+
+async def main():
+    result = await Runner.run(agent, "Say hello to {i}", run_config=config)
+    print(result.final_output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
+'''
+
+MODULE_SOURCE = '''"""Synthetic module {k}."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Record{k}:
+    """A record.
+
+    Attributes:
+        name: Record name.
+        value: Record value.
+    """
+
+    name: str
+    value: int = 0
+
+    def bump(self, by: int = 1) -> int:
+        """Increase ``value``.
+
+        Args:
+            by: Amount to add.
+
+        Returns:
+            The new value.
+        """
+        self.value += by
+        return self.value
+
+
+def load_{k}(names: list[str]) -> list[Record{k}]:
+    """Build records from names.
+
+    Args:
+        names: Record names.
+
+    Returns:
+        One record per name.
+    """
+    return [Record{k}(name) for name in names]
+
+
+def _private_{k}() -> None:
+    pass
+'''
+
+PRIVATE_MODULE_SOURCE = '''"""Synthetic module {k} with nothing public."""
+_CACHE: dict[str, int] = {{}}
+
+
+def _helper_{k}() -> None:
+    pass
+'''
+
+
+def build_tree(root: Path, scripts: int, mcqs: int, modules: int) -> None:
+    """Write the synthetic repository under ``root``."""
+    practice = root / "docs" / "OpAgentsOlympus" / "practice"
+    mcq_src = practice / "mcqs-src"
+    package = root / "src" / SYNTH_PACKAGE
+    for directory in (mcq_src, package, root / "docs" / "PyDeepOlympus"):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    for i in range(scripts):
+        (practice / f"example_{i:04d}.py").write_text(PRACTICE_SCRIPT.format(i=i), encoding="utf-8")
+        if i % 10 == 0:
+            # Hand-written wrappers beside some scripts, like the real tree
+            (practice / f"example_{i:04d}.md").write_text(f"# Example {i}\n", encoding="utf-8")
+    for n in range(1, mcqs + 1):
+        (mcq_src / f"#{n}. question_{n}.py").write_text(PRACTICE_SCRIPT.format(i=n), encoding="utf-8")
+    (mcq_src / "README.md").write_text("# MCQs\n\nSynthetic MCQ sources.\n", encoding="utf-8")
+    (root / "docs" / "index.md").write_text("# Synthetic docs\n", encoding="utf-8")
+    (root / "mkdocs.yml").write_text(MKDOCS_CONFIG, encoding="utf-8")
+
+    (package / "__init__.py").write_text('"""Synthetic package."""\n', encoding="utf-8")
+    for k in range(modules):
+        # Every fifth module documents nothing, so the stub generator has something to skip
+        source = PRIVATE_MODULE_SOURCE if k % 5 == 4 else MODULE_SOURCE
+        (package / f"module_{k:03d}.py").write_text(source.format(k=k), encoding="utf-8")
+
+
+def expected_pages(root: Path) -> int:
+    """Markdown files on disk plus every wrapper (and MCQ index) the generator plans."""
+    docs_root = root / "docs"
+    index = FileIndex(root)
+    specs = list(plan_virtual_wrappers(index, docs_root, log=lambda _: None))
+    on_disk = len(index.files(docs_root, ".md", recursive=True))
+    return on_disk + len(specs) + any(spec.mcq for spec in specs)
+
+
+def run_gen_wrappers(root: Path, expected: int) -> int:
+    """Run ``gen_practice_wrappers.py`` like the gen-files plugin; return the pages MkDocs gets.
+
+    Raises ``RuntimeError`` when the script fails or loses pages.
+    """
+    config = load_config(str(root / "mkdocs.yml"))
+    out = io.StringIO()
+    with tempfile.TemporaryDirectory(prefix="gen-files-") as tmp:
+        with FilesEditor(get_files(config), config, tmp) as editor, contextlib.redirect_stdout(out):
+            runpy.run_path(str(GEN_WRAPPERS_SCRIPT))
+        pages = len(editor.files.documentation_pages())
+    if "[gen-files] ERROR" in out.getvalue():
+        raise RuntimeError(out.getvalue())
+    if pages != expected:
+        raise RuntimeError(f"gen_practice_wrappers.py handed MkDocs {pages} pages, expected {expected}")
+    return pages
+
+
+def run_module_index(root: Path, cache_path: Path) -> int:
+    """Look up every module under ``src/`` through a freshly loaded :class:`ModuleIndex`."""
+    index = FileIndex(root)
+    modules = ModuleIndex.load(index, cache_path)
+    public = sum(modules.has_public_members(py) for py in index.files(root / "src", ".py", recursive=True))
+    modules.save()
+    return public
+
+
+def time_stage(
+    repeat: int,
+    run: Callable[[], object],
+    setup: Callable[[], object] | None = None,
+) -> list[float]:
+    """Wall time of ``run`` over ``repeat`` runs; ``setup`` runs untimed before each."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmark(root: Path, scripts: int, mcqs: int, modules: int, repeat: int, jobs: int) -> dict:
+    build_tree(root, scripts, mcqs, modules)
+    practice = root / "docs" / "OpAgentsOlympus" / "practice"
+    cache_dir = root / ".cache" / "gen-files"
+    ref_root = root / "docs" / "PyDeepOlympus"
+    stages: dict[str, list[float] | None] = {}
+
+    stages["index_walk"] = time_stage(repeat, lambda: FileIndex(root).stats)
+
+    pages = expected_pages(root)
+    stages["gen_wrappers_cold"] = time_stage(
+        repeat, lambda: run_gen_wrappers(root, pages), setup=lambda: shutil.rmtree(cache_dir, ignore_errors=True),
+    )
+    run_gen_wrappers(root, pages)
+    stages["gen_wrappers_warm"] = time_stage(repeat, lambda: run_gen_wrappers(root, pages))
+
+    touched = practice / "example_0001.py"
+
+    def touch() -> None:
+        touched.write_text(touched.read_text(encoding="utf-8") + "# edited\n", encoding="utf-8")
+
+    stages["gen_wrappers_touch"] = time_stage(repeat, lambda: run_gen_wrappers(root, pages), setup=touch)
+
+    def clear_disk_wrappers() -> None:
+        for md in practice.glob("example_*.md"):
+            if md.stem.endswith("0"):  # keep the hand-written ones
+                continue
+            md.unlink()
+
+    stages["disk_wrappers"] = time_stage(
+        repeat,
+        lambda: build_disk_wrappers(FileIndex(root), jobs, practice),
+        setup=clear_disk_wrappers,
+    )
+    clear_disk_wrappers()
+
+    modindex_cache = root / ".cache" / "docgen" / "modules.json"
+    stages["module_index_cold"] = time_stage(
+        repeat, lambda: run_module_index(root, modindex_cache), setup=lambda: modindex_cache.unlink(missing_ok=True),
+    )
+    stages["module_index_warm"] = time_stage(repeat, lambda: run_module_index(root, modindex_cache))
+
+    def ref_stubs() -> None:
+        index = FileIndex(root)
+        modules = ModuleIndex.load(index, modindex_cache)
+        build_ref_stubs(index, log=lambda _: None, src_root=root / "src", docs_root=ref_root, modules=modules)
+        modules.save()
+
+    stages["ref_stubs"] = time_stage(
+        repeat, ref_stubs, setup=lambda: shutil.rmtree(ref_root / SYNTH_PACKAGE, ignore_errors=True),
+    )
+
+    try:
+        import griffe
+    except ImportError:
+        stages["mkdocstrings_load"] = None
+    else:
+        stages["mkdocstrings_load"] = time_stage(
+            repeat, lambda: griffe.load(SYNTH_PACKAGE, search_paths=[str(root / "src")], resolve_aliases=True),
+        )
+
+    return {
+        "version": REPORT_VERSION,
+        "params": {"scripts": scripts, "mcqs": mcqs, "modules": modules, "repeat": repeat, "jobs": jobs},
+        "pages": pages,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "commit": git_commit(),
+        },
+        "stages": {
+            name: summarize(samples) if samples is not None else {"skipped": "griffe is not installed"}
+            for name, samples in stages.items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.bench.docs", description=__doc__.splitlines()[0])
+    parser.add_argument("--scripts", type=int, default=500, help="practice scripts (N)")
+    parser.add_argument("--mcqs", type=int, default=100, help="MCQ sources named '#NN. ...' (M)")
+    parser.add_argument("--modules", type=int, default=50, help="modules under src/ (K)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes for disk_wrappers")
+    parser.add_argument("--root", type=Path, help="build the tree here instead of a temp dir (kept afterwards)")
+    parser.add_argument("--out", type=Path, help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.root is not None:
+        args.root.mkdir(parents=True, exist_ok=True)
+        report = run_benchmark(args.root, args.scripts, args.mcqs, args.modules, args.repeat, args.jobs)
+    else:
+        with tempfile.TemporaryDirectory(prefix="docs-bench-") as tmp:
+            report = run_benchmark(Path(tmp), args.scripts, args.mcqs, args.modules, args.repeat, args.jobs)
+
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.out is None:
+        sys.stdout.write(text)
+    else:
+        args.out.write_text(text, encoding="utf-8")
+        print(f"Wrote {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Run and time the practice scripts offline against the fake model server.
+
+Starts :class:`~agents_demo.fake_model.FakeModelServer` on a free port and
+runs every practice script in a subprocess with ``AGENTS_FAKE_MODEL_URL``
+pointing at it. The config modules and :func:`agents_demo.clients.get_client`
+honor that variable, so every script that gets its client from them talks to
+the fake server. The API key variables of :data:`~agents_demo.providers.BACKENDS`
+get a placeholder when unset, so key checks pass. Scripts that build their
+own client, or wait for keyboard input, fail fast (stdin is closed) and are
+reported as such.
+
+Usage::
+
+    python -m agents_demo.bench.practice --latency-ms 20 --tokens-per-sec 200 --out practice.json
+    python -m agents_demo.bench.practice stream_text.py parallel_tool_call.py --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from agents_demo.bench.stats import summarize
+from agents_demo.docgen.paths import PRACTICE_DIR
+from agents_demo.fake_model import FakeModelServer, ScriptedModel
+from agents_demo.providers import BACKENDS, FAKE_MODEL_ENV
+
+REPORT_VERSION = 2
+
+
+def run_script(path: Path, env: dict[str, str], timeout: float) -> tuple[str, float, str]:
+    """(status, seconds, stderr tail) of one run."""
+    start = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, path.name], cwd=path.parent, env=env,
+            stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return "timeout", time.perf_counter() - start, ""
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        return "failed", elapsed, "\n".join(proc.stderr.strip().splitlines()[-3:])
+    return "ok", elapsed, ""
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.bench.practice", description=__doc__.splitlines()[0])
+    parser.add_argument("scripts", nargs="*", help="script names in the practice folder (default: all of them)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per script")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake server time to first byte")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="fake server token pacing")
+    parser.add_argument("--script", type=Path, help="scripted turns for the fake server (JSON)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a run is killed")
+    parser.add_argument("--out", type=Path, help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    scripts = [PRACTICE_DIR / name for name in args.scripts] if args.scripts else sorted(PRACTICE_DIR.glob("*.py"))
+    model = ScriptedModel.from_file(args.script) if args.script else ScriptedModel()
+    server = FakeModelServer(model, port=0, latency=args.latency_ms / 1000, tokens_per_sec=args.tokens_per_sec)
+
+    results: dict[str, dict] = {}
+    with server:
+        # The fake server ignores keys; placeholders only satisfy the scripts' checks
+        keys = {b.key_env: "fake" for b in BACKENDS.values() if b.key_env}
+        env = {
+            **keys,
+            **os.environ,
+            FAKE_MODEL_ENV: server.base_url,
+            # No OpenAI key offline: don't try to export traces
+            "OPENAI_AGENTS_DISABLE_TRACING": "1",
+            "PYTHONUNBUFFERED": "1",
+        }
+        for path in scripts:
+            samples, status, error = [], "ok", ""
+            for _ in range(args.repeat):
+                status, elapsed, error = run_script(path, env, args.timeout)
+                samples.append(elapsed)
+                if status != "ok":
+                    break
+            result = {"status": status, **summarize(samples)}
+            if error:
+                result["error"] = error
+            results[path.name] = result
+            print(f"{status:>7}  {result['p50_ms']:9.1f} ms  {path.name}", file=sys.stderr)
+
+    report = {
+        "version": REPORT_VERSION,
+        "params": {
+            "repeat": args.repeat,
+            "latency_ms": args.latency_ms,
+            "tokens_per_sec": args.tokens_per_sec,
+            "script": str(args.script) if args.script else None,
+        },
+        "server": {"completions": server.requests, "streamed": server.streamed},
+        "summary": {s: sum(1 for r in results.values() if r["status"] == s) for s in ("ok", "failed", "timeout")},
+        "scripts": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.out is None:
+        sys.stdout.write(text)
+    else:
+        args.out.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""Small, dependency-free summary statistics for benchmark samples."""
+from __future__ import annotations
+
+import math
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in [0, 1])."""
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples_s: list[float]) -> dict[str, float | int]:
+    """p50/p95/min/max/mean in milliseconds for samples given in seconds."""
+    ms = [s * 1000 for s in samples_s]
+    return {
+        "runs": len(ms),
+        "p50_ms": round(percentile(ms, 0.50), 3),
+        "p95_ms": round(percentile(ms, 0.95), 3),
+        "min_ms": round(min(ms), 3),
+        "max_ms": round(max(ms), 3),
+        "mean_ms": round(sum(ms) / len(ms), 3),
+    }
@@ -0,0 +1,251 @@
+"""Load test for the subscription assistant (``practice/subscription_management_application.py``).
+
+Runs :class:`SubscriptionAssistantApp` in-process behind the concurrent
+``AssistantServer`` (``practice/subscription_server.py``). Its model is a
+:class:`~agents_demo.fake_model.FakeModelServer` that calls the tool
+matching each question. ``--users`` synthetic users then send plan, usage,
+upgrade and feature questions at ``--rps`` requests per second (open loop:
+arrivals don't wait for replies) for ``--duration`` seconds.
+
+Databases (``--db``):
+
+============================  =================================================
+``fake`` (default)            in-process ``FakePool`` (``DATABASE_URL=fake://``),
+                              ``--db-latency-ms`` per query
+``mock``                      no pool: the in-memory demo source (``InMemorySource``)
+``postgresql://...``          a real database; ``--users`` rows are seeded
+============================  =================================================
+
+The report has throughput, p50/p95/p99 turn latency, rejected and failed
+turns (replies reporting an authentication or agent error count as failed), database statements per turn (conversation history included), pool
+wait times, snapshot cache hits and model calls per turn.
+
+Usage::
+
+    python -m agents_demo.bench.subscription --users 200 --rps 50 --duration 20 --model-latency-ms 80
+    python -m agents_demo.bench.subscription --db postgresql://localhost/subscription_app --out load.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from agents_demo.bench.stats import percentile, summarize
+from agents_demo.docgen.paths import PRACTICE_DIR
+from agents_demo.fake_model import FakeModelServer, Reply, ScriptedModel
+from agents_demo.providers import FAKE_MODEL_ENV
+
+REPORT_VERSION = 3
+
+# Question kind -> (question, tool the fake model calls for it)
+QUERIES = {
+    "plan": ("What plan am I on?", "show_user_plan"),
+    "usage": ("How much of my usage quota is left?", "check_usage_limits"),
+    "upgrade": ("Should I upgrade my plan?", "upgrade_plan_info"),
+    "features": ("Which features do I get?", "get_plan_features"),
+}
+
+SEED_SQL = """
+    INSERT INTO user_subscriptions (user_id, plan_type)
+    SELECT g::text, (ARRAY['Basic', 'Pro', 'Enterprise'])[g % 3 + 1] FROM generate_series(1, $1) g
+    ON CONFLICT (user_id) DO NOTHING;
+"""
+SEED_USAGE_SQL = """
+    INSERT INTO user_usage (user_id, current_usage, monthly_limit)
+    SELECT g::text, 0, 50000 FROM generate_series(1, $1) g
+    ON CONFLICT (user_id) DO NOTHING;
+"""
+
+
+class ToolRouterModel(ScriptedModel):
+    """Calls the tool of the question's kind (see :data:`QUERIES`), then answers with its result."""
+
+    def reply(self, body: dict[str, Any]) -> Reply:
+        messages = body.get("messages", [])
+        last = messages[-1] if messages else {}
+        if last.get("role") != "tool":
+            question = last.get("content")
+            for text, tool in QUERIES.values():
+                if question == text:
+                    return Reply(tool_calls=[(tool, "{}")])
+        return super().reply(body)
+
+
+async def run_load(server: Any, args: argparse.Namespace, kinds: list[str]) -> dict[str, Any]:
+    """Fire ``rps`` turns per second for ``duration`` seconds; collect per-turn outcomes.
+
+    A turn whose reply is the app's authentication or agent failure message
+    counts as failed: ``run_conversation`` reports those instead of raising.
+    """
+    from subscription_management_application import AGENT_FAILED_REPLY, AUTH_FAILED_REPLY
+    from subscription_server import ServerBusy
+
+    latencies: list[float] = []
+    outcomes = {"ok": 0, "busy": 0, "failed": 0}
+
+    async def one(uid: str, kind: str) -> None:
+        start = time.perf_counter()
+        try:
+            reply = await server.turn(uid, QUERIES[kind][0])
+        except ServerBusy:
+            outcomes["busy"] += 1
+            return
+        except Exception:
+            outcomes["failed"] += 1
+            return
+        if reply == AUTH_FAILED_REPLY or str(reply).startswith(AGENT_FAILED_REPLY):
+            outcomes["failed"] += 1
+            return
+        latencies.append(time.perf_counter() - start)
+        outcomes["ok"] += 1
+
+    total = int(args.rps * args.duration)
+    interval = 1 / args.rps
+    tasks = []
+    start = time.perf_counter()
+    for i in range(total):
+        # Open loop: the i-th arrival is due at start + i * interval whatever the replies do
+        delay = start + i * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        uid = str(i % args.users + 1)
+        tasks.append(asyncio.ensure_future(one(uid, kinds[i % len(kinds)])))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    result: dict[str, Any] = {
+        "requests": total,
+        **outcomes,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(outcomes["ok"] / elapsed, 3),
+    }
+    if latencies:
+        result["latency"] = {**summarize(latencies), "p99_ms": round(percentile(latencies, 0.99) * 1000, 3)}
+    return result
+
+
+async def run(args: argparse.Namespace, model_server: FakeModelServer) -> dict[str, Any]:
+    sys.path.insert(0, str(PRACTICE_DIR))
+    import subscription_management_application as subscription_app
+    from subscription_server import AssistantServer
+    from subscription_sources import InMemorySource
+    from subscription_statements import registry
+
+    if args.db == "fake":
+        os.environ["DATABASE_URL"] = f"fake://?latency_ms={args.db_latency_ms}&users={args.users}"
+    elif args.db != "mock":
+        os.environ["DATABASE_URL"] = args.db
+
+    app = subscription_app.SubscriptionAssistantApp()
+    server = AssistantServer(app, max_runs=args.max_runs, max_user_queue=args.max_user_queue)
+    if args.db == "mock":
+        app.source = InMemorySource.demo(args.users)
+    else:
+        await app.setup_database()
+        if app.db_pool is None:
+            raise SystemExit(f"could not connect to {args.db}")
+        if args.db != "fake":
+            async with app.db_pool.acquire() as conn:
+                await conn.execute(SEED_SQL, args.users)
+                await conn.execute(SEED_USAGE_SQL, args.users)
+
+    kinds = args.queries or list(QUERIES)
+    try:
+        if args.warmup:
+            await run_load(server, argparse.Namespace(**{**vars(args), "duration": args.warmup}), kinds)
+        registry.reset()
+        completions_before = model_server.requests
+        cache = app.snapshot_cache
+        cache_before = (cache.hits, cache.misses)
+        load = await run_load(server, args, kinds)
+    finally:
+        db_stats = registry.stats()
+        await server.close()
+
+    turns = max(load["ok"], 1)
+    statements = sum(s["count"] for s in db_stats["statements"].values())
+    return {
+        "load": load,
+        "model_calls_per_turn": round((model_server.requests - completions_before) / turns, 3),
+        "db": {
+            "statements_per_turn": round(statements / turns, 3),
+            "statements": db_stats["statements"],
+            "pool": db_stats["pool"],
+        },
+        "snapshot_cache": {"hits": cache.hits - cache_before[0], "misses": cache.misses - cache_before[1]},
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.bench.subscription", description=__doc__.splitlines()[0])
+    parser.add_argument("--db", default="fake", help="fake, mock or a postgresql:// URL")
+    parser.add_argument("--users", type=int, default=100, help="synthetic users (user ids 1..N)")
+    parser.add_argument("--rps", type=float, default=20.0, help="target turns per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--warmup", type=float, default=0.0, help="seconds of unreported load first")
+    parser.add_argument("--queries", nargs="*", choices=list(QUERIES), help="question kinds to cycle through")
+    parser.add_argument("--max-runs", type=int, help="server concurrency (default: $SERVER_MAX_RUNS or 32)")
+    parser.add_argument("--max-user-queue", type=int, help="queued turns per user (default: $SERVER_MAX_USER_QUEUE or 4)")
+    parser.add_argument("--db-latency-ms", type=float, default=1.0, help="fake database round-trip")
+    parser.add_argument("--model-latency-ms", type=float, default=50.0, help="fake model time to first byte")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="fake model token pacing")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own output")
+    parser.add_argument("--out", type=Path, help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    model_server = FakeModelServer(
+        ToolRouterModel(), port=0, latency=args.model_latency_ms / 1000, tokens_per_sec=args.tokens_per_sec
+    )
+    os.environ.setdefault("OPENAI_AGENTS_DISABLE_TRACING", "1")
+    with model_server:
+        os.environ[FAKE_MODEL_ENV] = model_server.base_url
+        # The app prints per turn; keep that out of the report unless asked for
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with quiet:
+            results = asyncio.run(run(args, model_server))
+
+    load = results["load"]
+    latency = load.get("latency", {})
+    print(
+        f"{load['ok']}/{load['requests']} turns ok ({load['busy']} busy, {load['failed']} failed), "
+        f"{load['throughput_rps']} turns/s, p50 {latency.get('p50_ms', 'n/a')} ms, p99 {latency.get('p99_ms', 'n/a')} ms, "
+        f"{results['db']['statements_per_turn']} statements/turn",
+        file=sys.stderr,
+    )
+    report = {
+        "version": REPORT_VERSION,
+        "params": {
+            "db": "postgresql" if args.db.startswith("postgres") else args.db,
+            "users": args.users,
+            "rps": args.rps,
+            "duration": args.duration,
+            "queries": args.queries or list(QUERIES),
+            "max_runs": args.max_runs,
+            "max_user_queue": args.max_user_queue,
+            "db_latency_ms": args.db_latency_ms,
+            "model_latency_ms": args.model_latency_ms,
+            "tokens_per_sec": args.tokens_per_sec,
+        },
+        **results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.out is None:
+        sys.stdout.write(text)
+    else:
+        args.out.write_text(text, encoding="utf-8")
+    # No model call means no turn reached the agent: the figures above measure failures
+    if not load["ok"] or not results["model_calls_per_turn"]:
+        print("error: no turn completed a model call; the numbers are not a load test", file=sys.stderr)
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
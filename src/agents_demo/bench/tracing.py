@@ -0,0 +1,188 @@
+"""Micro-benchmark of per-span work in the console trace exporter.
+
+Builds ``--spans`` synthetic ``span.export()`` dicts shaped like a real
+agent run: agent and function spans, and generation spans carrying
+``--messages`` input messages of ``--content-chars`` characters. It then
+times each stage over all of them:
+
+=====================  =====================================================
+``legacy``             what ``_export_span`` did before ``tracing_records``:
+                       ``fromisoformat`` twice per duration, and ``str()`` on
+                       whole payloads before truncating them
+``records``            ``SpanRecord.from_export`` (timestamps parsed once)
+                       plus lazy ``truncate`` of the same fields
+``render``             ``ComprehensiveRichConsoleSpanExporter._render_span``
+                       into an in-memory console (skipped when rich or the
+                       SDK is not installed)
+=====================  =====================================================
+
+Usage::
+
+    python -m agents_demo.bench.tracing --spans 10000 --repeat 5 --out tracing.json
+
+The JSON report has per-stage p50/p95 and spans per second (at p50).
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from agents_demo.bench.stats import summarize
+from agents_demo.docgen.paths import PRACTICE_DIR
+
+REPORT_VERSION = 1
+
+
+def synthetic_spans(count: int, messages: int, content_chars: int) -> list[dict[str, Any]]:
+    """``count`` exported spans: every third one a generation with long input messages."""
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    content = "x" * content_chars
+    spans = []
+    for i in range(count):
+        begin = start + timedelta(milliseconds=i)
+        kind = ("generation", "function", "agent")[i % 3]
+        if kind == "generation":
+            data = {
+                "type": "generation",
+                "model": "gpt-4o-mini",
+                "input": [{"role": "user", "content": content} for _ in range(messages)],
+                "output": [{"role": "assistant", "content": content, "tool_calls": None}],
+                "model_config": {"temperature": 0.2},
+                "usage": {"input_tokens": 1200, "output_tokens": 80},
+            }
+        elif kind == "function":
+            data = {"type": "function", "name": "show_user_plan", "input": "{}", "output": {"rows": [content] * 4}}
+        else:
+            data = {"type": "agent", "name": "Assistant", "tools": ["show_user_plan"], "handoffs": [], "output_type": "str"}
+        spans.append({
+            "object": "trace.span",
+            "id": f"span_{i}",
+            "trace_id": f"trace_{i // 20}",
+            "parent_id": None if kind == "agent" else f"span_{i - i % 3 + 2}",
+            "started_at": begin.isoformat(),
+            "ended_at": (begin + timedelta(microseconds=1500)).isoformat(),
+            "span_data": data,
+            "error": None,
+        })
+    return spans
+
+
+def legacy_prepare(span: dict[str, Any]) -> None:
+    """The per-span parsing and formatting the exporter used to do."""
+    started_at, ended_at = span.get("started_at"), span.get("ended_at")
+    if started_at and ended_at:
+        try:
+            start_time = datetime.fromisoformat(started_at.replace("Z", "+00:00"))
+            end_time = datetime.fromisoformat(ended_at.replace("Z", "+00:00"))
+            (end_time - start_time).total_seconds()
+        except ValueError:
+            pass
+    data = span["span_data"]
+    for msg in data.get("input", ()) if data["type"] == "generation" else ():
+        content = msg.get("content", "")
+        if len(content) > 100:
+            content = content[:100] + "..."
+    for msg in data.get("output", ()) if data["type"] == "generation" else ():
+        for key, value in msg.items():
+            if key == "content" and len(str(value)) > 100:
+                value = str(value)[:100] + "..."
+    if data["type"] == "function":
+        for value in (data["input"], data["output"]):
+            text = str(value)
+            if len(text) > 200:
+                text = text[:200] + "..."
+
+
+def records_prepare(span: dict[str, Any]) -> None:
+    from tracing_records import SpanRecord, truncate
+
+    record = SpanRecord.from_export(span)
+    record.duration_ns
+    data = record.data
+    if record.span_type == "generation":
+        for msg in data.get("input", ()):
+            truncate(msg.get("content", ""), 100)
+        for msg in data.get("output", ()):
+            truncate(msg.get("content"), 100)
+    elif record.span_type == "function":
+        truncate(data["input"], 200)
+        truncate(data["output"], 200)
+
+
+def console_renderer() -> Callable[[dict[str, Any]], None] | None:
+    """The rich exporter's span renderer writing to memory; None without rich or the SDK."""
+    # Don't start the renderer thread on import
+    os.environ.setdefault("TRACE_CONSOLE_SYNC", "1")
+    try:
+        from rich.console import Console
+        from tracing_in_console import ComprehensiveRichConsoleSpanExporter
+    except ImportError:
+        return None
+    exporter = ComprehensiveRichConsoleSpanExporter()
+    exporter.console = Console(file=io.StringIO(), width=120)
+    return exporter._render_span
+
+
+def time_stage(repeat: int, spans: list[dict[str, Any]], prepare: Callable[[dict[str, Any]], None]) -> list[float]:
+    """Wall time of ``prepare`` over all ``spans``, ``repeat`` times."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for span in spans:
+            prepare(span)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_benchmark(count: int, messages: int, content_chars: int, repeat: int) -> dict[str, Any]:
+    sys.path.insert(0, str(PRACTICE_DIR))
+    spans = synthetic_spans(count, messages, content_chars)
+    stages: dict[str, Callable[[dict[str, Any]], None] | None] = {
+        "legacy": legacy_prepare,
+        "records": records_prepare,
+        "render": console_renderer(),
+    }
+    results: dict[str, Any] = {}
+    for name, prepare in stages.items():
+        if prepare is None:
+            results[name] = None
+            continue
+        summary = summarize(time_stage(repeat, spans, prepare))
+        summary["spans_per_sec"] = round(count / (summary["p50_ms"] / 1000)) if summary["p50_ms"] else None
+        results[name] = summary
+    return {
+        "version": REPORT_VERSION,
+        "params": {"spans": count, "messages": messages, "content_chars": content_chars, "repeat": repeat},
+        "stages": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.bench.tracing", description=__doc__.splitlines()[0])
+    parser.add_argument("--spans", type=int, default=10_000, help="synthetic spans")
+    parser.add_argument("--messages", type=int, default=20, help="input messages per generation span")
+    parser.add_argument("--content-chars", type=int, default=20_000, help="characters per message")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage")
+    parser.add_argument("--out", type=Path, help="write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.spans, args.messages, args.content_chars, args.repeat)
+    for name, stage in report["stages"].items():
+        rate = f"{stage['spans_per_sec']} spans/s (p50 {stage['p50_ms']} ms)" if stage else "skipped"
+        print(f"{name:<8} {rate}", file=sys.stderr)
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.out is None:
+        sys.stdout.write(text)
+    else:
+        args.out.write_text(text, encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
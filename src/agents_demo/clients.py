@@ -0,0 +1,205 @@
+"""Process-wide, pooled ``AsyncOpenAI`` clients.
+
+Every config module and most practice scripts used to build their own
+``AsyncOpenAI`` at import time, and each instance owns an httpx connection
+pool. Run many of them in one worker and you get one TLS connection set per
+module. :func:`get_client` hands out a single client per
+``(base_url, api_key)``, so agents talking to the same provider share their
+connections.
+
+Pool behaviour comes from :class:`PoolSettings`, which reads these
+environment variables:
+
+=================================  =======  ==========================================
+``OPENAI_POOL_MAX_CONNECTIONS``    100      total connections per client
+``OPENAI_POOL_MAX_KEEPALIVE``      20       idle connections kept open
+``OPENAI_POOL_KEEPALIVE_EXPIRY``   30       seconds an idle connection is kept
+``OPENAI_POOL_HTTP2``              1        negotiate HTTP/2 (needs the ``h2`` package)
+``OPENAI_POOL_TIMEOUT``            600      request timeout in seconds
+=================================  =======  ==========================================
+
+HTTP/2 is turned off quietly when ``h2`` is not installed. :func:`pool_stats`
+reports request counters and the live connection pool of every client.
+
+With ``AGENTS_FAKE_MODEL_URL`` set, :func:`get_client` returns the client of
+that URL whatever provider was asked for. Every script built on it then talks
+to :mod:`agents_demo.fake_model` instead of a live provider.
+
+``openai`` is imported on first use, so importing this module is free.
+Limits and timeouts are built from openai's own types (``openai.Timeout``,
+``type(openai.DEFAULT_CONNECTION_LIMITS)``): its ``DefaultAsyncHttpxClient``
+may sit on a different httpx distribution than the ``httpx`` installed next
+to it, and the two don't mix.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI
+
+# Redirects every client to a local fake model server (offline runs and benchmarks)
+FAKE_MODEL_ENV = "AGENTS_FAKE_MODEL_URL"
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name, "")
+    return int(value) if value.strip() else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name, "")
+    return float(value) if value.strip() else default
+
+
+def _h2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """httpx connection-pool settings shared by every registry client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    timeout: float = 600.0
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            max_connections=_env_int("OPENAI_POOL_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=_env_int("OPENAI_POOL_MAX_KEEPALIVE", cls.max_keepalive_connections),
+            keepalive_expiry=_env_float("OPENAI_POOL_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            http2=os.environ.get("OPENAI_POOL_HTTP2", "1") not in ("0", "false", "no"),
+            timeout=_env_float("OPENAI_POOL_TIMEOUT", cls.timeout),
+        )
+
+
+@dataclass
+class _Entry:
+    client: "AsyncOpenAI"
+    http_client: "httpx.AsyncClient"
+    http2: bool
+    requests: int = 0
+    in_flight: int = 0
+    status: dict[int, int] = field(default_factory=dict)
+
+
+class ClientRegistry:
+    """One ``AsyncOpenAI`` per ``(base_url, api_key)``, created on first request.
+
+    Args:
+        settings: Pool settings; read from the environment when omitted.
+    """
+
+    def __init__(self, settings: PoolSettings | None = None) -> None:
+        self.settings = settings or PoolSettings.from_env()
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str | None = None, api_key: str | None = None, **client_kwargs: Any) -> "AsyncOpenAI":
+        """Shared client for ``base_url``/``api_key`` (OpenAI defaults when omitted).
+
+        ``client_kwargs`` are passed to ``AsyncOpenAI`` the first time the key is
+        seen and ignored afterwards.
+        """
+        key = ((base_url or "").rstrip("/"), api_key or "")
+        entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    entry = self._entries[key] = self._create(base_url, api_key, client_kwargs)
+        return entry.client
+
+    def _create(self, base_url: str | None, api_key: str | None, client_kwargs: dict[str, Any]) -> _Entry:
+        from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, DefaultAsyncHttpxClient, Timeout
+
+        Limits = type(DEFAULT_CONNECTION_LIMITS)
+
+        s = self.settings
+        http2 = s.http2 and _h2_available()
+        entry: _Entry
+
+        async def on_request(request: httpx.Request) -> None:
+            entry.requests += 1
+            entry.in_flight += 1
+
+        async def on_response(response: httpx.Response) -> None:
+            entry.in_flight -= 1
+            entry.status[response.status_code] = entry.status.get(response.status_code, 0) + 1
+
+        http_client = DefaultAsyncHttpxClient(
+            limits=Limits(
+                max_connections=s.max_connections,
+                max_keepalive_connections=s.max_keepalive_connections,
+                keepalive_expiry=s.keepalive_expiry,
+            ),
+            timeout=Timeout(s.timeout, connect=5.0),
+            http2=http2,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, **client_kwargs)
+        entry = _Entry(client, http_client, http2)
+        return entry
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Request counters and connection-pool state for every client."""
+        report = []
+        for (base_url, _), entry in self._entries.items():
+            pool = getattr(getattr(entry.http_client, "_transport", None), "_pool", None)
+            connections = list(getattr(pool, "connections", ()))
+            idle = sum(1 for c in connections if c.is_idle())
+            report.append({
+                "base_url": base_url or "https://api.openai.com/v1",
+                "http2": entry.http2,
+                "requests": entry.requests,
+                # Requests whose response never arrived (errors, timeouts) stay counted here
+                "in_flight": entry.in_flight,
+                "status": dict(sorted(entry.status.items())),
+                "connections": len(connections),
+                "idle_connections": idle,
+                "active_connections": len(connections) - idle,
+            })
+        return report
+
+    async def aclose(self) -> None:
+        """Close every client's connection pool and forget the clients."""
+        with self._lock:
+            entries, self._entries = list(self._entries.values()), {}
+        for entry in entries:
+            await entry.client.close()
+
+
+_registry = ClientRegistry()
+
+
+def get_client(base_url: str | None = None, api_key: str | None = None, **client_kwargs: Any) -> "AsyncOpenAI":
+    """Process-wide shared client; see :meth:`ClientRegistry.get`.
+
+    ``$AGENTS_FAKE_MODEL_URL``, when set, replaces ``base_url`` and ``api_key``.
+    """
+    fake_url = os.environ.get(FAKE_MODEL_ENV)
+    if fake_url:
+        base_url, api_key = fake_url, "fake"
+    return _registry.get(base_url, api_key, **client_kwargs)
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """Statistics of the process-wide registry; see :meth:`ClientRegistry.stats`."""
+    return _registry.stats()
+
+
+async def aclose_all() -> None:
+    """Close the process-wide clients, e.g. at the end of a worker's event loop."""
+    await _registry.aclose()
@@ -0,0 +1,40 @@
+"""Shared documentation generators.
+
+One :class:`FileIndex` walk feeds the practice wrappers (virtual and on-disk)
+and the mkdocstrings reference stubs (filtered through the AST-based
+:class:`ModuleIndex`), so running every generator in one process scans the
+tree once. Entry points live in ``scripts/`` and in
+``python -m agents_demo.docgen``.
+"""
+from __future__ import annotations
+
+from .index import FileIndex
+from .manifest import WrapperManifest, templates_fingerprint
+from .modindex import Member, ModuleIndex, parse_module
+from .refs import build_ref_stubs, plan_ref_stubs
+from .render import render_all, write_pages
+from .snippets import SnippetInliner
+from .templates import pretty_title, slugify, title_from_stem
+from .wrappers import WrapperSpec, build_disk_wrappers, load_manifest, plan_virtual_wrappers, render_mcq_index
+
+__all__ = [
+    "FileIndex",
+    "Member",
+    "ModuleIndex",
+    "SnippetInliner",
+    "WrapperManifest",
+    "WrapperSpec",
+    "build_disk_wrappers",
+    "build_ref_stubs",
+    "load_manifest",
+    "parse_module",
+    "plan_ref_stubs",
+    "plan_virtual_wrappers",
+    "pretty_title",
+    "render_all",
+    "render_mcq_index",
+    "slugify",
+    "templates_fingerprint",
+    "title_from_stem",
+    "write_pages",
+]
@@ -0,0 +1,72 @@
+"""Command line interface behind ``python -m agents_demo.docgen <command>``.
+
+Commands:
+    wrappers  Write on-disk wrappers for practice files (see build_practice_wrappers_to_disk.py).
+    refs      Create missing mkdocstrings reference stubs (see generate_ref_files.py).
+    all       Both of the above, sharing one tree walk.
+    watch     Keep wrappers and stubs current as files change (see watch.py).
+"""
+from __future__ import annotations
+
+import argparse
+
+from .index import FileIndex
+from .paths import DOCS_ROOT, PRACTICE_DIR, REPO_ROOT, SRC_ROOT
+from .refs import build_ref_stubs, discover_top_packages
+from .wrappers import build_disk_wrappers
+
+
+def run_wrappers(index: FileIndex, jobs: int) -> None:
+    if not index.exists(PRACTICE_DIR):
+        raise SystemExit(f"Practice folder not found: {PRACTICE_DIR}")
+    written = build_disk_wrappers(index, jobs)
+    for md in written:
+        print(f"Wrote {md.relative_to(DOCS_ROOT)}")
+    print(f"Done. {len(written)} wrapper(s) created.")
+
+
+def run_refs(index: FileIndex) -> None:
+    if not index.exists(SRC_ROOT):
+        raise SystemExit(f"Source path not found: {SRC_ROOT}")
+    if not discover_top_packages(index):
+        print("No top-level packages discovered under src/. Nothing to do.")
+        return
+    created = build_ref_stubs(index)
+    if created == 0:
+        print("All reference files were already present.")
+    else:
+        print(f"Done. {created} new file(s) created.")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.docgen", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("wrappers", "all"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument(
+            "--jobs", "-j", type=int, default=1,
+            help="render wrappers in N worker processes (default: 1, serial)",
+        )
+    sub.add_parser("refs")
+    watch_cmd = sub.add_parser("watch")
+    watch_cmd.add_argument(
+        "--debounce-ms", type=float, default=50,
+        help="quiet period that ends an editor write burst (default: 50)",
+    )
+    watch_cmd.add_argument("--poll", action="store_true", help="poll instead of using inotify")
+    args = parser.parse_args(argv)
+
+    if args.command == "watch":
+        from .watch import watch
+        watch(debounce=args.debounce_ms / 1000, poll=args.poll)
+        return
+
+    index = FileIndex.shared(REPO_ROOT)
+    if args.command in ("wrappers", "all"):
+        run_wrappers(index, args.jobs)
+    if args.command in ("refs", "all"):
+        run_refs(index)
+
+
+if __name__ == "__main__":
+    main()
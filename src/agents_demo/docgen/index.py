@@ -0,0 +1,150 @@
+"""A cached, single-walk index of the files the doc generators care about."""
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+
+from .templates import SKIP_DIRS
+
+# Never worth descending into: VCS data, build output, caches, virtualenvs
+PRUNE_DIRS = SKIP_DIRS | {"__pycache__", "node_modules", "site"}
+
+
+class FileIndex:
+    """Stat results for every file under ``root``, collected in one scandir walk.
+
+    The walk happens lazily on first use and is memoized; callers query the
+    index instead of globbing or calling ``exists()``/``stat()`` themselves.
+    Hidden directories (``.git``, ``.cache``, ``.venv`` ...) are pruned.
+
+    Use :meth:`shared` to reuse one index across several generators in the same
+    process, so running all of them walks the tree only once.
+    """
+
+    _shared: dict[Path, "FileIndex"] = {}
+
+    def __init__(self, root: Path) -> None:
+        self.root = root.resolve()
+        self.walks = 0
+        self._stats: dict[Path, os.stat_result] | None = None
+        self._children: dict[Path, list[Path]] = {}
+        self._subdirs: dict[Path, list[Path]] = {}
+
+    @classmethod
+    def shared(cls, root: Path, *, refresh: bool = False) -> "FileIndex":
+        """Return the process-wide index for ``root``; ``refresh`` forces a new walk."""
+        root = root.resolve()
+        index = cls._shared.get(root)
+        if index is None:
+            index = cls._shared[root] = cls(root)
+        elif refresh:
+            index.refresh()
+        return index
+
+    def refresh(self) -> None:
+        """Drop memoized results; the next query walks the tree again."""
+        self._stats = None
+        self._children.clear()
+        self._subdirs.clear()
+
+    @property
+    def stats(self) -> dict[Path, os.stat_result]:
+        if self._stats is None:
+            self._walk()
+        assert self._stats is not None
+        return self._stats
+
+    def stat(self, path: Path) -> os.stat_result | None:
+        return self.stats.get(path)
+
+    def exists(self, path: Path) -> bool:
+        """True for indexed files and directories."""
+        return path in self.stats or path in self._subdirs
+
+    def subdirs(self, directory: Path) -> list[Path]:
+        """Sorted, non-pruned directories directly inside ``directory``."""
+        self.stats  # make sure the walk happened
+        return sorted(self._subdirs.get(directory, ()))
+
+    def files(self, directory: Path, *suffixes: str, recursive: bool = False) -> list[Path]:
+        """Sorted files in ``directory`` whose name ends with one of ``suffixes``."""
+        self.stats  # make sure the walk happened
+        found: list[Path] = []
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            found.extend(p for p in self._children.get(current, ()) if not suffixes or p.name.endswith(suffixes))
+            if recursive:
+                pending.extend(self._subdirs.get(current, ()))
+        return sorted(found)
+
+    def update(self, path: Path) -> bool:
+        """Re-stat one path after a change (used by watch mode); return True if it exists.
+
+        New directories are scanned recursively; removed ones drop their subtree.
+        """
+        stats = self.stats
+        parent = path.parent
+        try:
+            st = path.stat()
+        except OSError:
+            st = None
+
+        if st is not None and stat.S_ISDIR(st.st_mode):
+            if self.is_pruned(path):
+                return False
+            if path not in self._subdirs:
+                self._subdirs.setdefault(parent, []).append(path)
+                self._scan(path, stats)
+            return True
+        if st is not None:
+            if path not in stats:
+                self._children.setdefault(parent, []).append(path)
+            stats[path] = st
+            return True
+
+        if path in stats:
+            del stats[path]
+            self._children[parent].remove(path)
+        elif path in self._subdirs:
+            self._subdirs[parent].remove(path)
+            self._forget_tree(path, stats)
+        return False
+
+    def is_pruned(self, directory: Path) -> bool:
+        return directory.name in PRUNE_DIRS or directory.name.startswith(".")
+
+    def _walk(self) -> None:
+        self.walks += 1
+        stats: dict[Path, os.stat_result] = {}
+        self._scan(self.root, stats)
+        self._stats = stats
+
+    def _scan(self, start: Path, stats: dict[Path, os.stat_result]) -> None:
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            children = self._children.setdefault(current, [])
+            subdirs = self._subdirs.setdefault(current, [])
+            try:
+                it = os.scandir(current)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    path = Path(entry.path)
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.is_pruned(path):
+                            continue
+                        subdirs.append(path)
+                        stack.append(path)
+                    elif entry.is_file():
+                        stats[path] = entry.stat()
+                        children.append(path)
+
+    def _forget_tree(self, directory: Path, stats: dict[Path, os.stat_result]) -> None:
+        for child in self._children.pop(directory, ()):
+            stats.pop(child, None)
+        for sub in self._subdirs.pop(directory, ()):
+            self._forget_tree(sub, stats)
@@ -0,0 +1,130 @@
+"""Minimal change sources for watch mode: Linux inotify (via ctypes) and polling."""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from pathlib import Path
+
+from .index import FileIndex
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT = struct.Struct("iIII")
+
+
+class InotifySource:
+    """Recursive inotify watch over a set of directories.
+
+    :meth:`read` blocks for at most ``timeout`` seconds and returns the paths
+    that changed. Directories created later are watched automatically. An
+    overflowed kernel queue is reported as the watched roots themselves, which
+    callers treat as "rescan".
+
+    Raises:
+        OSError: If inotify is unavailable (non-Linux, or the watch limit is hit).
+    """
+
+    def __init__(self, roots: list[Path], index: FileIndex) -> None:
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._index = index
+        self._dirs: dict[int, Path] = {}
+        self.roots = roots
+        for root in roots:
+            self._watch_tree(root)
+
+    def _watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+
+    def _watch_tree(self, root: Path) -> None:
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            self._watch(directory)
+            pending.extend(self._index.subdirs(directory))
+
+    def read(self, timeout: float | None) -> set[Path]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                changed.update(self.roots)
+                continue
+            directory = self._dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._dirs[wd]
+                continue
+            if not name:
+                continue
+            path = directory / os.fsdecode(name)
+            changed.add(path)
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not self._index.is_pruned(path):
+                self._index.update(path)
+                self._watch_tree(path)
+                # Files written before the new watch existed produced no events of their own
+                changed.update(self._index.files(path, recursive=True))
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingSource:
+    """Fallback change source that re-walks the roots every ``interval`` seconds."""
+
+    def __init__(self, roots: list[Path], interval: float = 0.5) -> None:
+        self.roots = roots
+        self.interval = interval
+        self._snapshot = self._take()
+
+    def _take(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for root in self.roots:
+            for path, st in FileIndex(root).stats.items():
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout: float | None) -> set[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        before, self._snapshot = self._snapshot, self._take()
+        return {p for p in before.keys() | self._snapshot.keys() if before.get(p) != self._snapshot.get(p)}
+
+    def close(self) -> None:
+        pass
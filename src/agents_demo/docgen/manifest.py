@@ -0,0 +1,157 @@
+"""Persistent manifest that makes wrapper generation incremental."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .render import file_sha256, render_all, write_pages
+from .templates import WRAPPER_TEMPLATES
+
+# Bump when the rendering logic changes in a way the templates don't capture
+MANIFEST_VERSION = 1
+
+
+def templates_fingerprint(templates: Iterable[str] = WRAPPER_TEMPLATES, extra: str = "") -> str:
+    """Hash of everything that shapes a wrapper besides its source (``extra`` for other settings)."""
+    h = hashlib.sha256(str(MANIFEST_VERSION).encode())
+    for template in templates:
+        h.update(template.encode("utf-8"))
+    h.update(extra.encode("utf-8"))
+    return h.hexdigest()
+
+
+class WrapperManifest:
+    """Persistent record of generated wrappers, keyed by source path relative to docs/.
+
+    Each entry stores ``mtime_ns``, ``size``, ``sha256`` and ``target`` (the virtual
+    `.md` path). The rendered page lives at ``pages_dir / target``. Pages queued by
+    :meth:`emit` are rendered and written by :meth:`flush`, which passes each one
+    through ``postprocess(source, content)`` when set (e.g. snippet inlining).
+    """
+
+    def __init__(self, cache_dir: Path, fingerprint: str | None = None) -> None:
+        self.path = cache_dir / "manifest.json"
+        self.pages_dir = cache_dir / "pages"
+        self.fingerprint = fingerprint or templates_fingerprint()
+        self.entries: dict[str, dict] = {}
+        self.index: dict = {}
+        self.seen: set[str] = set()
+        self.pending: list[tuple[Path, Path, str, dict[str, str]]] = []
+        self.postprocess: Callable[[Path, str], str] | None = None
+        self.reused = 0
+        self.regenerated = 0
+
+    @classmethod
+    def load(cls, cache_dir: Path, fingerprint: str | None = None) -> "WrapperManifest":
+        manifest = cls(cache_dir, fingerprint)
+        try:
+            data = json.loads(manifest.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return manifest
+        # A template change or a wiped pages dir invalidates every entry
+        if data.get("fingerprint") == manifest.fingerprint and manifest.pages_dir.is_dir():
+            manifest.entries = data.get("entries", {})
+            manifest.index = data.get("index", {})
+        return manifest
+
+    def page(self, target_rel_md: str) -> Path:
+        return self.pages_dir / target_rel_md
+
+    def emit(
+        self,
+        source: Path,
+        st: os.stat_result,
+        key: str,
+        target_rel_md: str,
+        template: str,
+        fields: dict[str, str],
+    ) -> bool:
+        """Queue a re-render of ``source``'s page unless it is current; return True if queued."""
+        self.seen.add(key)
+        entry = self.entries.get(key)
+        if entry and entry["target"] == target_rel_md:
+            if entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                self.reused += 1
+                return False
+            digest = file_sha256(source)
+            if entry["sha256"] == digest:
+                # Touched but not modified: refresh the stat fields only
+                entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+                self.reused += 1
+                return False
+        else:
+            digest = file_sha256(source)
+            if entry:
+                self._drop_page(entry["target"])
+
+        self.pending.append((self.page(target_rel_md), source, template, fields))
+        self.entries[key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha256": digest,
+            "target": target_rel_md,
+        }
+        self.regenerated += 1
+        return True
+
+    def discard(self, key: str) -> bool:
+        """Forget one source and delete its cached page; return True if it was known."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self._drop_page(entry["target"])
+        return True
+
+    def flush(self, jobs: int = 1) -> None:
+        """Render and write every queued page."""
+        if not self.pending:
+            return
+        contents = render_all([(template, fields) for _, _, template, fields in self.pending], jobs)
+        if self.postprocess is not None:
+            contents = [self.postprocess(source, c) for (_, source, _, _), c in zip(self.pending, contents)]
+        pages = [(page, content) for (page, _, _, _), content in zip(self.pending, contents)]
+        write_pages(pages, batched=jobs > 1)
+        self.pending.clear()
+
+    def emit_index(self, target_rel_md: str, entries: list[tuple[str, str]], render: Callable[[], str]) -> bool:
+        """Re-render the index page only when its (title, target) entry set changed."""
+        digest = hashlib.sha256(json.dumps(sorted(entries)).encode("utf-8")).hexdigest()
+        page = self.page(target_rel_md)
+        if self.index.get("sha256") == digest and self.index.get("target") == target_rel_md:
+            return False
+        if self.index.get("target") and self.index["target"] != target_rel_md:
+            self._drop_page(self.index["target"])
+        page.parent.mkdir(parents=True, exist_ok=True)
+        page.write_text(render(), encoding="utf-8")
+        self.index = {"sha256": digest, "target": target_rel_md}
+        return True
+
+    def prune(self, keep_index: bool) -> int:
+        """Forget entries whose source disappeared; return how many were removed."""
+        stale = [key for key in self.entries if key not in self.seen]
+        for key in stale:
+            self._drop_page(self.entries.pop(key)["target"])
+        if not keep_index:
+            self.drop_index()
+        return len(stale)
+
+    def drop_index(self) -> None:
+        if self.index:
+            self._drop_page(self.index["target"])
+            self.index = {}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"fingerprint": self.fingerprint, "entries": self.entries, "index": self.index}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _drop_page(self, target_rel_md: str) -> None:
+        try:
+            self.page(target_rel_md).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,247 @@
+"""Import-free index of the modules under src/, built from their AST.
+
+mkdocstrings renders one ``::: identifier`` block per reference stub. The
+stub generator used to emit a stub for every module file, so pages were
+built (and sources loaded) for modules that have nothing to document.
+:class:`ModuleIndex` parses each module with :mod:`ast` and never imports it.
+It records the public members in source order, with their signatures, which is
+what ``members_order: source`` renders.
+
+Parsed results are cached in ``.cache/docgen/modules.json``. The cache is
+keyed by the sha256 of the file content, so unchanged (or moved) modules are
+never re-parsed. A ``(mtime_ns, size)`` shortcut per path avoids re-hashing.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .index import FileIndex
+from .paths import MODINDEX_CACHE
+
+# Bump when the parsed representation changes
+MODINDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Member:
+    """A public module or class member, as found in the source."""
+
+    name: str
+    kind: str  # "class", "function", "attribute" or "alias" (re-exported through __all__)
+    lineno: int
+    signature: str = ""
+    docstring: bool = False
+    members: tuple["Member", ...] = field(default=())
+
+    def to_json(self) -> dict:
+        data: dict = {"name": self.name, "kind": self.kind, "lineno": self.lineno}
+        if self.signature:
+            data["signature"] = self.signature
+        if self.docstring:
+            data["docstring"] = True
+        if self.members:
+            data["members"] = [m.to_json() for m in self.members]
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Member":
+        return cls(
+            name=data["name"],
+            kind=data["kind"],
+            lineno=data["lineno"],
+            signature=data.get("signature", ""),
+            docstring=data.get("docstring", False),
+            members=tuple(cls.from_json(m) for m in data.get("members", ())),
+        )
+
+
+def _is_public(name: str) -> bool:
+    return not name.startswith("_")
+
+
+def _function_signature(node: ast.FunctionDef | ast.AsyncFunctionDef, drop_self: bool = False) -> str:
+    args = node.args
+    if drop_self and (args.posonlyargs or args.args):
+        args = ast.arguments(
+            posonlyargs=args.posonlyargs[1:],
+            args=args.args[1:] if not args.posonlyargs else args.args,
+            vararg=args.vararg,
+            kwonlyargs=args.kwonlyargs,
+            kw_defaults=args.kw_defaults,
+            kwarg=args.kwarg,
+            defaults=args.defaults,
+        )
+    prefix = "async " if isinstance(node, ast.AsyncFunctionDef) else ""
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns is not None else ""
+    return f"{prefix}({ast.unparse(args)}){returns}"
+
+
+def _assigned_names(node: ast.stmt) -> list[str]:
+    targets: list[ast.expr] = []
+    if isinstance(node, ast.Assign):
+        targets = node.targets
+    elif isinstance(node, ast.AnnAssign):
+        targets = [node.target]
+    return [t.id for t in targets if isinstance(t, ast.Name)]
+
+
+def _flatten(body: list[ast.stmt]) -> list[ast.stmt]:
+    """Top-level statements, descending into ``if``/``try`` blocks (TYPE_CHECKING, fallbacks)."""
+    flat: list[ast.stmt] = []
+    for node in body:
+        if isinstance(node, ast.If):
+            flat.extend(_flatten(node.body + node.orelse))
+        elif isinstance(node, ast.Try):
+            flat.extend(_flatten(node.body + node.orelse + node.finalbody))
+            for handler in node.handlers:
+                flat.extend(_flatten(handler.body))
+        else:
+            flat.append(node)
+    return flat
+
+
+def _members(body: list[ast.stmt], in_class: bool = False) -> list[Member]:
+    found: list[Member] = []
+    for node in _flatten(body):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            # merge_init_into_class: __init__ is documented as the class signature
+            if _is_public(node.name) or (in_class and node.name == "__init__"):
+                static = any(isinstance(d, ast.Name) and d.id == "staticmethod" for d in node.decorator_list)
+                found.append(Member(
+                    node.name, "function", node.lineno,
+                    _function_signature(node, drop_self=in_class and not static),
+                    ast.get_docstring(node) is not None,
+                ))
+        elif isinstance(node, ast.ClassDef):
+            if _is_public(node.name):
+                nested = _members(node.body, in_class=True)
+                init = next((m for m in nested if m.name == "__init__"), None)
+                signature = init.signature if init else ""
+                if not signature and node.bases:
+                    signature = f"({', '.join(ast.unparse(b) for b in node.bases)})"
+                found.append(Member(
+                    node.name, "class", node.lineno, signature,
+                    ast.get_docstring(node) is not None,
+                    tuple(m for m in nested if m.name != "__init__"),
+                ))
+        else:
+            found.extend(
+                Member(name, "attribute", node.lineno) for name in _assigned_names(node) if _is_public(name)
+            )
+    return found
+
+
+def _dunder_all(tree: ast.Module) -> list[str] | None:
+    """Literal ``__all__`` list/tuple, or None when absent or computed."""
+    for node in _flatten(tree.body):
+        if "__all__" in _assigned_names(node) and node.value is not None:
+            try:
+                value = ast.literal_eval(node.value)
+            except (ValueError, TypeError, SyntaxError):
+                return None
+            if isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value):
+                return list(value)
+    return None
+
+
+def parse_module(source: bytes) -> dict:
+    """Public API of a module's source as JSON-ready data (``{"error": ...}`` if unparsable)."""
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as exc:
+        return {"error": str(exc)}
+    members = _members(tree.body)
+    exported = _dunder_all(tree)
+    if exported is not None:
+        # __all__ decides what is public; names it re-exports from elsewhere are documented too
+        defined = {m.name for m in members}
+        members = [m for m in members if m.name in exported]
+        members.extend(Member(name, "alias", 0) for name in exported if name not in defined)
+    return {
+        "docstring": ast.get_docstring(tree) is not None,
+        "all": exported,
+        "members": [m.to_json() for m in members],
+    }
+
+
+class ModuleIndex:
+    """Cached :func:`parse_module` results for the files in a :class:`FileIndex`.
+
+    Args:
+        index: File index used for the ``(mtime_ns, size)`` shortcut.
+        cache_path: JSON cache location; parsed modules are stored by content hash.
+    """
+
+    def __init__(self, index: FileIndex, cache_path: Path = MODINDEX_CACHE) -> None:
+        self.index = index
+        self.cache_path = cache_path
+        self.parsed: dict[str, dict] = {}  # sha256 -> parse_module() result
+        self.files: dict[str, list] = {}  # path -> [mtime_ns, size, sha256]
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, index: FileIndex, cache_path: Path = MODINDEX_CACHE) -> "ModuleIndex":
+        modules = cls(index, cache_path)
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return modules
+        if data.get("version") == MODINDEX_VERSION:
+            modules.parsed = data.get("parsed", {})
+            modules.files = data.get("files", {})
+        return modules
+
+    def module(self, path: Path) -> dict | None:
+        """Parsed data for ``path``, or None if it is not in the file index."""
+        st = self.index.stat(path)
+        if st is None:
+            return None
+        key = str(path)
+        known = self.files.get(key)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size and known[2] in self.parsed:
+            digest = known[2]
+            self.hits += 1
+        else:
+            source = path.read_bytes()
+            digest = hashlib.sha256(source).hexdigest()
+            if digest in self.parsed:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.parsed[digest] = parse_module(source)
+            self.files[key] = [st.st_mtime_ns, st.st_size, digest]
+        return self.parsed[digest]
+
+    def members(self, path: Path) -> list[Member]:
+        """Public members of ``path`` in source order."""
+        data = self.module(path)
+        if not data or "error" in data:
+            return []
+        return [Member.from_json(m) for m in data["members"]]
+
+    def has_public_members(self, path: Path) -> bool:
+        """False only for modules we parsed and found nothing public in.
+
+        Unparsable files count as public so mkdocstrings gets to report the error.
+        """
+        data = self.module(path)
+        if data is None:
+            return False
+        return "error" in data or bool(data["members"])
+
+    def save(self) -> None:
+        """Write the cache, dropping files that no longer exist and content nothing refers to."""
+        files = {p: v for p, v in self.files.items() if self.index.stat(Path(p)) is not None}
+        referenced = {v[2] for v in files.values()}
+        parsed = {d: data for d, data in self.parsed.items() if d in referenced}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": MODINDEX_VERSION, "files": files, "parsed": parsed}
+        tmp = self.cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(payload, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.cache_path)
@@ -0,0 +1,16 @@
+"""Well-known locations in the repository, resolved once."""
+from __future__ import annotations
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+DOCS_ROOT = REPO_ROOT / "docs"
+AGENTS_DIR = DOCS_ROOT / "OpAgentsOlympus"
+PRACTICE_DIR = AGENTS_DIR / "practice"
+# Preferred MCQ source location and its legacy fallback (folder name with spaces)
+MCQ_SRC_DIR = PRACTICE_DIR / "mcqs-src"
+MCQ_LEGACY_DIR = PRACTICE_DIR / "100 MCQs Answer"
+SRC_ROOT = REPO_ROOT / "src"
+REF_DOCS_ROOT = DOCS_ROOT / "PyDeepOlympus"
+CACHE_DIR = REPO_ROOT / ".cache" / "gen-files"
+MODINDEX_CACHE = REPO_ROOT / ".cache" / "docgen" / "modules.json"
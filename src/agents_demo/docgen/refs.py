@@ -0,0 +1,106 @@
+"""Markdown reference stubs for mkdocstrings, one per module under src/."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+from .index import FileIndex
+from .modindex import ModuleIndex
+from .paths import REF_DOCS_ROOT, REPO_ROOT, SRC_ROOT
+from .templates import REF_STUB_TEMPLATE, pretty_title
+
+
+def discover_top_packages(index: FileIndex, src_root: Path = SRC_ROOT) -> set[str]:
+    """Return names of top-level packages under src/ (dirs with __init__.py)."""
+    return {p.name for p in index.subdirs(src_root) if index.exists(p / "__init__.py")}
+
+
+def to_identifier(py_path: Path, top_packages: set[str], src_root: Path = SRC_ROOT) -> str | None:
+    """Convert src/<pkg>/foo/bar.py -> '<pkg>.foo.bar'.
+
+    Returns None for files not under a recognized top-level package.
+    Handles __init__.py by returning the package path without the final segment.
+    """
+    try:
+        rel = py_path.relative_to(src_root)
+    except ValueError:
+        return None
+
+    parts = list(rel.parts)
+    if not parts or parts[0] not in top_packages:
+        return None
+
+    if parts[-1] == "__init__.py":
+        # Remove the file and keep the package path
+        parts = parts[:-1]
+    else:
+        parts[-1] = Path(parts[-1]).stem
+    return ".".join(parts)
+
+
+def md_target(py_path: Path, src_root: Path = SRC_ROOT, docs_root: Path = REF_DOCS_ROOT) -> Path:
+    """Return the docs/.../*.md path corresponding to py_path under src/."""
+    rel = py_path.relative_to(src_root)
+    if rel.name == "__init__.py":
+        rel = rel.with_name("index.py")  # map package __init__ to index.md
+    return (docs_root / rel).with_suffix(".md")
+
+
+def render_ref_stub(identifier: str) -> str:
+    return REF_STUB_TEMPLATE.format(title=pretty_title(identifier.split(".")[-1]), identifier=identifier)
+
+
+def plan_ref_stubs(
+    index: FileIndex,
+    src_root: Path = SRC_ROOT,
+    docs_root: Path = REF_DOCS_ROOT,
+    modules: ModuleIndex | None = None,
+) -> list[tuple[Path, str, Path]]:
+    """(source, identifier, stub path) for every public module under src/.
+
+    With a :class:`ModuleIndex`, modules without public members are skipped.
+    """
+    top_packages = discover_top_packages(index, src_root)
+    planned = []
+    for py_file in index.files(src_root, ".py", recursive=True):
+        # Skip dunder/private modules
+        if py_file.name.startswith("_"):
+            continue
+        if modules is not None and not modules.has_public_members(py_file):
+            continue
+        identifier = to_identifier(py_file, top_packages, src_root)
+        if identifier:
+            planned.append((py_file, identifier, md_target(py_file, src_root, docs_root)))
+    return planned
+
+
+def build_ref_stubs(
+    index: FileIndex,
+    log: Callable[[str], None] = print,
+    src_root: Path = SRC_ROOT,
+    docs_root: Path = REF_DOCS_ROOT,
+    modules: ModuleIndex | None = None,
+) -> int:
+    """Create missing reference stubs; existing .md files are preserved.
+
+    Modules with nothing public get no stub. The module index is loaded from
+    (and saved back to) its default cache unless one is passed in.
+    """
+    own_index = modules is None
+    if modules is None:
+        modules = ModuleIndex.load(index)
+    created = 0
+    for _, identifier, md_path in plan_ref_stubs(index, src_root, docs_root, modules):
+        if index.exists(md_path):
+            continue  # keep existing
+        md_path.parent.mkdir(parents=True, exist_ok=True)
+        md_path.write_text(render_ref_stub(identifier), encoding="utf-8")
+        created += 1
+        try:
+            rel_print = md_path.relative_to(REPO_ROOT)
+        except ValueError:
+            rel_print = md_path
+        log(f"Created {rel_print}")
+    if own_index:
+        modules.save()
+    return created
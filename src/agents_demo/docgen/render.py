@@ -0,0 +1,71 @@
+"""Template rendering and batched writes."""
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Below this many pages a pool costs more to start (and to pickle pages through)
+# than format_map takes in-process: ~113 wrappers render in well under 1 ms
+POOL_MIN_PAGES = 10_000
+
+
+def render_all(requests: list[tuple[str, dict[str, str]]], jobs: int = 1) -> list[str]:
+    """Render (template, fields) pairs, in a process pool when jobs > 1 and there are enough of them.
+
+    Fewer than :data:`POOL_MIN_PAGES` pairs are always rendered in-process.
+    The pool maps ``str.format_map``, which pickles by reference, so output is
+    byte-identical to the serial path.
+    """
+    if jobs <= 1 or len(requests) < POOL_MIN_PAGES:
+        return [template.format_map(fields) for template, fields in requests]
+    templates, fields = zip(*requests)
+    chunksize = max(1, len(requests) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(str.format_map, templates, fields, chunksize=chunksize))
+
+
+_datasync = getattr(os, "fdatasync", os.fsync)
+
+
+def fsync_dir(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_pages(pages: list[tuple[Path, str]], *, batched: bool = False) -> None:
+    """Write rendered pages; when ``batched``, make them durable.
+
+    Durability costs one data sync per page plus one fsync per touched
+    directory. Syncing only the directories would be cheaper, but after a
+    crash a page could then exist with empty or partial contents, and the
+    next run would skip it because the file exists. The per-page sync is
+    ``fdatasync`` where available, which skips flushing timestamps.
+    """
+    by_dir: dict[Path, list[tuple[Path, str]]] = {}
+    for path, content in pages:
+        by_dir.setdefault(path.parent, []).append((path, content))
+    for directory, items in by_dir.items():
+        directory.mkdir(parents=True, exist_ok=True)
+        for path, content in items:
+            if not batched:
+                path.write_text(content, encoding="utf-8")
+                continue
+            with path.open("w", encoding="utf-8") as fh:
+                fh.write(content)
+                fh.flush()
+                _datasync(fh.fileno())
+        if batched:
+            fsync_dir(directory)
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
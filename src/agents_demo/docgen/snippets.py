@@ -0,0 +1,132 @@
+"""Inline `--8<--` snippet includes into generated wrappers at generation time.
+
+Every wrapper includes its source with a pymdownx.snippets directive, and
+mkdocs.yml lists four ``base_path`` entries, so each page render probes up to
+four directories and re-reads the file. :class:`SnippetInliner` resolves the
+name once against the same base paths (using the :class:`FileIndex`, so no
+extra syscalls), caches the file content by ``(path, mtime_ns, size)`` and
+substitutes it for the directive exactly as pymdownx would.
+
+The directive is left in place (normal include at render time) when:
+
+- the name does not resolve, or resolves to a different file than the
+  wrapper's source (the manifest only tracks the source itself);
+- the content is not valid UTF-8, or contains its own ``--8<--`` markers
+  (nested includes, sections and escapes stay pymdownx's job);
+- inlining is disabled with ``GEN_FILES_INLINE_SNIPPETS=0``.
+
+The content cache lives at module level, so under ``mkdocs serve`` it
+survives from one rebuild to the next.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from .index import FileIndex
+from .paths import REPO_ROOT
+
+# Mirrors `pymdownx.snippets.base_path` in mkdocs.yml (relative to the repo root)
+DEFAULT_BASE_PATHS = (
+    "docs",
+    "docs/OpAgentsOlympus",
+    "docs/OpAgentsOlympus/practice",
+    "docs/OpAgentsOlympus/practice/100-mcqs-answer",
+)
+
+RE_DIRECTIVE = re.compile(r'^(?P<space>[ \t]*)--8<-- "(?P<name>[^"]+)"$')
+MARKER = "--8<--"
+TAB_LENGTH = 4
+
+# (path, mtime_ns, size) -> lines, or None when the file must not be inlined
+_CONTENT_CACHE: dict[tuple[Path, int, int], list[str] | None] = {}
+
+
+def inline_enabled() -> bool:
+    return os.environ.get("GEN_FILES_INLINE_SNIPPETS", "1") not in ("0", "false", "no")
+
+
+class SnippetInliner:
+    """Resolves snippet names like pymdownx.snippets and inlines their content.
+
+    Args:
+        index: File index used for resolution and for the mtime/size cache key.
+        base_paths: Snippet base paths, absolute or relative to ``root``.
+        root: Directory relative base paths are resolved against (mkdocs runs from the repo root).
+        enabled: When False, :meth:`inline` returns pages unchanged.
+    """
+
+    def __init__(
+        self,
+        index: FileIndex,
+        base_paths: tuple[str, ...] = DEFAULT_BASE_PATHS,
+        root: Path = REPO_ROOT,
+        enabled: bool | None = None,
+    ) -> None:
+        self.index = index
+        self.base_dirs = [(root / base).resolve() for base in base_paths]
+        self.enabled = inline_enabled() if enabled is None else enabled
+        self._resolved: dict[str, Path | None] = {}
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+
+    @property
+    def fingerprint(self) -> str:
+        """Part of the manifest fingerprint: cached pages depend on these settings."""
+        settings = f"inline={self.enabled};" + ";".join(str(b) for b in self.base_dirs)
+        return hashlib.sha256(settings.encode("utf-8")).hexdigest()
+
+    def resolve(self, name: str) -> Path | None:
+        """First ``base_dir / name`` that exists, probing base paths in order (memoized)."""
+        if name not in self._resolved:
+            found = None
+            for base in self.base_dirs:
+                candidate = Path(os.path.normpath(base / name))
+                if self.index.exists(candidate):
+                    found = candidate
+                    break
+            self._resolved[name] = found
+        return self._resolved[name]
+
+    def lines(self, path: Path) -> list[str] | None:
+        """Content of ``path`` split the way pymdownx.snippets reads it, or None."""
+        st = self.index.stat(path)
+        if st is None:
+            return None
+        key = (path, st.st_mtime_ns, st.st_size)
+        if key in _CONTENT_CACHE:
+            self.hits += 1
+            return _CONTENT_CACHE[key]
+        self.misses += 1
+        try:
+            text = path.read_bytes().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            text = None
+        # pymdownx iterates a codecs reader (splitlines semantics) and strips only \r\n
+        lines = None if text is None or MARKER in text else [
+            line.rstrip("\r\n") for line in text.splitlines(keepends=True)
+        ]
+        _CONTENT_CACHE[key] = lines
+        return lines
+
+    def inline(self, source: Path, page: str) -> str:
+        """Replace directives in ``page`` that include ``source`` with its content."""
+        if not self.enabled or MARKER not in page:
+            return page
+        out: list[str] = []
+        for line in page.split("\n"):
+            m = RE_DIRECTIVE.match(line)
+            content = None
+            if m and self.resolve(m.group("name")) == source:
+                content = self.lines(source)
+            if content is None:
+                if m:
+                    self.fallbacks += 1
+                out.append(line)
+                continue
+            space = m.group("space").expandtabs(TAB_LENGTH)
+            out.extend(space + snippet_line for snippet_line in content)
+        return "\n".join(out)
@@ -0,0 +1,52 @@
+"""Wrapper templates, titles and skip rules shared by every generator."""
+from __future__ import annotations
+
+from string import capwords
+
+# Names to skip (case-sensitive)
+SKIP_FILES = {
+    "tempCodeRunnerFile.py",
+}
+
+# Directories never descended into
+SKIP_DIRS = {
+    "openai-agents-python",
+}
+
+WRAPPER_TEMPLATE = """# {title}\n\n???+ note \"Source code in OpAgentsOlympus/practice/{filename}\"\n    ```python title=\"OpAgentsOlympus/practice/{filename}\"\n    --8<-- \"{filename}\"\n    ```\n"""
+
+WRAPPER_TEMPLATE_ABS = """# {title}\n\n???+ note \"Source code in {abs_path}\"\n    ```python title=\"{abs_path}\"\n    --8<-- \"{abs_path}\"\n    ```\n"""
+
+WRAPPER_TEMPLATE_INCLUDE_RAW = """# {title}\n\n--8<-- \"{abs_path}\"\n"""
+
+INDEX_HEADER = """# 100 MCQs Answer\n\nBelow are all MCQ example scripts, rendered with collapsible source.\n"""
+
+# Everything that shapes a wrapper page; part of the manifest fingerprint
+WRAPPER_TEMPLATES = (WRAPPER_TEMPLATE, WRAPPER_TEMPLATE_ABS, WRAPPER_TEMPLATE_INCLUDE_RAW, INDEX_HEADER)
+
+REF_STUB_TEMPLATE = """# `{title}`
+
+::: {identifier}
+    handler: python
+    options:
+      show_source: true
+"""
+
+
+def title_from_stem(stem: str) -> str:
+    """Convert 'stream_text' -> 'Stream Text'."""
+    return " ".join(part.capitalize() for part in stem.replace("_", " ").split())
+
+
+def pretty_title(last_segment: str) -> str:
+    """Convert 'tool_context' -> 'Tool Context' (dashes count as separators too)."""
+    cleaned = last_segment.replace("_", " ").replace("-", " ")
+    return capwords(cleaned)
+
+
+def slugify(name: str) -> str:
+    import re
+    s = name.lower()
+    s = re.sub(r"[^a-z0-9]+", "-", s)
+    s = re.sub(r"^-+|-+$", "", s)
+    return s or "item"
@@ -0,0 +1,250 @@
+"""Watch mode: keep wrappers and reference stubs current as files are saved.
+
+``python -m agents_demo.docgen watch`` subscribes to inotify events under
+``docs/OpAgentsOlympus`` (which covers ``practice/`` and the ``mcqs-src`` /
+``100 MCQs Answer`` MCQ folders) and ``src/``. After a burst of editor writes
+settles for ``debounce`` seconds, only the affected pages are touched:
+
+- practice/MCQ sources re-render (or drop) their page in the gen-files cache,
+  so the next `mkdocs` rebuild finds it current;
+- modules under ``src/`` get their missing mkdocstrings stub created once they
+  have public members, and the stub of a deleted (or no longer public) module
+  is removed if it was never hand-edited.
+
+A histogram of save-to-emit latency is printed on exit.
+"""
+from __future__ import annotations
+
+import bisect
+import signal
+import time
+from pathlib import Path
+from typing import Callable
+
+from .index import FileIndex
+from .inotify import InotifySource, PollingSource
+from .manifest import WrapperManifest
+from .modindex import ModuleIndex
+from .paths import AGENTS_DIR, CACHE_DIR, DOCS_ROOT, REPO_ROOT, SRC_ROOT
+from .refs import discover_top_packages, md_target, render_ref_stub, to_identifier
+from .wrappers import (
+    MCQ_INDEX,
+    WrapperSpec,
+    is_mcq_source,
+    load_manifest,
+    mcq_source_dir,
+    mcq_spec,
+    plan_virtual_wrappers,
+    practice_spec,
+    render_mcq_index,
+)
+
+WRAPPED_SUFFIXES = (".py", ".md", ".mdsrc", ".md.txt")
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.samples: list[float] = []
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, ms)] += 1
+        self.samples.append(ms)
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def report(self) -> str:
+        if not self.samples:
+            return "No changes handled."
+        width = max(self.counts)
+        lines = [
+            f"Save-to-emit latency over {len(self.samples)} change(s): "
+            f"p50={self.percentile(0.5):.1f}ms p95={self.percentile(0.95):.1f}ms max={max(self.samples):.1f}ms"
+        ]
+        labels = [f"<= {b} ms" for b in self.BOUNDS_MS] + [f"> {self.BOUNDS_MS[-1]} ms"]
+        for label, count in zip(labels, self.counts):
+            if count:
+                lines.append(f"  {label:>10} | {'#' * max(1, round(40 * count / width))} {count}")
+        return "\n".join(lines)
+
+
+class Watcher:
+    """Applies batches of changed paths to the gen-files cache and the ref stubs."""
+
+    def __init__(
+        self,
+        index: FileIndex,
+        manifest: WrapperManifest,
+        docs_root: Path = DOCS_ROOT,
+        src_root: Path = SRC_ROOT,
+        log: Callable[[str], None] = print,
+    ) -> None:
+        self.index = index
+        self.manifest = manifest
+        self.docs_root = docs_root
+        self.src_root = src_root
+        self.log = log
+        self.modules = ModuleIndex.load(index)
+        self.histogram = LatencyHistogram()
+        # Sources report their roots on queue overflow
+        self.rescan_markers = {docs_root / "OpAgentsOlympus", src_root}
+        # Restrict the manifest to what exists now (the cache may predate this session)
+        self.resync()
+
+    def resync(self) -> None:
+        """Full pass, as the gen-files script would do it."""
+        self.index.refresh()
+        self.manifest.seen.clear()
+        for spec in plan_virtual_wrappers(self.index, self.docs_root, log=lambda _: None):
+            self._emit(spec)
+        self._refresh_mcq_index()
+        self.manifest.prune(keep_index=bool(self.manifest.index))
+        self.manifest.flush()
+        self.manifest.save()
+
+    def apply(self, paths: set[Path]) -> None:
+        """Handle one debounced batch of changed paths."""
+        if paths & self.rescan_markers:
+            self.log("[watch] event queue overflow or root change; rescanning")
+            self.resync()
+            return
+
+        mcq_touched = modules_touched = False
+        for path in sorted(paths):
+            self.index.update(path)
+            if path.is_relative_to(self.src_root):
+                if path.suffix == ".py":
+                    modules_touched |= self._apply_module(path)
+            elif path.is_relative_to(self.docs_root) and path.name.endswith(WRAPPED_SUFFIXES):
+                mcq_touched |= self._apply_wrapper(path)
+        if mcq_touched:
+            self._refresh_mcq_index()
+        self.manifest.flush()
+        self.manifest.save()
+        if modules_touched:
+            self.modules.save()
+
+    def _emit(self, spec: WrapperSpec) -> bool:
+        st = self.index.stat(spec.source)
+        if st is None:
+            return False
+        return self.manifest.emit(spec.source, st, spec.key, spec.target, spec.template, spec.fields)
+
+    def _apply_wrapper(self, path: Path) -> bool:
+        """Re-evaluate the wrapper for ``path``; return True if an MCQ page changed."""
+        rel = path.relative_to(self.docs_root)
+        if is_mcq_source(rel):
+            mcq = mcq_source_dir(self.index, self.docs_root)
+            if mcq is None or path.parent != mcq[0]:
+                return False
+            spec = mcq_spec(path, self.docs_root) if self.index.exists(path) else None
+        else:
+            # A hand-written .md beside a .py decides whether the .py gets a wrapper
+            if path.suffix == ".md":
+                path = path.with_suffix(".py")
+                rel = rel.with_suffix(".py")
+            if path.suffix != ".py":
+                return False
+            spec = practice_spec(path, self.index, self.docs_root) if self.index.exists(path) else None
+
+        if spec is None:
+            if self.manifest.discard(rel.as_posix()):
+                self.log(f"[watch] Removed wrapper for {rel}")
+                return is_mcq_source(rel)
+            return False
+        if self._emit(spec):
+            self.log(f"[watch] Generated wrapper: {spec.target}")
+            return spec.mcq
+        return False
+
+    def _refresh_mcq_index(self) -> None:
+        mcq = mcq_source_dir(self.index, self.docs_root)
+        entries = []
+        if mcq is not None:
+            mcq_dir, md_suffixes = mcq
+            for path in self.index.files(mcq_dir, ".py") + self.index.files(mcq_dir, *md_suffixes):
+                spec = mcq_spec(path, self.docs_root)
+                if spec is not None:
+                    entries.append((spec.title, spec.target))
+        if entries:
+            if self.manifest.emit_index(MCQ_INDEX, entries, lambda: render_mcq_index(entries)):
+                self.log(f"[watch] Generated wrapper: {MCQ_INDEX}")
+        else:
+            self.manifest.drop_index()
+
+    def _apply_module(self, path: Path) -> bool:
+        """Create or remove the stub for ``path``; return True if the module index was consulted."""
+        if path.name.startswith("_"):
+            return False
+        identifier = to_identifier(path, discover_top_packages(self.index, self.src_root), self.src_root)
+        if identifier is None:
+            return False
+        stub = md_target(path, self.src_root)
+        if self.modules.has_public_members(path):
+            if not stub.exists():
+                stub.parent.mkdir(parents=True, exist_ok=True)
+                stub.write_text(render_ref_stub(identifier), encoding="utf-8")
+                self.log(f"[watch] Created {stub.relative_to(REPO_ROOT)}")
+        elif stub.exists() and stub.read_text(encoding="utf-8") == render_ref_stub(identifier):
+            # Only remove stubs we would have generated ourselves
+            stub.unlink()
+            self.log(f"[watch] Removed {stub.relative_to(REPO_ROOT)}")
+        return True
+
+    def run(self, source: InotifySource | PollingSource, debounce: float) -> None:
+        """Block, applying changes until interrupted."""
+        pending: dict[Path, float] = {}  # path -> first event time
+        last_event = 0.0
+        while True:
+            timeout = None if not pending else max(0.0, last_event + debounce - time.monotonic())
+            changed = source.read(timeout)
+            now = time.monotonic()
+            if changed:
+                for path in changed:
+                    pending.setdefault(path, now)
+                last_event = now
+                continue
+            if pending and now - last_event >= debounce:
+                batch, pending = pending, {}
+                self.apply(set(batch))
+                done = time.monotonic()
+                for first_seen in batch.values():
+                    self.histogram.record(done - first_seen)
+
+
+def watch(debounce: float = 0.05, poll: bool = False, log: Callable[[str], None] = print) -> None:
+    """Run the watch daemon until Ctrl+C / SIGTERM, then print the latency histogram."""
+    index = FileIndex.shared(REPO_ROOT)
+    watcher = Watcher(index, load_manifest(index, CACHE_DIR), log=log)
+    roots = [root for root in (AGENTS_DIR, SRC_ROOT) if index.exists(root)]
+
+    source: InotifySource | PollingSource
+    if poll:
+        source = PollingSource(roots)
+    else:
+        try:
+            source = InotifySource(roots, index)
+        except OSError as exc:
+            log(f"[watch] inotify unavailable ({exc}); falling back to polling")
+            source = PollingSource(roots)
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, _terminate)
+    log(f"[watch] Watching {', '.join(str(r.relative_to(REPO_ROOT)) for r in roots)} (Ctrl+C to stop)")
+    try:
+        watcher.run(source, debounce)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        source.close()
+        watcher.manifest.save()
+        log(watcher.histogram.report())
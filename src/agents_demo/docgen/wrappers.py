@@ -0,0 +1,202 @@
+"""Planning and writing of Markdown wrappers for practice and MCQ sources."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from .index import FileIndex
+from .manifest import WrapperManifest, templates_fingerprint
+from .paths import CACHE_DIR, DOCS_ROOT, PRACTICE_DIR, REPO_ROOT
+from .render import render_all, write_pages
+from .snippets import DEFAULT_BASE_PATHS, SnippetInliner
+from .templates import (
+    INDEX_HEADER,
+    SKIP_DIRS,
+    SKIP_FILES,
+    WRAPPER_TEMPLATE,
+    WRAPPER_TEMPLATE_ABS,
+    WRAPPER_TEMPLATE_INCLUDE_RAW,
+    slugify,
+    title_from_stem,
+)
+
+# Locations relative to the docs root
+AGENTS_REL = "OpAgentsOlympus"
+PRACTICE_REL = "OpAgentsOlympus/practice"
+MCQ_SRC_NAME = "mcqs-src"
+MCQ_LEGACY_NAME = "100 MCQs Answer"
+MCQ_SAFE_DIR = "OpAgentsOlympus/practice/100-mcqs-answer"
+MCQ_INDEX = f"{MCQ_SAFE_DIR}/index.md"
+
+
+@dataclass(frozen=True)
+class WrapperSpec:
+    """One wrapper page to generate.
+
+    Attributes:
+        source: Absolute path of the wrapped file.
+        key: ``source`` relative to the docs root (manifest key).
+        target: Virtual `.md` path relative to the docs root.
+        template: Template to render.
+        fields: Values for ``template``.
+        title: Page title.
+        mcq: Whether the page is listed on the MCQ index.
+    """
+
+    source: Path
+    key: str
+    target: str
+    template: str
+    fields: dict[str, str]
+    title: str
+    mcq: bool = False
+
+
+def is_excluded_path(path: Path) -> bool:
+    return any(part in SKIP_DIRS for part in path.parts)
+
+
+def is_mcq_source(rel_to_docs: Path) -> bool:
+    return MCQ_LEGACY_NAME in rel_to_docs.parts or MCQ_SRC_NAME in rel_to_docs.parts
+
+
+def mcq_source_dir(index: FileIndex, docs_root: Path = DOCS_ROOT) -> tuple[Path, tuple[str, ...]] | None:
+    """Return the MCQ source dir in use and the md-like suffixes it accepts."""
+    practice_dir = docs_root / PRACTICE_REL
+    # Prefer mcqs-src, otherwise fall back to original folder with spaces (legacy)
+    if index.exists(practice_dir / MCQ_SRC_NAME):
+        # Also accept plain .md so README.md works out-of-the-box
+        return practice_dir / MCQ_SRC_NAME, (".md", ".mdsrc", ".md.txt")
+    if index.exists(practice_dir / MCQ_LEGACY_NAME):
+        return practice_dir / MCQ_LEGACY_NAME, (".md",)
+    return None
+
+
+def practice_spec(path: Path, index: FileIndex, docs_root: Path = DOCS_ROOT) -> WrapperSpec | None:
+    """Spec for a regular practice `.py`, or None if it gets no virtual wrapper."""
+    if path.name in SKIP_FILES or is_excluded_path(path):
+        return None
+    rel_to_docs = path.relative_to(docs_root)
+    # MCQs are handled from mcq_src_dir or the legacy folder
+    if is_mcq_source(rel_to_docs):
+        return None
+    # Author-provided content wins
+    if index.exists(path.with_suffix(".md")):
+        return None
+    title = title_from_stem(path.stem)
+    return WrapperSpec(
+        source=path,
+        key=rel_to_docs.as_posix(),
+        # Mirror alongside source (same folder), .md extension
+        target=rel_to_docs.with_suffix(".md").as_posix(),
+        template=WRAPPER_TEMPLATE,
+        fields={"title": title, "filename": path.name},
+        title=title,
+    )
+
+
+def mcq_spec(path: Path, docs_root: Path = DOCS_ROOT) -> WrapperSpec | None:
+    """Spec for an MCQ source (`.py` or md-like)."""
+    if is_excluded_path(path):
+        return None
+    abs_src_path = path.relative_to(docs_root).as_posix()
+    if path.suffix == ".py":
+        title = title_from_stem(path.stem)
+        safe_name = slugify(path.stem) + ".md"
+        template, fields = WRAPPER_TEMPLATE_ABS, {"title": title, "abs_path": abs_src_path}
+    else:
+        raw_stem = path.stem.replace(".md", "")  # handle .mdsrc or .md.txt, or plain .md
+        title = title_from_stem(raw_stem.lstrip("#").strip())
+        # Preserve README filename so a nav link to README.md works out-of-the-box
+        safe_name = "README.md" if raw_stem.lower() == "readme" else slugify(raw_stem) + ".md"
+        template, fields = WRAPPER_TEMPLATE_INCLUDE_RAW, {"title": title, "abs_path": abs_src_path}
+    return WrapperSpec(
+        source=path,
+        key=abs_src_path,
+        target=f"{MCQ_SAFE_DIR}/{safe_name}",
+        template=template,
+        fields=fields,
+        title=title,
+        mcq=True,
+    )
+
+
+def plan_virtual_wrappers(
+    index: FileIndex,
+    docs_root: Path = DOCS_ROOT,
+    log: Callable[[str], None] = print,
+) -> list[WrapperSpec]:
+    """Every wrapper the gen-files build should provide, in generation order."""
+    practice_dir = docs_root / PRACTICE_REL
+    agents_dir = docs_root / AGENTS_REL
+    py_files = index.files(practice_dir, ".py", recursive=True) + index.files(agents_dir, ".py")
+    log(f"[gen-files] Scanning {practice_dir} (recursive) -> {len(py_files)} .py files")
+
+    specs: list[WrapperSpec] = []
+    for py_path in py_files:
+        if py_path.name in SKIP_FILES or is_excluded_path(py_path):
+            log(f"[gen-files] Skipping excluded file: {py_path}")
+            continue
+        spec = practice_spec(py_path, index, docs_root)
+        if spec is None:
+            md = py_path.with_suffix(".md")
+            if index.exists(md) and not is_mcq_source(py_path.relative_to(docs_root)):
+                log(f"[gen-files] Skipping existing wrapper on disk: {md}")
+            continue
+        specs.append(spec)
+
+    mcq = mcq_source_dir(index, docs_root)
+    if mcq is not None:
+        mcq_dir, md_suffixes = mcq
+        mcq_py_files = index.files(mcq_dir, ".py")
+        mcq_md_like_files = index.files(mcq_dir, *md_suffixes)
+        label = "MCQ src" if mcq_dir.name == MCQ_SRC_NAME else "MCQ src (fallback)"
+        log(f"[gen-files] {label}: {mcq_dir} -> {len(mcq_py_files)} .py, {len(mcq_md_like_files)} md-like files")
+        for path in mcq_py_files + mcq_md_like_files:
+            spec = mcq_spec(path, docs_root)
+            if spec is not None:
+                specs.append(spec)
+    return specs
+
+
+def load_manifest(
+    index: FileIndex,
+    cache_dir: Path = CACHE_DIR,
+    base_paths: tuple[str, ...] = DEFAULT_BASE_PATHS,
+    root: Path = REPO_ROOT,
+) -> WrapperManifest:
+    """Manifest whose rendered pages get their snippet include inlined."""
+    inliner = SnippetInliner(index, base_paths, root)
+    manifest = WrapperManifest.load(cache_dir, templates_fingerprint(extra=inliner.fingerprint))
+    manifest.postprocess = inliner.inline
+    return manifest
+
+
+def render_mcq_index(entries: list[tuple[str, str]]) -> str:
+    """MCQ index page content for (title, target) entries."""
+    lines = [INDEX_HEADER, "\n"]
+    for title, rel_md in sorted(entries, key=lambda x: x[0].lower()):
+        # Use a relative link from within the index folder, include .md to satisfy MkDocs validation
+        lines.append(f"- [{title}]({Path(rel_md).name})")
+    return "\n".join(lines) + "\n"
+
+
+def build_disk_wrappers(index: FileIndex, jobs: int = 1, practice_dir: Path = PRACTICE_DIR) -> list[Path]:
+    """Write `<name>.md` beside each top-level practice `.py` that lacks one.
+
+    With ``jobs > 1`` wrappers are written durably (each file's data synced,
+    then its directory once) and, for large trees, rendered in a process
+    pool; output is byte-identical to the serial path.
+    """
+    todo = [
+        py for py in index.files(practice_dir, ".py")
+        if py.name not in SKIP_FILES and not index.exists(py.with_suffix(".md"))
+    ]
+    contents = render_all(
+        [(WRAPPER_TEMPLATE, {"title": title_from_stem(py.stem), "filename": py.name}) for py in todo],
+        jobs,
+    )
+    pages = [(py.with_suffix(".md"), content) for py, content in zip(todo, contents)]
+    write_pages(pages, batched=jobs > 1)
+    return [md for md, _ in pages]
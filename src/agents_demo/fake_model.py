@@ -0,0 +1,437 @@
+"""Deterministic stand-in for an OpenAI-compatible chat-completions server.
+
+Serves ``POST /v1/chat/completions`` (plain JSON and ``stream=true`` SSE) and
+``GET /v1/models`` with nothing but the standard library, so every practice
+script can run, and be timed, without a live provider::
+
+    python -m agents_demo.fake_model --port 11434 --latency-ms 20 --tokens-per-sec 200
+    AGENTS_FAKE_MODEL_URL=http://127.0.0.1:11434/v1 python docs/OpAgentsOlympus/practice/stream_text.py
+
+``local_config.py`` already points at port 11434. With
+``AGENTS_FAKE_MODEL_URL`` set, every lazy config (see
+:mod:`agents_demo.providers`) and every client from
+:func:`agents_demo.clients.get_client` is redirected here.
+
+What the server answers is decided per request, without server-side state:
+
+- With ``--script FILE``, turn *n* of a conversation (the number of assistant
+  messages already in the request) is answered with ``turns[n]`` of the
+  script: ``{"text": ...}``, ``{"tool_calls": [{"name": ..., "arguments":
+  {...}}]}`` or ``{"handoff": "<agent name>"}`` (a call to that agent's
+  ``transfer_to_*`` tool).
+- Past the end of the script, or without one: if the request offers tools
+  and the last message is not a tool result, call the first non-handoff tool
+  (or the first handoff) with arguments derived from its JSON schema, all at
+  once when ``parallel_tool_calls`` allows several. Otherwise answer with
+  text echoing the last user message.
+- Text answers to a request with a ``json_schema`` ``response_format`` (an
+  agent with an ``output_type``) are JSON built from that schema instead, so
+  the SDK can parse them. Scripted ``text`` is sent as is.
+
+``--latency-ms`` delays the first byte; ``--tokens-per-sec`` paces streamed
+tokens (and the total time of non-streamed replies). A "token" is a word.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .providers import FAKE_MODEL_ENV
+
+DEFAULT_PORT = 11434
+HANDOFF_PREFIX = "transfer_to_"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def handoff_tool_name(agent_name: str) -> str:
+    """The Agents SDK's default handoff tool name for ``agent_name``."""
+    return HANDOFF_PREFIX + re.sub(r"[^a-zA-Z0-9]", "_", agent_name.replace(" ", "_")).lower()
+
+
+def sample_arguments(schema: dict[str, Any], defs: dict[str, Any] | None = None) -> Any:
+    """Deterministic value satisfying a (simple) JSON schema.
+
+    ``$ref``s are resolved against ``defs`` (default: the schema's own
+    ``$defs``/``definitions``), as in pydantic model schemas.
+    """
+    if defs is None:
+        defs = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+    if "$ref" in schema:
+        return sample_arguments(defs.get(schema["$ref"].rsplit("/", 1)[-1], {}), defs)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema and schema["enum"]:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    for combinator in ("anyOf", "oneOf", "allOf"):
+        if schema.get(combinator):
+            return sample_arguments(schema[combinator][0], defs)
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {name: sample_arguments(sub, defs) for name, sub in properties.items()}
+    if kind == "array" and schema.get("minItems"):
+        return [sample_arguments(schema.get("items", {}), defs)] * schema["minItems"]
+    return {"string": "test", "integer": 1, "number": 1.0, "boolean": True, "array": [], "null": None}.get(kind)
+
+
+def _words(text: str) -> list[str]:
+    """Split text into streamable pieces that concatenate back to ``text``."""
+    return re.findall(r"\S+\s*|\s+", text) or [""]
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def output_schema(body: dict[str, Any]) -> dict[str, Any] | None:
+    """JSON schema the request's ``response_format`` asks the answer to follow, if any."""
+    response_format = body.get("response_format")
+    if not isinstance(response_format, dict) or response_format.get("type") != "json_schema":
+        return None
+    return response_format.get("json_schema", {}).get("schema")
+
+
+@dataclass
+class Reply:
+    """One assistant turn: text or tool calls (``[(name, arguments_json), ...]``)."""
+
+    text: str = ""
+    tool_calls: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def finish_reason(self) -> str:
+        return "tool_calls" if self.tool_calls else "stop"
+
+    @property
+    def tokens(self) -> int:
+        return len(_words(self.text)) + sum(len(_words(args)) for _, args in self.tool_calls)
+
+
+class ScriptedModel:
+    """Decides the :class:`Reply` for a chat-completions request body.
+
+    Args:
+        turns: Scripted turns (see the module docstring); empty for auto mode only.
+    """
+
+    def __init__(self, turns: list[dict[str, Any]] | None = None) -> None:
+        self.turns = turns or []
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ScriptedModel":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["turns"] if isinstance(data, dict) else data)
+
+    def reply(self, body: dict[str, Any]) -> Reply:
+        messages = body.get("messages", [])
+        tools = [t["function"] for t in body.get("tools", []) if t.get("type") == "function"]
+        turn = sum(1 for m in messages if m.get("role") == "assistant")
+        if turn < len(self.turns):
+            return self._scripted(self.turns[turn], tools)
+        reply = self._auto(messages, tools, body.get("parallel_tool_calls", True) is not False)
+        schema = output_schema(body)
+        if schema is not None and not reply.tool_calls:
+            return Reply(text=json.dumps(sample_arguments(schema)))
+        return reply
+
+    def _scripted(self, step: dict[str, Any], tools: list[dict[str, Any]]) -> Reply:
+        if "handoff" in step:
+            return Reply(tool_calls=[(handoff_tool_name(step["handoff"]), "{}")])
+        if "tool_calls" in step:
+            calls = []
+            for call in step["tool_calls"]:
+                arguments = call.get("arguments")
+                if arguments is None:
+                    schema = next((t.get("parameters", {}) for t in tools if t["name"] == call["name"]), {})
+                    arguments = sample_arguments(schema)
+                calls.append((call["name"], arguments if isinstance(arguments, str) else json.dumps(arguments)))
+            return Reply(tool_calls=calls)
+        return Reply(text=step.get("text", ""))
+
+    def _auto(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]], parallel: bool) -> Reply:
+        last = messages[-1] if messages else {}
+        if tools and last.get("role") != "tool":
+            plain = [t for t in tools if not t["name"].startswith(HANDOFF_PREFIX)]
+            chosen = (plain if parallel else plain[:1]) or tools[:1]
+            return Reply(tool_calls=[
+                (t["name"], json.dumps(sample_arguments(t.get("parameters", {})))) for t in chosen
+            ])
+        if last.get("role") == "tool":
+            return Reply(text=f"Done. The tool returned: {_content_text(last.get('content'))}")
+        user = next((m for m in reversed(messages) if m.get("role") == "user"), {})
+        return Reply(text=f"Echo: {_content_text(user.get('content'))}")
+
+
+class FakeModelServer:
+    """Minimal HTTP/1.1 server (keep-alive, chunked SSE) around a :class:`ScriptedModel`.
+
+    Args:
+        model: Reply policy.
+        host: Interface to bind.
+        port: Port to bind; 0 picks a free one.
+        latency: Seconds before the first byte of every response.
+        tokens_per_sec: Pacing of generated tokens; 0 disables it.
+    """
+
+    def __init__(
+        self,
+        model: ScriptedModel | None = None,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        latency: float = 0.0,
+        tokens_per_sec: float = 0.0,
+    ) -> None:
+        self.model = model or ScriptedModel()
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.tokens_per_sec = tokens_per_sec
+        self.requests = 0
+        self.streamed = 0
+        self._completion_ids = 0
+        self._server: asyncio.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> "FakeModelServer":
+        """Serve from a daemon thread with its own event loop; returns once listening."""
+        ready = threading.Event()
+
+        def run() -> None:
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="fake-model-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        """Stop a server started with :meth:`start_in_thread`."""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+    async def _shutdown(self) -> None:
+        if self._server is not None:
+            self._server.close()
+        # Drop keep-alive connections still waiting for their next request
+        handlers = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        for task in handlers:
+            task.cancel()
+        await asyncio.gather(*handlers, return_exceptions=True)
+
+    def __enter__(self) -> "FakeModelServer":
+        return self.start_in_thread()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0) or 0))
+                await self._dispatch(method, target.split("?", 1)[0], body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutdown; end quietly (a cancelled handler task is logged as an error)
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        path = path.rstrip("/")
+        if path.endswith("/models") and method == "GET":
+            await self._send_json(writer, 200, {"object": "list", "data": [
+                {"id": "fake-model", "object": "model", "created": 0, "owned_by": "agents_demo"},
+            ]})
+            return
+        if not path.endswith("/chat/completions"):
+            await self._send_json(writer, 404, {"error": {"message": f"No route for {path}", "type": "not_found"}})
+            return
+        if method != "POST":
+            await self._send_json(writer, 405, {"error": {"message": "Use POST", "type": "invalid_request_error"}})
+            return
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            await self._send_json(writer, 400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error"}})
+            return
+        if not isinstance(request, dict):
+            await self._send_json(writer, 400, {"error": {
+                "message": "The request body must be a JSON object", "type": "invalid_request_error",
+            }})
+            return
+        try:
+            reply = self.model.reply(request)
+            include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # A malformed request (or scripted turn, e.g. a tool call without "name")
+            # must still get an answer, or the client waits for its timeout
+            await self._send_json(writer, 400, {"error": {
+                "message": f"Cannot answer this request: {type(e).__name__}: {e}", "type": "invalid_request_error",
+            }})
+            return
+
+        self.requests += 1
+        self._completion_ids += 1
+        completion_id = f"chatcmpl-fake-{self._completion_ids}"
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if request.get("stream"):
+            self.streamed += 1
+            await self._stream(writer, completion_id, request, reply, include_usage)
+        else:
+            if self.tokens_per_sec:
+                await asyncio.sleep(reply.tokens / self.tokens_per_sec)
+            await self._send_json(writer, 200, self._completion(completion_id, request, reply))
+
+    def _usage(self, request: dict[str, Any], reply: Reply) -> dict[str, int]:
+        prompt = sum(len(_words(_content_text(m.get("content")))) for m in request.get("messages", []))
+        return {"prompt_tokens": prompt, "completion_tokens": reply.tokens, "total_tokens": prompt + reply.tokens}
+
+    def _completion(self, completion_id: str, request: dict[str, Any], reply: Reply) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": "assistant", "content": reply.text or None}
+        if reply.tool_calls:
+            message["tool_calls"] = [
+                {"id": f"call_{completion_id}_{i}", "type": "function", "function": {"name": name, "arguments": args}}
+                for i, (name, args) in enumerate(reply.tool_calls)
+            ]
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": 0,
+            "model": request.get("model", "fake-model"),
+            "choices": [{"index": 0, "message": message, "finish_reason": reply.finish_reason}],
+            "usage": self._usage(request, reply),
+        }
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        completion_id: str,
+        request: dict[str, Any],
+        reply: Reply,
+        include_usage: bool,
+    ) -> None:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        base = {"id": completion_id, "object": "chat.completion.chunk", "created": 0,
+                "model": request.get("model", "fake-model")}
+        delay = 1 / self.tokens_per_sec if self.tokens_per_sec else 0.0
+
+        async def event(choices: list[dict[str, Any]], **extra: Any) -> None:
+            payload = json.dumps({**base, "choices": choices, **extra})
+            self._write_chunk(writer, f"data: {payload}\n\n".encode())
+            await writer.drain()
+
+        def delta(d: dict[str, Any], finish: str | None = None) -> list[dict[str, Any]]:
+            return [{"index": 0, "delta": d, "finish_reason": finish}]
+
+        await event(delta({"role": "assistant", "content": ""}))
+        for word in _words(reply.text) if reply.text else ():
+            if delay:
+                await asyncio.sleep(delay)
+            await event(delta({"content": word}))
+        for i, (name, args) in enumerate(reply.tool_calls):
+            await event(delta({"tool_calls": [{
+                "index": i, "id": f"call_{completion_id}_{i}", "type": "function",
+                "function": {"name": name, "arguments": ""},
+            }]}))
+            for piece in _words(args):
+                if delay:
+                    await asyncio.sleep(delay)
+                await event(delta({"tool_calls": [{"index": i, "function": {"arguments": piece}}]}))
+        await event(delta({}, reply.finish_reason))
+        if include_usage:
+            await event([], usage=self._usage(request, reply))
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        self._write_chunk(writer, b"")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m agents_demo.fake_model", description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default: {DEFAULT_PORT} (Ollama's port)")
+    parser.add_argument("--script", type=Path, help="JSON file with scripted turns")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay before the first byte")
+    parser.add_argument("--tokens-per-sec", type=float, default=0.0, help="token pacing (0: as fast as possible)")
+    args = parser.parse_args(argv)
+
+    model = ScriptedModel.from_file(args.script) if args.script else ScriptedModel()
+    server = FakeModelServer(model, args.host, args.port, args.latency_ms / 1000, args.tokens_per_sec)
+
+    async def run() -> None:
+        await server.start()
+        print(f"Fake model server listening on {server.base_url} (export {FAKE_MODEL_ENV}={server.base_url})")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print(f"Served {server.requests} completion(s), {server.streamed} streamed.")
+
+
+if __name__ == "__main__":
+    main()
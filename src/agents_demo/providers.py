@@ -0,0 +1,216 @@
+"""Lazily configured model backends for ``RunConfig``.
+
+The practice config modules used to do their work at import time: walk up
+the tree for a ``.env``, read the API key (raising if it is missing) and build
+a client and model. Every script paid for that, even ones that never call the
+model.
+
+:func:`lazy_run_config` returns a ``RunConfig`` whose ``model`` is only a name
+and whose ``model_provider`` is a :class:`LazyProvider`. Config modules go one
+step further with :func:`lazy_config_module`: even the ``RunConfig`` (and
+with it the SDK import) waits until ``config`` is first read. The Agents SDK asks
+the provider for the model when a run starts. Only then is the ``.env``
+loaded (once per process), the key checked, the pooled client fetched from
+:mod:`agents_demo.clients` and the backend's SDK module imported. The
+LiteLLM extension, for instance, is never imported unless the ``litellm``
+backend is picked.
+
+Backends: ``gemini``, ``ollama`` (local, see ``local_config.py``),
+``openrouter`` and ``litellm``. See :data:`BACKENDS`. Setting
+``AGENTS_FAKE_MODEL_URL`` points every backend at that chat-completions URL
+instead (see :mod:`agents_demo.fake_model`).
+"""
+from __future__ import annotations
+
+import functools
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from .clients import FAKE_MODEL_ENV, get_client
+
+if TYPE_CHECKING:
+    from agents.models.interface import Model
+    from agents.run import RunConfig
+    from openai import AsyncOpenAI
+
+# Picks the backend of config.py (and of lazy_run_config() without an explicit name)
+BACKEND_ENV = "AGENTS_BACKEND"
+
+SDK_MISSING = (
+    "\nThis package requires 'openai-agents' to be installed.\n"
+    "\nPlease install it first using pip:\n"
+    "\npip install openai-agents\n"
+    "\nFor more information, visit: https://openai.github.io/openai-agents-PyDeepOlympus/quickstart/\n"
+)
+
+
+@dataclass(frozen=True)
+class Backend:
+    """How to build a model for one provider."""
+
+    name: str
+    model: str  # default model name
+    key_env: str | None = None  # environment variable holding the API key
+    base_url: str | None = None  # chat-completions endpoint; None for LiteLLM
+    api_key: str | None = None  # fixed key for local servers
+    require_key: bool = True
+    litellm: bool = False
+    tracing_disabled: bool = False
+
+
+BACKENDS = {
+    "gemini": Backend(
+        "gemini", "gemini-1.5-flash",
+        key_env="GEMINI_API_KEY",
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+    ),
+    "ollama": Backend(
+        "ollama", "qwen3:0.6b",
+        base_url="http://localhost:11434/v1",
+        api_key="1234",
+        tracing_disabled=True,
+    ),
+    "openrouter": Backend(
+        "openrouter", "openai/gpt-4o-mini",
+        key_env="OPENROUTER_API_KEY",
+        base_url="https://openrouter.ai/api/v1",
+        require_key=False,
+    ),
+    "litellm": Backend(
+        "litellm", "gemini/gemini-2.0-flash",
+        key_env="GEMINI_API_KEY",
+        litellm=True,
+        tracing_disabled=True,
+    ),
+}
+
+
+@functools.cache
+def find_env_file(start: Path) -> Path | None:
+    """Nearest ``.env`` in ``start`` or its parents, like ``dotenv.find_dotenv`` (memoized)."""
+    for directory in (start, *start.parents):
+        candidate = directory / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+@functools.cache
+def load_env(start: Path) -> Path | None:
+    """Load the nearest ``.env`` into ``os.environ`` once; return its path."""
+    path = find_env_file(start)
+    if path is not None:
+        from dotenv import load_dotenv
+
+        load_dotenv(path)
+    return path
+
+
+class LazyProvider:
+    """Model provider for ``RunConfig.model_provider`` that builds its backend on first use.
+
+    Implements the Agents SDK ``ModelProvider`` interface (``get_model``)
+    without importing the SDK until a model is requested.
+
+    Args:
+        backend: Name in :data:`BACKENDS`, or a :class:`Backend`.
+        env_dir: Directory the ``.env`` lookup starts from.
+    """
+
+    def __init__(self, backend: str | Backend, env_dir: Path | None = None) -> None:
+        if isinstance(backend, str):
+            try:
+                backend = BACKENDS[backend]
+            except KeyError:
+                raise ValueError(f"Unknown backend {backend!r}; choose one of {', '.join(BACKENDS)}") from None
+        self.backend = backend
+        self.env_dir = (env_dir or Path.cwd()).resolve()
+        self._models: dict[str, Model] = {}
+
+    @property
+    def fake_url(self) -> str | None:
+        return os.environ.get(FAKE_MODEL_ENV) or None
+
+    def api_key(self) -> str | None:
+        b = self.backend
+        if self.fake_url:
+            return "fake"
+        if b.key_env is None:
+            return b.api_key
+        load_env(self.env_dir)
+        key = os.getenv(b.key_env)
+        if not key and b.require_key:
+            raise ValueError(f"{b.key_env} is not set. Please define it in your .env file.")
+        return key
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        """The shared chat-completions client of this backend."""
+        if self.fake_url:
+            return get_client(base_url=self.fake_url, api_key=self.api_key())
+        if self.backend.litellm:
+            raise AttributeError(f"The {self.backend.name} backend has no AsyncOpenAI client")
+        return get_client(base_url=self.backend.base_url, api_key=self.api_key())
+
+    def get_model(self, model_name: str | None) -> "Model":
+        name = model_name or self.backend.model
+        model = self._models.get(name)
+        if model is None:
+            model = self._models[name] = self._build(name)
+        return model
+
+    def _build(self, name: str) -> "Model":
+        if self.backend.litellm and not self.fake_url:
+            from agents.extensions.models.litellm_model import LitellmModel
+
+            return LitellmModel(model=name, api_key=self.api_key())
+        from agents import OpenAIChatCompletionsModel
+
+        return OpenAIChatCompletionsModel(model=name, openai_client=self.client)
+
+
+def _run_config(provider: LazyProvider, overrides: dict[str, Any]) -> "RunConfig":
+    try:
+        from agents.run import RunConfig
+    except ImportError:
+        raise ImportError(SDK_MISSING) from None
+
+    options: dict[str, Any] = {"tracing_disabled": provider.backend.tracing_disabled}
+    options.update(overrides)
+    return RunConfig(model=provider.backend.model, model_provider=provider, **options)
+
+
+def lazy_run_config(backend: str | None = None, env_dir: Path | None = None, **overrides: Any) -> "RunConfig":
+    """``RunConfig`` for ``backend`` (default: ``$AGENTS_BACKEND`` or ``gemini``) that does no I/O.
+
+    ``overrides`` are passed to ``RunConfig`` (e.g. ``tracing_disabled=False``).
+    """
+    return _run_config(LazyProvider(backend or os.environ.get(BACKEND_ENV) or "gemini", env_dir), overrides)
+
+
+def lazy_config_module(
+    module: str, backend: str | None = None, env_dir: Path | None = None, **overrides: Any
+) -> Callable[[str], Any]:
+    """A module ``__getattr__`` serving ``config``, ``model`` and ``external_client`` on first access.
+
+    Importing a config module that only assigns this imports nothing from the
+    Agents SDK: ``agents.run`` is imported, and the :func:`lazy_run_config`
+    built, when ``config`` is first read. It is then stored in the module, so
+    later reads are plain attribute lookups.
+    """
+    provider = LazyProvider(backend or os.environ.get(BACKEND_ENV) or "gemini", env_dir)
+
+    def __getattr__(name: str) -> Any:
+        if name == "config":
+            config = _run_config(provider, overrides)
+            setattr(sys.modules[module], "config", config)
+            return config
+        if name == "model":
+            return provider.get_model(None)
+        if name == "external_client":
+            return provider.client
+        raise AttributeError(f"module {module!r} has no attribute {name!r}")
+    return __getattr__